@@ -0,0 +1,242 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import os
+import sys
+import json
+import platform
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+import joblib
+from profiling import StageTimer
+from main import (load_energy_dataset, split_dataset, library_versions, MODELS_TO_TEST,
+                  TARGET_NAMES, COLUMN_RENAMES)
+
+BENCHMARK_FOLDER = 'benchmarks'
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+# Raw columns that get Gaussian noise; every feature only takes the handful of values
+# observed in the real data (12 building shapes x glazing), so those are resampled as-is
+JITTERED_COLUMNS = ['Y1', 'Y2']
+# Bump whenever the generator changes, so older synthetic files are not reused
+SYNTHETIC_VERSION = 2
+# Threads per model, so results do not depend on how many cores the machine has
+DEFAULT_N_JOBS = min(os.cpu_count() or 1, 8)
+# Largest size each model is run at by default; RandomForest at 10M rows takes hours and tens of GB
+MAX_ROWS = {'Random Forest Regressor': 1_000_000}
+STAGES = ['load', 'split', 'fit', 'predict', 'save']
+
+# ==============================================================================
+#  2. Synthetic Scale-Up Data
+# ==============================================================================
+
+def generate_synthetic_dataset(source_path, n_rows, output_path, jitter=0.01, chunk_size=500_000, seed=42):
+    """Grows the real dataset to `n_rows` by resampling its rows with small Gaussian noise.
+
+    Whole rows are resampled, so every feature keeps exactly the values (and
+    the X1..X5 combinations of each building shape) seen in the real data,
+    as the model would see them in production. Only the targets get noise
+    proportional to their standard deviation (`jitter` times the std),
+    clipped to the observed range. Rows are written in chunks with the raw
+    X1..X8 / Y1..Y2 headers, so the file loads exactly like the original.
+
+    Returns:
+        str: `output_path`.
+    """
+    source = pd.read_csv(source_path).dropna()
+    columns = [column for column in source.columns if column in COLUMN_RENAMES]
+    values = source[columns].to_numpy(dtype=np.float64)
+    jittered = np.array([column in JITTERED_COLUMNS for column in columns])
+    noise_scale = np.where(jittered, values.std(axis=0) * jitter, 0.0)
+    low, high = values.min(axis=0), values.max(axis=0)
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    written = 0
+    with open(tmp_path, 'w', newline='') as f:
+        while written < n_rows:
+            size = min(chunk_size, n_rows - written)
+            rows = values[rng.integers(0, len(values), size=size)]
+            rows = np.clip(rows + rng.normal(size=rows.shape) * noise_scale, low, high)
+            pd.DataFrame(rows, columns=columns).to_csv(f, header=written == 0, index=False,
+                                                       float_format='%.6g')
+            written += size
+    os.replace(tmp_path, output_path)
+    return output_path
+
+def synthetic_dataset_path(n_rows, seed, data_dir):
+    """Returns where the synthetic file of a given size and seed is kept between runs."""
+    return os.path.join(data_dir, f"energy-synthetic-v{SYNTHETIC_VERSION}-{n_rows}-seed{seed}.csv")
+
+def benchmark_model(df, model_name, model_class, params, timer, load_stage):
+    """Times split, fit, predict and save of one model on an already loaded dataset.
+
+    One model is fitted per target, as in `main.py`. Models are saved to a
+    temporary directory so the artifacts in `models/` are never touched.
+
+    Args:
+        timer (StageTimer): Records every stage, in the same format as the `main.py` report.
+        load_stage (dict): The `timer` record of loading `df`, measured by the caller.
+
+    Returns:
+        dict: Stage name -> `StageTimer` record, plus row counts and artifact size.
+    """
+    first_record = len(timer.records)
+    with timer.stage('split', model_name):
+        X_train, X_test, Y_train, Y_test = split_dataset(df)
+    with timer.stage('fit', model_name):
+        models = [model_class(**params).fit(X_train, Y_train[target_name]) for target_name in TARGET_NAMES]
+    with timer.stage('predict', model_name):
+        for model in models:
+            model.predict(X_test)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with timer.stage('save', model_name):
+            paths = [os.path.join(tmp_dir, f"{target_name}.joblib") for target_name in TARGET_NAMES]
+            for model, path in zip(models, paths):
+                joblib.dump(model, path)
+        artifact_bytes = sum(os.path.getsize(path) for path in paths)
+    stages = {'load': load_stage}
+    stages.update((stage['stage'], stage) for stage in timer.records[first_record:])
+    return {'model': model_name, 'rows': len(df), 'stages': stages, 'artifact_bytes': artifact_bytes,
+            'predict_rows_per_s': len(X_test) / max(stages['predict']['wall_s'], 1e-9)}
+
+def run_benchmarks(source_path, sizes, model_names=None, data_dir=BENCHMARK_FOLDER, seed=42,
+                   trace_memory=True, cache_dir=None, n_jobs=DEFAULT_N_JOBS, size_limits=True):
+    """Runs every selected model at every dataset size.
+
+    Args:
+        n_jobs (int): Threads given to every model that accepts `n_jobs`.
+        size_limits (bool): Skip models at sizes above their entry in `MAX_ROWS`.
+
+    Returns:
+        dict: Machine-readable results with environment information.
+    """
+    models = {}
+    for name in (model_names or MODELS_TO_TEST):
+        model_class, params = MODELS_TO_TEST[name]
+        if 'n_jobs' in model_class().get_params():
+            params = dict(params, n_jobs=n_jobs)
+        models[name] = (model_class, params)
+    results = []
+    timer = StageTimer(trace_memory) # Starts tracemalloc when asked to
+    try:
+        for n_rows in sizes:
+            path = synthetic_dataset_path(n_rows, seed, data_dir)
+            if not os.path.exists(path):
+                print(f"Generating {n_rows:,} synthetic rows into '{path}'...")
+                generate_synthetic_dataset(source_path, n_rows, path, seed=seed)
+            for model_name, (model_class, params) in models.items():
+                if size_limits and n_rows > MAX_ROWS.get(model_name, n_rows):
+                    print(f"  {n_rows:>11,} rows | {model_name:<24} | skipped "
+                          f"(above {MAX_ROWS[model_name]:,} rows, pass --no-size-limits to run it)")
+                    continue
+                # Loaded again per model so every record includes its own load cost
+                with timer.stage('load', model_name):
+                    df = load_energy_dataset(path, cache_dir)
+                record = benchmark_model(df, model_name, model_class, params, timer, timer.records[-1])
+                results.append(record)
+                del df
+                timings = ", ".join(f"{stage} {record['stages'][stage]['wall_s']:.2f}s" for stage in STAGES)
+                print(f"  {n_rows:>11,} rows | {model_name:<24} | {timings}")
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'library_versions': library_versions(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'n_jobs': n_jobs,
+        'dataset_cache': bool(cache_dir),
+        'seed': seed,
+        'results': results,
+    }
+
+# ==============================================================================
+#  3. Regression Check
+# ==============================================================================
+
+def compare_results(current, baseline, tolerance=0.2, min_seconds=0.05):
+    """Flags stages that got slower than `baseline` by more than `tolerance` (relative).
+
+    Stages faster than `min_seconds` in both runs are ignored, since their
+    timings are mostly noise.
+
+    Returns:
+        list: One dict per regressed (rows, model, stage).
+    """
+    previous = {(record['rows'], record['model']): record for record in baseline['results']}
+    regressions = []
+    for record in current['results']:
+        before = previous.get((record['rows'], record['model']))
+        if before is None:
+            continue
+        for stage in STAGES:
+            old = before['stages'].get(stage, {}).get('wall_s')
+            new = record['stages'][stage]['wall_s']
+            if old is None or max(old, new) < min_seconds:
+                continue
+            if new > old * (1.0 + tolerance):
+                regressions.append({'rows': record['rows'], 'model': record['model'], 'stage': stage,
+                                    'baseline_s': old, 'current_s': new, 'ratio': new / max(old, 1e-9)})
+    return regressions
+
+# ==============================================================================
+#  4. Main Execution Block
+# ==============================================================================
+def main():
+    """Runs the benchmark suite, writes the results and optionally checks them against a baseline."""
+    parser = argparse.ArgumentParser(description="Training and inference benchmarks on synthetic scale-up data.")
+    parser.add_argument('--data', default='energy-efficiency-dataset.csv')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--models', nargs='+', choices=list(MODELS_TO_TEST), default=None)
+    parser.add_argument('--data-dir', default=BENCHMARK_FOLDER,
+                        help="Where the synthetic datasets are generated and reused.")
+    parser.add_argument('--output', default=None, help="Results file (default: benchmarks/results_<timestamp>.json).")
+    parser.add_argument('--compare', default=None, help="A previous results file to check for regressions.")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Relative slowdown reported as a regression (default: 0.2 = 20%%).")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-tracemalloc', action='store_true',
+                        help="Skip Python allocation tracing, which adds overhead to every stage.")
+    parser.add_argument('--dataset-cache', action='store_true',
+                        help="Load through the binary dataset cache instead of parsing the CSV.")
+    parser.add_argument('--n-jobs', type=int, default=DEFAULT_N_JOBS,
+                        help=f"Threads per model (default: {DEFAULT_N_JOBS}).")
+    parser.add_argument('--no-size-limits', action='store_true',
+                        help="Also run models at sizes above their limit (RandomForest above 1M rows).")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.data):
+        print(f"Error: The file '{args.data}' was not found.")
+        return
+    report = run_benchmarks(args.data, args.sizes, args.models, args.data_dir, args.seed,
+                            trace_memory=not args.no_tracemalloc,
+                            cache_dir=os.path.join(args.data_dir, '.dataset_cache') if args.dataset_cache else None,
+                            n_jobs=args.n_jobs, size_limits=not args.no_size_limits)
+    output = args.output or os.path.join(
+        BENCHMARK_FOLDER, f"results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nBenchmark results saved to '{output}'")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.tolerance)
+        if not regressions:
+            print(f"No regressions beyond {args.tolerance:.0%} against '{args.compare}'.")
+            return
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%} against '{args.compare}':")
+        for item in regressions:
+            print(f"  {item['rows']:>11,} rows | {item['model']:<24} | {item['stage']:<7} "
+                  f"{item['baseline_s']:.3f}s -> {item['current_s']:.3f}s (x{item['ratio']:.2f})")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import os
+import json
+import shutil
+import hashlib
+import joblib
+import numpy as np
+from dataset_cache import DatasetCache, file_sha256
+
+BUILD_CACHE_DIR = os.path.join('models', 'build_cache')
+# Bump whenever what a cached entry means changes (e.g. the metrics or the split)
+BUILD_CACHE_VERSION = 2
+
+# ==============================================================================
+#  2. Build Cache
+# ==============================================================================
+
+class BuildCache:
+    """Reuses trained models whose inputs have not changed since the last run.
+
+    Each (model, target) pair is fingerprinted from the dataset content, the
+    dtypes it was loaded with, the model class, its parameters, the train/test
+    split and the library versions. An entry stores the fitted model, its test-set predictions and
+    its metrics, so a hit can print the usual report without training.
+    Older entries of the same pair are removed when a new one is stored.
+    """
+
+    def __init__(self, library_versions, cache_dir=BUILD_CACHE_DIR, dataset_cache_dir='.dataset_cache'):
+        """Initializes the cache.
+
+        Args:
+            library_versions (dict): Library name -> version, part of every fingerprint.
+            cache_dir (str): Directory holding the entries.
+            dataset_cache_dir (str): Where the dataset's content hash is remembered between runs.
+        """
+        self.library_versions = library_versions
+        self.cache_dir = cache_dir
+        self._digests = DatasetCache(dataset_cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, file_path, model_class, params, target_name, data_dtypes, test_size=0.2,
+                    random_state=42):
+        """Returns the hex digest identifying one training run.
+
+        Args:
+            target_name (str): The target trained on, or None for a multi-output model.
+            data_dtypes (list): Dtypes of the loaded columns; the float32 dataset cache and
+                parsing the CSV as float64 train slightly different models.
+        """
+        inputs = {
+            'version': BUILD_CACHE_VERSION,
+            'data_sha256': self._digests.source_digest(file_path),
+            'data_dtypes': sorted(data_dtypes),
+            'model_class': getattr(model_class, 'class_path', None)
+                           or f"{model_class.__module__}.{model_class.__qualname__}",
+            'params': params,
+            'target': target_name,
+            'split': {'test_size': test_size, 'random_state': random_state},
+            'library_versions': self.library_versions,
+        }
+        encoded = json.dumps(inputs, sort_keys=True, default=repr).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def load(self, model_name, target_name, fingerprint):
+        """Returns the stored entry for a fingerprint, or None on a miss.
+
+        Returns:
+            dict: 'metrics' (target name -> metrics dictionary), 'y_pred', 'model_path' and 'model_sha256'.
+        """
+        entry_dir = self._entry_dir(model_name, target_name, fingerprint)
+        meta_path = os.path.join(entry_dir, 'meta.json')
+        if not os.path.exists(meta_path):
+            self.misses += 1
+            return None
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        self.hits += 1
+        return {
+            'metrics': meta['metrics'],
+            'y_pred': np.load(os.path.join(entry_dir, 'y_pred.npy'), allow_pickle=False),
+            'model_path': os.path.join(entry_dir, 'model.joblib'),
+            'model_sha256': meta['model_sha256'],
+        }
+
+    def store(self, model_name, target_name, fingerprint, model, metrics, y_pred):
+        """Saves a freshly trained model, its predictions and metrics under its fingerprint.
+
+        Args:
+            metrics (dict): Target name -> metrics dictionary of every target the model predicts.
+        """
+        entry_dir = self._entry_dir(model_name, target_name, fingerprint)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        model_path = os.path.join(tmp_dir, 'model.joblib')
+        joblib.dump(model, model_path)
+        np.save(os.path.join(tmp_dir, 'y_pred.npy'), np.asarray(y_pred, dtype=np.float64))
+        meta = {
+            'model_name': model_name,
+            'target': target_name,
+            'fingerprint': fingerprint,
+            'model_sha256': file_sha256(model_path),
+            'metrics': {name: {key: float(value) for key, value in target_metrics.items()}
+                        for name, target_metrics in metrics.items()},
+        }
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.rename(tmp_dir, entry_dir)
+        self._remove_stale_entries(entry_dir)
+
+    def _entry_dir(self, model_name, target_name, fingerprint):
+        return os.path.join(self.cache_dir, f"{self._slot(model_name, target_name)}-{fingerprint[:16]}")
+
+    @staticmethod
+    def _slot(model_name, target_name):
+        """The name shared by every entry of one (model, target) pair."""
+        target = target_name or 'multi_output'
+        return f"{model_name}-{target}".lower().replace(' ', '_')
+
+    def _remove_stale_entries(self, current_entry_dir):
+        """Deletes older entries of the same (model, target) pair."""
+        prefix = os.path.basename(current_entry_dir)[:-16]
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if (name.startswith(prefix) and len(name) == len(prefix) + 16 and '.tmp-' not in name
+                    and path != current_entry_dir):
+                shutil.rmtree(path, ignore_errors=True)
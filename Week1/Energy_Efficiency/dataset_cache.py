@@ -0,0 +1,171 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+
+# Bump whenever the on-disk layout or the cleaning steps below change
+CACHE_FORMAT_VERSION = 2
+
+# ==============================================================================
+#  2. Hashing Helpers
+# ==============================================================================
+
+def file_sha256(file_path, block_size=1 << 20):
+    """Returns the SHA-256 hex digest of a file's content, read in blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cleaning_rules_fingerprint(column_renames, feature_names, target_names):
+    """Returns a digest of everything that shapes the cleaned arrays besides the CSV itself."""
+    rules = {
+        'version': CACHE_FORMAT_VERSION,
+        'dropna': 'any',
+        'dtype': 'float32',
+        'column_renames': column_renames,
+        'feature_names': list(feature_names),
+        'target_names': list(target_names),
+    }
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode('utf-8')).hexdigest()
+
+# ==============================================================================
+#  3. Dataset Cache
+# ==============================================================================
+
+class DatasetCache:
+    """A memory-mappable binary cache of the cleaned energy dataset.
+
+    The cleaned, renamed and float32-downcast columns are stored as one raw
+    row-major float32 file plus a small JSON header. Entries are keyed on the
+    SHA-256 of the source CSV and of the cleaning rules, so editing either one
+    transparently triggers a rebuild. To avoid re-hashing large files on every
+    run, a file's digest is reused while its size and modification time are
+    unchanged.
+    """
+
+    def __init__(self, cache_dir='.dataset_cache', chunk_size=1_000_000):
+        """Initializes the cache.
+
+        Args:
+            cache_dir (str): Directory holding the cache entries.
+            chunk_size (int): Rows parsed per chunk while building an entry.
+        """
+        self.cache_dir = cache_dir
+        self.chunk_size = chunk_size
+        self._index_path = os.path.join(cache_dir, 'source_index.json')
+
+    def load(self, csv_path, column_renames, feature_names, target_names, require_complete=False):
+        """Returns the cleaned dataset as a read-only memory map, building it if needed.
+
+        Target columns are included only when the CSV has all of them, so the
+        same cache also serves files of designs that have not been scored yet.
+
+        Args:
+            require_complete (bool): Raise instead of returning an entry from which
+                incomplete rows were dropped, e.g. when rows must line up with the CSV.
+
+        Returns:
+            tuple: (np.memmap of shape (rows, columns), list of column names).
+        """
+        rules = cleaning_rules_fingerprint(column_renames, feature_names, target_names)
+        content = self.source_digest(csv_path)
+        key = hashlib.sha256(f"{content}:{rules}".encode('utf-8')).hexdigest()
+        stem = os.path.splitext(os.path.basename(csv_path))[0]
+        entry_dir = os.path.join(self.cache_dir, f"{stem}-{key[:16]}")
+        meta_path = os.path.join(entry_dir, 'meta.json')
+        if not os.path.exists(meta_path):
+            print(f"Building dataset cache for '{csv_path}'...")
+            self._build(csv_path, entry_dir, key, rules, column_renames, feature_names, target_names)
+            self._remove_stale_entries(os.path.abspath(csv_path), rules, entry_dir)
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        if require_complete and meta['rows_dropped']:
+            raise ValueError(f"'{csv_path}' has {meta['rows_dropped']:,} rows with missing values, "
+                             "which the dataset cache drops; read it without the cache instead.")
+        data = np.memmap(os.path.join(entry_dir, 'data.f32'), dtype=np.float32, mode='r',
+                         shape=(meta['rows'], len(meta['columns'])))
+        return data, meta['columns']
+
+    def load_frame(self, csv_path, column_renames, feature_names, target_names):
+        """Same as `load`, wrapped in a DataFrame that shares the memory-mapped buffer."""
+        data, columns = self.load(csv_path, column_renames, feature_names, target_names)
+        return pd.DataFrame(data, columns=columns, copy=False)
+
+    def _build(self, csv_path, entry_dir, key, rules, column_renames, feature_names, target_names):
+        """Streams the CSV through the cleaning rules into a new cache entry."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        rows, rows_dropped, columns = 0, 0, None
+        with open(os.path.join(tmp_dir, 'data.f32'), 'wb') as out:
+            for chunk in pd.read_csv(csv_path, chunksize=self.chunk_size):
+                complete = chunk.dropna()
+                rows_dropped += len(chunk) - len(complete)
+                chunk = complete.rename(columns=column_renames)
+                if columns is None:
+                    missing = [name for name in feature_names if name not in chunk.columns]
+                    if missing:
+                        raise ValueError(f"'{csv_path}' is missing feature columns: {missing}")
+                    has_targets = all(name in chunk.columns for name in target_names)
+                    columns = list(feature_names) + (list(target_names) if has_targets else [])
+                np.ascontiguousarray(chunk[columns].to_numpy(dtype=np.float32)).tofile(out)
+                rows += len(chunk)
+        if columns is None:
+            raise ValueError(f"'{csv_path}' contains no data.")
+        meta = {'key': key, 'source': os.path.abspath(csv_path), 'rules': rules, 'rows': rows,
+                'rows_dropped': rows_dropped, 'columns': columns, 'dtype': 'float32', 'version': CACHE_FORMAT_VERSION}
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+        try:
+            os.rename(tmp_dir, entry_dir) # Atomic publish of the finished entry
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True) # Another process built it first
+
+    def _remove_stale_entries(self, source, rules, current_entry_dir):
+        """Deletes older entries built from the same source file with the same cleaning rules.
+
+        Entries of other files that merely share the file name, or of the same file
+        cleaned with other rules (e.g. training vs. scoring), are left alone.
+        """
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if '.tmp-' in name or not os.path.isdir(path) or path == current_entry_dir:
+                continue
+            try:
+                with open(os.path.join(path, 'meta.json'), 'r') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue # Not a cache entry, or one still being published
+            if meta.get('source') == source and meta.get('rules') == rules:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def source_digest(self, csv_path):
+        """Returns the content hash of `csv_path`, reusing it while size and mtime are unchanged."""
+        stat = os.stat(csv_path)
+        source = os.path.abspath(csv_path)
+        index = {}
+        if os.path.exists(self._index_path):
+            try:
+                with open(self._index_path, 'r') as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = {}
+        known = index.get(source)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['sha256']
+        digest = file_sha256(csv_path)
+        index[source] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._index_path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self._index_path)
+        return digest
@@ -0,0 +1,298 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import os
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from predict import EnergyLoadPredictor
+from main import FEATURE_NAMES, COLUMN_RENAMES
+
+FEATURE_ALIASES = {raw: name for raw, name in COLUMN_RENAMES.items() if name in FEATURE_NAMES}
+# Rows generated and scored per chunk; bounds memory regardless of the grid size
+DEFAULT_CHUNK_SIZE = 500_000
+# Larger grids are searched with the evolutionary optimizer instead of enumerated
+DEFAULT_MAX_EXHAUSTIVE = 50_000_000
+OBJECTIVES = {'total': (1.0, 1.0), 'heating': (1.0, 0.0), 'cooling': (0.0, 1.0)}
+
+# ==============================================================================
+#  2. Design Space
+# ==============================================================================
+
+class DesignSpace:
+    """The values each of the eight features may take.
+
+    A spec maps a feature name (or X1..X8) to one of:
+      - a number: the feature is fixed;
+      - a list of values: a discrete set;
+      - {'low': a, 'high': b, 'steps': n}: n evenly spaced values;
+      - {'low': a, 'high': b}: a continuous range (optimizer only).
+    Features missing from the spec are fixed to `defaults` when given.
+    """
+
+    def __init__(self, spec, defaults=None):
+        spec = {FEATURE_ALIASES.get(name, name): value for name, value in spec.items()}
+        unknown = [name for name in spec if name not in FEATURE_NAMES]
+        if unknown:
+            raise ValueError(f"Unknown features: {unknown}")
+        defaults = dict(zip(FEATURE_NAMES, defaults)) if defaults is not None else {}
+        missing = [name for name in FEATURE_NAMES if name not in spec and name not in defaults]
+        if missing:
+            raise ValueError(f"No values given for features: {missing}")
+        self.axes = []       # Candidate values per feature (None for continuous ranges)
+        self.bounds = []     # (low, high) per feature
+        for name in FEATURE_NAMES:
+            value = spec.get(name, defaults.get(name))
+            if isinstance(value, dict):
+                low, high = float(value['low']), float(value['high'])
+                if low > high:
+                    raise ValueError(f"'{name}': low must not exceed high.")
+                axis = np.linspace(low, high, int(value['steps'])) if 'steps' in value else None
+            else:
+                axis = np.unique(np.atleast_1d(np.asarray(value, dtype=np.float64)))
+                low, high = float(axis.min()), float(axis.max())
+            self.axes.append(axis)
+            self.bounds.append((low, high))
+
+    @property
+    def is_discrete(self):
+        return all(axis is not None for axis in self.axes)
+
+    @property
+    def shape(self):
+        return tuple(len(axis) for axis in self.axes)
+
+    @property
+    def size(self):
+        """Number of designs in the full grid (inf when a feature is continuous)."""
+        if not self.is_discrete:
+            return float('inf')
+        return int(np.prod(self.shape, dtype=np.float64))
+
+    def iter_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yields the Cartesian grid in row-major order, `chunk_size` designs at a time.
+
+        Designs are decoded from their flat index with `np.unravel_index`, so
+        only the current chunk is ever materialized.
+        """
+        if not self.is_discrete:
+            raise ValueError("Continuous ranges cannot be enumerated; give 'steps' or use the optimizer.")
+        for start in range(0, self.size, chunk_size):
+            index = np.arange(start, min(start + chunk_size, self.size), dtype=np.int64)
+            coords = np.unravel_index(index, self.shape)
+            yield np.column_stack([axis[coord] for axis, coord in zip(self.axes, coords)])
+
+    def sample(self, n, rng):
+        """Draws `n` random designs from the space."""
+        columns = []
+        for axis, (low, high) in zip(self.axes, self.bounds):
+            columns.append(rng.choice(axis, size=n) if axis is not None else rng.uniform(low, high, size=n))
+        return np.column_stack(columns)
+
+    def mutate(self, X, rate, rng):
+        """Re-draws each feature of each design with probability `rate`.
+
+        Discrete features jump to another allowed value, continuous ones move
+        by Gaussian noise scaled to 10% of their range and are clipped to it.
+        """
+        X = X.copy()
+        for column, (axis, (low, high)) in enumerate(zip(self.axes, self.bounds)):
+            mask = rng.random(len(X)) < rate
+            if not mask.any() or low == high:
+                continue
+            if axis is not None:
+                X[mask, column] = rng.choice(axis, size=int(mask.sum()))
+            else:
+                noise = rng.normal(scale=0.1 * (high - low), size=int(mask.sum()))
+                X[mask, column] = np.clip(X[mask, column] + noise, low, high)
+        return X
+
+# ==============================================================================
+#  3. Selection Helpers
+# ==============================================================================
+
+def objective_weights(objective):
+    """Returns the (heating, cooling) weights of an objective name or weight pair."""
+    if isinstance(objective, str):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"objective must be one of {list(OBJECTIVES)} or a (heating, cooling) weight pair.")
+        return OBJECTIVES[objective]
+    heating_weight, cooling_weight = objective
+    return float(heating_weight), float(cooling_weight)
+
+def pareto_mask(heating, cooling):
+    """Returns True for the designs no other design beats on both loads (both minimized)."""
+    order = np.lexsort((cooling, heating)) # By heating, then cooling
+    sorted_cooling = cooling[order]
+    best_before = np.minimum.accumulate(np.concatenate([[np.inf], sorted_cooling[:-1]]))
+    keep = np.zeros(len(heating), dtype=bool)
+    keep[order] = sorted_cooling < best_before
+    return keep
+
+def _to_frame(X, heating, cooling, score=None):
+    frame = pd.DataFrame(X, columns=FEATURE_NAMES)
+    frame['Predicted Heating Load'] = heating
+    frame['Predicted Cooling Load'] = cooling
+    if score is not None:
+        frame['Objective'] = score
+    return frame
+
+# ==============================================================================
+#  4. Sweep and Optimization API
+# ==============================================================================
+
+class DesignSweep:
+    """Scores whole design spaces with a predictor's vectorized `predict_batch`.
+
+    Exhaustive sweeps stream the grid chunk by chunk and keep only the
+    running top-k or Pareto front, so memory stays bounded by `chunk_size`
+    however many designs there are. Spaces too large to enumerate (or with
+    continuous ranges) are searched with a simple evolutionary optimizer.
+    """
+
+    def __init__(self, predictor, chunk_size=DEFAULT_CHUNK_SIZE, max_exhaustive=DEFAULT_MAX_EXHAUSTIVE):
+        """Initializes the sweep.
+
+        Args:
+            predictor (EnergyLoadPredictor): Any object with `predict_batch(np.ndarray)`.
+            chunk_size (int): Designs generated and scored per batch.
+            max_exhaustive (int): Largest grid `optimize` enumerates before switching to the optimizer.
+        """
+        self.predictor = predictor
+        self.chunk_size = chunk_size
+        self.max_exhaustive = max_exhaustive
+
+    def _score(self, X):
+        heating, cooling = self.predictor.predict_batch(X)
+        return np.asarray(heating, dtype=np.float64), np.asarray(cooling, dtype=np.float64)
+
+    def top_k(self, space, k=10, objective='total'):
+        """Enumerates the grid and returns the `k` designs with the lowest weighted load.
+
+        Returns:
+            pd.DataFrame: The best designs with their predicted loads, best first.
+        """
+        heating_weight, cooling_weight = objective_weights(objective)
+        best_X = np.empty((0, len(FEATURE_NAMES)))
+        best_heating, best_cooling, best_score = np.empty(0), np.empty(0), np.empty(0)
+        for X in space.iter_chunks(self.chunk_size):
+            heating, cooling = self._score(X)
+            score = heating_weight * heating + cooling_weight * cooling
+            # Merge the chunk with the running best and keep the k smallest
+            best_X = np.concatenate([best_X, X])
+            best_heating = np.concatenate([best_heating, heating])
+            best_cooling = np.concatenate([best_cooling, cooling])
+            best_score = np.concatenate([best_score, score])
+            if len(best_score) > k:
+                keep = np.argpartition(best_score, k - 1)[:k]
+                best_X, best_heating = best_X[keep], best_heating[keep]
+                best_cooling, best_score = best_cooling[keep], best_score[keep]
+        order = np.argsort(best_score, kind='stable')
+        return _to_frame(best_X[order], best_heating[order], best_cooling[order], best_score[order])
+
+    def pareto_front(self, space):
+        """Enumerates the grid and returns the designs on the heating/cooling Pareto front.
+
+        Returns:
+            pd.DataFrame: The non-dominated designs, sorted by heating load.
+        """
+        front_X = np.empty((0, len(FEATURE_NAMES)))
+        front_heating, front_cooling = np.empty(0), np.empty(0)
+        for X in space.iter_chunks(self.chunk_size):
+            heating, cooling = self._score(X)
+            keep = pareto_mask(heating, cooling) # Shrink the chunk first, then merge
+            front_X = np.concatenate([front_X, X[keep]])
+            front_heating = np.concatenate([front_heating, heating[keep]])
+            front_cooling = np.concatenate([front_cooling, cooling[keep]])
+            keep = pareto_mask(front_heating, front_cooling)
+            front_X, front_heating, front_cooling = front_X[keep], front_heating[keep], front_cooling[keep]
+        order = np.argsort(front_heating, kind='stable')
+        return _to_frame(front_X[order], front_heating[order], front_cooling[order])
+
+    def evolve(self, space, k=10, objective='total', population=512, generations=60, mutation_rate=0.2,
+               elite_fraction=0.1, seed=42):
+        """Searches the space with a genetic algorithm and returns the best `k` designs seen.
+
+        Each generation is scored with one bulk prediction call. Parents are
+        picked by tournament, children mix their parents' features uniformly
+        and are then mutated; the best `elite_fraction` survive unchanged.
+
+        Returns:
+            pd.DataFrame: The best distinct designs found, best first.
+        """
+        heating_weight, cooling_weight = objective_weights(objective)
+        rng = np.random.default_rng(seed)
+        n_elite = max(1, int(population * elite_fraction))
+        X = space.sample(population, rng)
+        seen = {}
+        for _ in range(generations):
+            heating, cooling = self._score(X)
+            score = heating_weight * heating + cooling_weight * cooling
+            for row, h, c, s in zip(map(tuple, X), heating, cooling, score):
+                seen[row] = (h, c, s)
+            order = np.argsort(score)
+            elite = X[order[:n_elite]]
+            # Tournament selection: the better of two random designs becomes a parent
+            pairs = rng.integers(0, population, size=(2, 2, population - n_elite))
+            parents = np.where(score[pairs[:, 0]] <= score[pairs[:, 1]], pairs[:, 0], pairs[:, 1])
+            from_first = rng.random((population - n_elite, len(FEATURE_NAMES))) < 0.5
+            children = np.where(from_first, X[parents[0]], X[parents[1]])
+            X = np.concatenate([elite, space.mutate(children, mutation_rate, rng)])
+        best = sorted(seen.items(), key=lambda item: item[1][2])[:k]
+        designs = np.array([row for row, _ in best])
+        values = np.array([value for _, value in best])
+        return _to_frame(designs, values[:, 0], values[:, 1], values[:, 2])
+
+    def optimize(self, space, k=10, objective='total', **evolve_params):
+        """Returns the top-k designs, enumerating small grids and evolving large or continuous spaces."""
+        if space.size <= self.max_exhaustive:
+            return self.top_k(space, k, objective)
+        return self.evolve(space, k, objective, **evolve_params)
+
+# ==============================================================================
+#  5. Main Execution Block
+# ==============================================================================
+def main():
+    """Runs a sweep described by a JSON spec file and prints the best designs."""
+    parser = argparse.ArgumentParser(description="Sweep and optimize building design parameters.")
+    parser.add_argument('--spec', required=True,
+                        help="JSON file mapping feature names (or X1..X8) to a value, a list or a {low, high[, steps]} range.")
+    parser.add_argument('--mode', choices=['optimize', 'top-k', 'pareto', 'evolve'], default='optimize')
+    parser.add_argument('--objective', choices=list(OBJECTIVES), default='total')
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--generations', type=int, default=60)
+    parser.add_argument('--population', type=int, default=512)
+    parser.add_argument('--output', help="Optional CSV file for the resulting designs.")
+    parser.add_argument('--heating-model', default=os.path.join('models', 'xgb_heating_model.joblib'))
+    parser.add_argument('--cooling-model', default=os.path.join('models', 'xgb_cooling_model.joblib'))
+    parser.add_argument('--multi-output-model', default=None)
+    args = parser.parse_args()
+
+    with open(args.spec, 'r') as f:
+        space = DesignSpace(json.load(f))
+    predictor = EnergyLoadPredictor(args.heating_model, args.cooling_model, args.multi_output_model)
+    if not predictor.models_loaded():
+        return
+    sweep = DesignSweep(predictor, chunk_size=args.chunk_size)
+    print(f"Design space: {space.size:,} designs" if space.is_discrete else "Design space: continuous")
+    start = time.perf_counter()
+    evolve_params = {'generations': args.generations, 'population': args.population}
+    if args.mode == 'pareto':
+        result = sweep.pareto_front(space)
+    elif args.mode == 'top-k':
+        result = sweep.top_k(space, args.top_k, args.objective)
+    elif args.mode == 'evolve':
+        result = sweep.evolve(space, args.top_k, args.objective, **evolve_params)
+    else:
+        result = sweep.optimize(space, args.top_k, args.objective, **evolve_params)
+    print(f"Finished in {time.perf_counter() - start:.2f}s\n")
+    print(result.to_string(index=False))
+    if args.output:
+        result.to_csv(args.output, index=False)
+        print(f"\nResults saved to '{args.output}'")
+
+if __name__ == '__main__':
+    main()
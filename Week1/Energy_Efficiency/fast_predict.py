@@ -0,0 +1,148 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+# Only the standard library is imported at module load. NumPy and the tree
+# evaluator are imported on first use, and pandas, scikit-learn, xgboost and
+# joblib are never imported, so a cold start costs little more than NumPy.
+import time
+_MODULE_START = time.perf_counter()
+import os
+import sys
+import argparse
+
+# Column order of every input row (same as EnergyLoadPredictor.feature_names)
+FEATURE_NAMES = [
+    'Relative Compactness', 'Surface Area', 'Wall Area', 'Roof Area',
+    'Overall Height', 'Orientation', 'Glazing Area', 'Glazing Area Distribution'
+]
+# Raw dataset headers accepted in CSV input in place of the full names
+COLUMN_ALIASES = {f"X{index + 1}": name for index, name in enumerate(FEATURE_NAMES)}
+HEATING_MODEL_PATH = os.path.join('models', 'xgb_heating_model.npz')
+COOLING_MODEL_PATH = os.path.join('models', 'xgb_cooling_model.npz')
+
+# ==============================================================================
+#  2. Lightweight Predictor
+# ==============================================================================
+
+class FastEnergyPredictor:
+    """Predicts heating and cooling loads from pickle-free .npz or .trees tree ensembles.
+
+    The models are the flattened arrays written by `tree_export.py` (and by
+    `main.py` next to every saved XGBoost model), evaluated with NumPy only.
+    Inputs are plain lists or arrays whose columns follow `FEATURE_NAMES`;
+    no DataFrame is ever built. `timings` records where the start-up time
+    went.
+    """
+
+    def __init__(self, heating_model_path=HEATING_MODEL_PATH, cooling_model_path=COOLING_MODEL_PATH,
+                 multi_output_model_path=None):
+        """Loads the ensembles.
+
+        Args:
+            heating_model_path (str): .npz or .trees ensemble of the heating load model.
+            cooling_model_path (str): .npz or .trees ensemble of the cooling load model.
+            multi_output_model_path (str, optional): A single ensemble with both outputs;
+                when given, the two separate models are not loaded.
+        """
+        self.timings = {}
+        start = time.perf_counter()
+        import numpy as np
+        self._np = np
+        self.timings['import_numpy_s'] = time.perf_counter() - start
+        start = time.perf_counter()
+        from tree_export import load_ensemble
+        self.timings['import_evaluator_s'] = time.perf_counter() - start
+        start = time.perf_counter()
+        paths = [multi_output_model_path] if multi_output_model_path else [heating_model_path, cooling_model_path]
+        missing = [path for path in paths if not os.path.exists(path)]
+        if missing:
+            raise FileNotFoundError(f"Model file(s) not found: {missing}. Export them with "
+                                    "'python tree_export.py --model <file>.joblib' or run 'python main.py'.")
+        self.models = [load_ensemble(path) for path in paths]
+        self.timings['load_models_s'] = time.perf_counter() - start
+
+    def predict(self, features):
+        """Predicts both loads for one row or many rows.
+
+        Args:
+            features (list | np.ndarray): 8 values, or rows of 8 values, in `FEATURE_NAMES` order.
+
+        Returns:
+            tuple: Two 1D float64 arrays (heating loads, cooling loads).
+        """
+        np = self._np
+        start = time.perf_counter()
+        X = np.asarray(features, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.ndim != 2 or X.shape[1] != len(FEATURE_NAMES):
+            raise ValueError(f"Expected rows of {len(FEATURE_NAMES)} features, got shape {X.shape}.")
+        if len(self.models) == 1:
+            predictions = self.models[0].predict(X)
+            heating, cooling = predictions[:, 0], predictions[:, 1]
+        else:
+            heating, cooling = (model.predict(X) for model in self.models)
+        self.timings.setdefault('first_prediction_s', time.perf_counter() - start)
+        return heating, cooling
+
+    def predict_csv(self, input_path):
+        """Reads a CSV with the feature columns (full names or X1..X8) and predicts every row.
+
+        Blank rows (such as the trailing ',,,,' lines of the UCI file) are skipped, as in
+        `main.load_energy_dataset`; a row with only some features missing is an error.
+
+        Returns:
+            tuple: (feature array, heating loads, cooling loads).
+        """
+        np = self._np
+        with open(input_path, 'r') as f:
+            header = [COLUMN_ALIASES.get(name.strip(), name.strip()) for name in f.readline().split(',')]
+        missing = [name for name in FEATURE_NAMES if name not in header]
+        if missing:
+            raise ValueError(f"'{input_path}' is missing feature columns: {missing}")
+        X = np.genfromtxt(input_path, delimiter=',', skip_header=1, ndmin=2,
+                          usecols=[header.index(name) for name in FEATURE_NAMES])
+        missing = np.isnan(X)
+        X = X[~missing.all(axis=1)]
+        incomplete = missing.any(axis=1) & ~missing.all(axis=1)
+        if incomplete.any():
+            raise ValueError(f"'{input_path}' has {int(incomplete.sum())} rows with missing feature values.")
+        heating, cooling = self.predict(X)
+        return X, heating, cooling
+
+# ==============================================================================
+#  3. Main Execution Block
+# ==============================================================================
+def main():
+    """Scores one building given on the command line, or a CSV file, and reports start-up costs."""
+    parser = argparse.ArgumentParser(description="Fast-start energy load prediction from .npz ensembles.")
+    parser.add_argument('features', nargs='*', type=float, help=f"The 8 feature values in order: {FEATURE_NAMES}")
+    parser.add_argument('--input', help="CSV file of designs to score instead of a single row.")
+    parser.add_argument('--output', help="Where to write the CSV predictions (default: print them).")
+    parser.add_argument('--heating-model', default=HEATING_MODEL_PATH)
+    parser.add_argument('--cooling-model', default=COOLING_MODEL_PATH)
+    parser.add_argument('--multi-output-model', default=None)
+    parser.add_argument('--timings', action='store_true', help="Print the start-up time breakdown to stderr.")
+    args = parser.parse_args()
+    if not args.input and len(args.features) != len(FEATURE_NAMES):
+        parser.error(f"Give exactly {len(FEATURE_NAMES)} feature values or --input.")
+
+    predictor = FastEnergyPredictor(args.heating_model, args.cooling_model, args.multi_output_model)
+    if args.input:
+        X, heating, cooling = predictor.predict_csv(args.input)
+        np = predictor._np
+        table = np.column_stack([X, heating, cooling])
+        header = ','.join(FEATURE_NAMES + ['Predicted Heating Load', 'Predicted Cooling Load'])
+        np.savetxt(args.output or sys.stdout, table, delimiter=',', header=header, comments='', fmt='%.6g')
+    else:
+        heating, cooling = predictor.predict(args.features)
+        print(f"Predicted Heating Load (Y1): {heating[0]:.2f}")
+        print(f"Predicted Cooling Load (Y2): {cooling[0]:.2f}")
+
+    if args.timings:
+        timings = dict(predictor.timings, total_since_module_start_s=time.perf_counter() - _MODULE_START)
+        for name, seconds in timings.items():
+            print(f"  {name:<28} {seconds * 1000.0:8.2f} ms", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
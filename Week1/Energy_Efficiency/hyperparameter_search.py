@@ -0,0 +1,268 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from sklearn.model_selection import KFold, ParameterGrid, ParameterSampler
+from sklearn.metrics import mean_squared_error
+from sklearn.linear_model import LinearRegression
+from sklearn.ensemble import RandomForestRegressor
+import xgboost as xgb
+from threadpoolctl import threadpool_limits # Installed with scikit-learn
+from main import ModelEvaluator, split_dataset, TARGET_NAMES, MODEL_FOLDER
+from parallel_evaluation import _thread_params
+
+# Smallest number of training rows a configuration is ever fitted on
+MIN_TRAIN_SAMPLES = 50
+# Share of each training fold held back to decide when XGBoost trials stop
+EARLY_STOPPING_FRACTION = 0.1
+
+# Candidate values searched for each model, keyed like `models_to_test` in main.py
+SEARCH_SPACES = {
+    "Linear Regression": (LinearRegression, {
+        'fit_intercept': [True, False],
+    }),
+    "Random Forest Regressor": (RandomForestRegressor, {
+        'n_estimators': [50, 100, 200, 400],
+        'max_depth': [None, 8, 16, 32],
+        'min_samples_split': [2, 4, 8],
+        'min_samples_leaf': [1, 2, 4],
+        'max_features': [1.0, 0.7, 0.5, 'sqrt'],
+        'random_state': [42],
+    }),
+    "XGBoost Regressor": (xgb.XGBRegressor, {
+        'n_estimators': [1000], # Upper bound; early stopping picks the real number of rounds
+        'learning_rate': [0.01, 0.03, 0.05, 0.1, 0.2, 0.3],
+        'max_depth': [3, 4, 5, 6, 8, 10],
+        'min_child_weight': [1, 3, 5, 10],
+        'subsample': [0.6, 0.8, 1.0],
+        'colsample_bytree': [0.6, 0.8, 1.0],
+        'reg_lambda': [0.1, 1.0, 10.0],
+        'random_state': [42],
+    }),
+}
+
+# ==============================================================================
+#  2. Worker-Side Fold Evaluation
+# ==============================================================================
+
+# Read-only training data and fold indices shared by every task of a worker
+_SHARED_DATA = {}
+
+def _init_worker(X, y, folds):
+    """Stores the training data and fold indices once per worker, single-threaded."""
+    _SHARED_DATA.update(X=X, y=y, folds=folds)
+    threadpool_limits(limits=1) # Parallelism comes from running many folds at once
+
+def _evaluate_fold(model_class, params, fold_index, sample_fraction, early_stopping_rounds, seed):
+    """Trains one configuration on a (subsampled) training fold and scores its validation fold.
+
+    Early stopping watches a slice split off the training fold, never the
+    validation fold, so the returned RMSE stays an unbiased estimate.
+
+    Returns:
+        tuple: (validation RMSE, number of boosting rounds used or None).
+    """
+    X, y = _SHARED_DATA['X'], _SHARED_DATA['y']
+    train_index, val_index = _SHARED_DATA['folds'][fold_index]
+    rng = np.random.default_rng(seed + fold_index)
+    if sample_fraction < 1.0:
+        n_samples = min(len(train_index), max(MIN_TRAIN_SAMPLES, int(len(train_index) * sample_fraction)))
+        train_index = rng.choice(train_index, size=n_samples, replace=False)
+    params = _thread_params(model_class, params, 1)
+    fit_kwargs = {}
+    if model_class is xgb.XGBRegressor and early_stopping_rounds:
+        # Stops a trial as soon as a held-back slice of the training fold stops improving
+        train_index = rng.permutation(train_index)
+        n_stop = max(1, int(len(train_index) * EARLY_STOPPING_FRACTION))
+        stop_index, train_index = train_index[:n_stop], train_index[n_stop:]
+        params['early_stopping_rounds'] = early_stopping_rounds
+        fit_kwargs = {'eval_set': [(X[stop_index], y[stop_index])], 'verbose': False}
+    model = model_class(**params)
+    model.fit(X[train_index], y[train_index], **fit_kwargs)
+    rmse = float(np.sqrt(mean_squared_error(y[val_index], model.predict(X[val_index]))))
+    best_iteration = getattr(model, 'best_iteration', None) if fit_kwargs else None
+    return rmse, (None if best_iteration is None else int(best_iteration) + 1)
+
+# ==============================================================================
+#  3. Successive Halving Search
+# ==============================================================================
+
+class SuccessiveHalvingSearch:
+    """Cross-validated hyperparameter search that drops weak configurations early.
+
+    All configurations start on a small fraction of each training fold. After
+    every rung only the best `1 / eta` of them (by mean k-fold RMSE) move on,
+    and the training fraction grows by `eta`, until the survivors are trained
+    on the full folds. Every fold of every configuration in a rung runs in
+    parallel on a process pool. XGBoost trials also use early stopping on a
+    slice held back from the training fold. All results are written to a leaderboard file after each
+    rung.
+    """
+
+    def __init__(self, model_name, file_path, target_name='Heating Load', n_configs=81, n_folds=5,
+                 eta=3, min_fraction=None, early_stopping_rounds=10, max_workers=None, random_state=42):
+        """Initializes the search.
+
+        Args:
+            model_name (str): A key of `SEARCH_SPACES`.
+            file_path (str): The path of the energy efficiency CSV.
+            target_name (str): 'Heating Load' or 'Cooling Load'.
+            n_configs (int): Number of configurations sampled from the search space.
+            n_folds (int): Number of cross-validation folds.
+            eta (int): Fraction of configurations kept (1/eta) and growth of the training fraction per rung.
+            min_fraction (float, optional): Training fraction of the first rung; defaults to 1/eta^(rungs-1).
+            early_stopping_rounds (int): Patience of XGBoost trials on the held-back training slice.
+            max_workers (int, optional): Number of worker processes; defaults to the core count.
+            random_state (int): Seed for configuration sampling, folds and subsampling.
+        """
+        if target_name not in TARGET_NAMES:
+            raise ValueError(f"target_name must be one of {TARGET_NAMES}.")
+        self.model_class, self.param_space = SEARCH_SPACES[model_name]
+        self.model_name = model_name
+        self.target_name = target_name
+        self.n_folds = n_folds
+        self.eta = eta
+        self.early_stopping_rounds = early_stopping_rounds
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.random_state = random_state
+        self.evaluator = ModelEvaluator(self.model_class, model_name, file_path)
+        self.configs = self._sample_configs(n_configs)
+        self.n_rungs = 1
+        while eta ** self.n_rungs <= len(self.configs):
+            self.n_rungs += 1
+        self.min_fraction = min_fraction or 1.0 / eta ** (self.n_rungs - 1)
+        self.leaderboard = []
+        slug = model_name.lower().replace(' ', '_')
+        target_slug = target_name.lower().replace(' ', '_')
+        self.leaderboard_path = os.path.join(MODEL_FOLDER, f"search_leaderboard_{slug}_{target_slug}.json")
+
+    def _sample_configs(self, n_configs):
+        """Returns up to `n_configs` distinct configurations from the search space."""
+        grid = ParameterGrid(self.param_space)
+        if len(grid) <= n_configs:
+            return list(grid)
+        return list(ParameterSampler(self.param_space, n_iter=n_configs, random_state=self.random_state))
+
+    def run(self):
+        """Runs every rung, refits the winner on the full training split and scores the holdout.
+
+        Returns:
+            dict: The best configuration found, or None if the dataset is missing.
+        """
+        if self.evaluator.df is None:
+            return None
+        X_train, X_test, Y_train, Y_test = split_dataset(self.evaluator.df)
+        X = np.ascontiguousarray(X_train.to_numpy())
+        y = np.ascontiguousarray(Y_train[self.target_name].to_numpy())
+        folds = list(KFold(self.n_folds, shuffle=True, random_state=self.random_state).split(X))
+
+        print("\n" + "="*60)
+        print(f"--- SEARCHING {self.model_name} for {self.target_name}: {len(self.configs)} configurations, "
+              f"{self.n_folds} folds, {self.n_rungs} rungs ---")
+        print("="*60)
+        start = time.perf_counter()
+        survivors = list(range(len(self.configs)))
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(X, y, folds)) as pool:
+            for rung in range(self.n_rungs):
+                fraction = min(1.0, self.min_fraction * self.eta ** rung)
+                scores = self._run_rung(pool, rung, survivors, fraction)
+                survivors = sorted(survivors, key=lambda config_id: scores[config_id])
+                best = survivors[0]
+                print(f"  Rung {rung + 1}/{self.n_rungs}: {len(survivors)} configs on {fraction:.0%} of each fold, "
+                      f"best CV RMSE {scores[best]:.4f} ({time.perf_counter() - start:.1f}s elapsed)")
+                self._save_leaderboard()
+                if rung < self.n_rungs - 1:
+                    survivors = survivors[:max(1, len(survivors) // self.eta)]
+        best_entry = min((entry for entry in self.leaderboard if entry['rung'] == self.n_rungs - 1),
+                         key=lambda entry: entry['mean_rmse'])
+        print(f"\nSearch finished in {time.perf_counter() - start:.1f}s. Leaderboard saved to '{self.leaderboard_path}'")
+        print(f"Best configuration: {best_entry['params']}")
+        self._evaluate_best(best_entry, X_train, X_test, Y_train, Y_test)
+        return best_entry
+
+    def _run_rung(self, pool, rung, config_ids, fraction):
+        """Evaluates every fold of every surviving configuration in parallel.
+
+        Returns:
+            dict: Configuration id -> mean validation RMSE across folds.
+        """
+        futures = {}
+        for config_id in config_ids:
+            for fold_index in range(self.n_folds):
+                futures[(config_id, fold_index)] = pool.submit(
+                    _evaluate_fold, self.model_class, self.configs[config_id], fold_index,
+                    fraction, self.early_stopping_rounds, self.random_state + rung)
+        scores = {}
+        for config_id in config_ids:
+            fold_results = [futures[(config_id, fold_index)].result() for fold_index in range(self.n_folds)]
+            fold_rmse = [rmse for rmse, _ in fold_results]
+            rounds = [n for _, n in fold_results if n is not None]
+            scores[config_id] = float(np.mean(fold_rmse))
+            self.leaderboard.append({
+                'config_id': config_id,
+                'rung': rung,
+                'train_fraction': fraction,
+                'params': self.configs[config_id],
+                'mean_rmse': scores[config_id],
+                'std_rmse': float(np.std(fold_rmse)),
+                'fold_rmse': fold_rmse,
+                'boosting_rounds': int(np.median(rounds)) if rounds else None,
+            })
+        return scores
+
+    def _save_leaderboard(self):
+        """Writes all trials so far, best first within the latest rung, to the leaderboard file."""
+        os.makedirs(MODEL_FOLDER, exist_ok=True)
+        ranked = sorted(self.leaderboard, key=lambda entry: (-entry['rung'], entry['mean_rmse']))
+        payload = {
+            'model_name': self.model_name,
+            'target_name': self.target_name,
+            'n_folds': self.n_folds,
+            'eta': self.eta,
+            'n_configs': len(self.configs),
+            'trials': ranked,
+        }
+        tmp_path = f"{self.leaderboard_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f, indent=2, default=str)
+        os.replace(tmp_path, self.leaderboard_path)
+
+    def _evaluate_best(self, best_entry, X_train, X_test, Y_train, Y_test):
+        """Refits the best configuration on the whole training split and prints its holdout metrics."""
+        params = dict(best_entry['params'])
+        if best_entry['boosting_rounds']:
+            params['n_estimators'] = best_entry['boosting_rounds']
+        model = self.model_class(**params)
+        model.fit(X_train, Y_train[self.target_name])
+        self.evaluator.X_test = X_test
+        self.evaluator._print_evaluation_results(Y_test[self.target_name], model.predict(X_test), self.target_name)
+
+# ==============================================================================
+#  4. Main Execution Block
+# ==============================================================================
+def main():
+    """Runs a successive-halving search for one model and target."""
+    parser = argparse.ArgumentParser(description="Parallel cross-validated hyperparameter search.")
+    parser.add_argument('--model', default="XGBoost Regressor", choices=list(SEARCH_SPACES))
+    parser.add_argument('--target', default='Heating Load', choices=TARGET_NAMES)
+    parser.add_argument('--n-configs', type=int, default=243)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--early-stopping-rounds', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--data', default='energy-efficiency-dataset.csv')
+    args = parser.parse_args()
+
+    search = SuccessiveHalvingSearch(
+        args.model, args.data, target_name=args.target, n_configs=args.n_configs, n_folds=args.folds,
+        eta=args.eta, early_stopping_rounds=args.early_stopping_rounds, max_workers=args.workers)
+    search.run()
+
+if __name__ == '__main__':
+    main()
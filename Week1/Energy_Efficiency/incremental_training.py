@@ -0,0 +1,328 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import io
+import os
+import json
+import time
+import argparse
+import joblib
+import numpy as np
+import pandas as pd
+from main import (compute_regression_metrics, split_dataset, save_model_artifact, publish_to_registry,
+                  COLUMN_RENAMES, FEATURE_NAMES, TARGET_NAMES, MODEL_FOLDER, LOOKUP_TABLE_PATH)
+from lookup_table import refresh_lookup_table
+
+STATE_PATH = os.path.join(MODEL_FOLDER, 'incremental_state.json')
+# Test rows every check scores on: main.py's test split plus the held-out rows of accepted deltas
+HOLDOUT_PATH = os.path.join(MODEL_FOLDER, 'incremental_holdout.npz')
+# Most rows the holdout keeps; beyond that it is a uniform sample of every held-out row so far
+HOLDOUT_MAX_ROWS = 20_000
+MODEL_PATHS = {
+    'Heating Load': os.path.join(MODEL_FOLDER, 'xgb_heating_model.joblib'),
+    'Cooling Load': os.path.join(MODEL_FOLDER, 'xgb_cooling_model.joblib'),
+}
+
+# ==============================================================================
+#  2. Reading the Appended Rows
+# ==============================================================================
+
+def read_rows(file_path, start=0, stop=None):
+    """Reads rows [start, stop) of the CSV (0-based, header excluded), cleaned and renamed.
+
+    The parser still tokenizes every row before `start`, so this costs as much
+    as reading the file up to `stop`; use `read_delta` for appended rows.
+
+    Returns:
+        pd.DataFrame: The rows, indexed by their position in the file.
+    """
+    df = pd.read_csv(file_path, skiprows=range(1, start + 1),
+                     nrows=None if stop is None else max(0, stop - start))
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df.dropna().rename(columns=COLUMN_RENAMES)
+
+def read_delta(file_path, byte_offset, start_row):
+    """Reads the complete rows from `byte_offset` to the end of the CSV, cleaned and renamed.
+
+    The file is seeked to the offset, so only the appended bytes are read and
+    parsed. A partly written last line is left for the next run.
+
+    Returns:
+        tuple: (rows indexed by their position in the file, number of rows read, offset after the last row).
+    """
+    columns = pd.read_csv(file_path, nrows=0).columns
+    with open(file_path, 'rb') as f:
+        f.seek(byte_offset)
+        data = f.read()
+    data = data[:data.rfind(b'\n') + 1]
+    if not data.strip():
+        return pd.DataFrame(columns=columns).rename(columns=COLUMN_RENAMES), 0, byte_offset
+    df = pd.read_csv(io.BytesIO(data), header=None, names=columns, skip_blank_lines=False)
+    df.index = pd.RangeIndex(start_row, start_row + len(df))
+    return df.dropna().rename(columns=COLUMN_RENAMES), len(df), byte_offset + len(data)
+
+def count_rows(file_path):
+    """Counts the data rows of a CSV without parsing them."""
+    with open(file_path, 'rb') as f:
+        return max(0, sum(block.count(b'\n') for block in iter(lambda: f.read(1 << 20), b'')) - 1)
+
+def find_row_offset(file_path, row):
+    """Returns the byte offset where data row `row` starts (or the end of the last complete line).
+
+    Scans the file once; only needed when no offset has been saved yet.
+    """
+    offset = 0
+    with open(file_path, 'rb') as f:
+        for line_number, line in enumerate(f):
+            if not line.endswith(b'\n') or line_number > row:
+                break
+            offset += len(line)
+    return offset
+
+def reservoir_add(X, Y, seen, X_new, Y_new, capacity=HOLDOUT_MAX_ROWS, seed=42):
+    """Adds rows to a uniform reservoir sample (Algorithm R) of at most `capacity` rows.
+
+    Args:
+        seen (int): Rows offered to the reservoir so far, including those no longer kept.
+
+    Returns:
+        tuple: (X, Y, seen) after offering the new rows.
+    """
+    X_new, Y_new = np.asarray(X_new, dtype=np.float64), np.asarray(Y_new, dtype=np.float64)
+    free = max(0, capacity - len(X))
+    X = np.vstack([X, X_new[:free]])
+    Y = np.vstack([Y, Y_new[:free]])
+    rest = np.arange(free, len(X_new))
+    if len(rest):
+        # Row `seen + i` replaces a random slot with probability capacity / (seen + i + 1)
+        slots = np.random.default_rng([seed, seen]).integers(0, seen + rest + 1)
+        keep = slots < capacity
+        X[slots[keep]] = X_new[rest[keep]]
+        Y[slots[keep]] = Y_new[rest[keep]]
+    return X, Y, seen + len(X_new)
+
+def _empty_holdout():
+    """Returns an empty (X, Y, seen) reservoir."""
+    return np.empty((0, len(FEATURE_NAMES))), np.empty((0, len(TARGET_NAMES))), 0
+
+# ==============================================================================
+#  3. Incremental Trainer
+# ==============================================================================
+
+class IncrementalTrainer:
+    """Adds boosting rounds to the saved XGBoost models using only newly appended rows.
+
+    The trainer remembers how many rows of the dataset the current models have
+    seen. A run reads only the rows appended since then and holds out a hashed
+    share of them. The rest warm-start the existing boosters for
+    `extra_rounds` more trees. Both the old and the updated model are then
+    scored on the same holdout: the saved test split the old model was
+    evaluated on plus the held-out new rows, capped at `HOLDOUT_MAX_ROWS` by
+    reservoir sampling. The artifacts are replaced (and published to the model
+    registry) only if no target's RMSE gets worse by more than `tolerance`.
+    The delta is read by seeking to the saved byte offset, the lookup table is
+    rescored on its saved grid and the registry records the data's size and
+    offset instead of its hash, so a run costs in proportion to the new rows,
+    not the file.
+    """
+
+    def __init__(self, file_path, extra_rounds=20, tolerance=0.02, holdout_share=0.2,
+                 since_row=None, seed=42):
+        """Initializes the trainer.
+
+        Args:
+            file_path (str): The energy efficiency CSV the new rows were appended to.
+            extra_rounds (int): Boosting rounds added per update.
+            tolerance (float): Largest accepted relative RMSE increase on the holdout.
+            holdout_share (float): Share of the new rows kept out of training for the check.
+            since_row (int, optional): Rows already learned; overrides the saved state.
+            seed (int): Seed of the hashed holdout selection.
+        """
+        self.file_path = file_path
+        self.extra_rounds = extra_rounds
+        self.tolerance = tolerance
+        self.holdout_share = holdout_share
+        self.seed = seed
+        self.state = self._load_state()
+        self.since_row = since_row if since_row is not None else self.state.get('rows_trained')
+
+    def run(self):
+        """Updates every target whose accuracy holds and records the new state.
+
+        Returns:
+            dict: Target name -> check result, or None if there was nothing to do.
+        """
+        if not os.path.exists(self.file_path):
+            print(f"Error: The file '{self.file_path}' was not found.")
+            return None
+        missing = [path for path in MODEL_PATHS.values() if not os.path.exists(path)]
+        if missing:
+            print(f"Error: Model files not found: {missing}. Run 'python main.py' first.")
+            return None
+        if self.since_row is None:
+            print("No incremental state yet: assuming the saved models were trained on the whole file.")
+            record_full_training(self.file_path)
+            return None
+        byte_offset = self._byte_offset()
+        if byte_offset > os.path.getsize(self.file_path):
+            print(f"Error: '{self.file_path}' is shorter than when the models were trained. "
+                  "Run 'python main.py' to retrain from scratch.")
+            return None
+        X_base, Y_base, seen = self._base_holdout()
+
+        delta, rows_read, end_offset = read_delta(self.file_path, byte_offset, self.since_row)
+        if rows_read == 0:
+            print(f"No new rows since row {self.since_row:,}; nothing to retrain.")
+            return None
+        from out_of_core import hash_split_mask # Imports XGBoost, only needed once there are new rows
+        is_holdout = hash_split_mask(delta.index.to_numpy(), self.holdout_share, self.seed)
+        delta_train, delta_holdout = delta[~is_holdout], delta[is_holdout]
+        X_holdout, Y_holdout, seen = reservoir_add(X_base, Y_base, seen, delta_holdout[FEATURE_NAMES],
+                                                   delta_holdout[TARGET_NAMES], seed=self.seed)
+        X_holdout = pd.DataFrame(X_holdout, columns=FEATURE_NAMES)
+        if len(delta_train) == 0:
+            # Every new row hashed into the holdout (likely for small deltas): nothing to boost on
+            print(f"All {len(delta):,} new rows were held out; added them to the holdout, models unchanged.")
+            save_holdout(X_holdout.to_numpy(), Y_holdout, seen)
+            save_state(self.file_path, self.since_row + rows_read, end_offset, self.state.get('last_update', {}))
+            return None
+
+        print("\n" + "="*60)
+        print(f"--- INCREMENTAL UPDATE: {len(delta):,} new rows ({len(delta_train):,} train, "
+              f"{len(delta_holdout):,} holdout), +{self.extra_rounds} rounds ---")
+        print("="*60)
+        results, models = {}, {}
+        for index, target_name in enumerate(TARGET_NAMES):
+            models[target_name], results[target_name] = self._update_target(
+                target_name, delta_train, X_holdout, Y_holdout[:, index])
+        # Both targets move forward together, so the saved state describes both models
+        if all(result['accepted'] for result in results.values()):
+            for target_name, model in models.items():
+                filename = save_model_artifact(model, "XGBoost Regressor", target_name)
+                print(f"\nUpdated {target_name} model ({model.get_booster().num_boosted_rounds()} rounds) "
+                      f"saved to '{filename}'")
+            # The delta's held-out rows join the holdout of every later check
+            save_holdout(X_holdout.to_numpy(), Y_holdout, seen)
+            rows_trained = self.since_row + rows_read
+            save_state(self.file_path, rows_trained, end_offset, results)
+            refresh_lookup_table([MODEL_PATHS[target_name] for target_name in TARGET_NAMES], LOOKUP_TABLE_PATH)
+            publish_to_registry(self.file_path, {target_name: result['updated']
+                                                 for target_name, result in results.items()},
+                                data_fingerprint={'source': os.path.abspath(self.file_path),
+                                                  'rows_trained': rows_trained, 'byte_offset': end_offset})
+        else:
+            print(f"\nKept the previous models; rows from {self.since_row:,} will be retried next time.")
+            save_state(self.file_path, self.since_row, byte_offset, results)
+        return results
+
+    def _byte_offset(self):
+        """Where the unlearned rows start; found by one scan if the state predates saved offsets."""
+        if self.state.get('byte_offset') is not None and self.state.get('rows_trained') == self.since_row:
+            return self.state['byte_offset']
+        return find_row_offset(self.file_path, self.since_row)
+
+    def _base_holdout(self):
+        """Loads the saved holdout, or rebuilds main.py's test split once if there is none yet.
+
+        Returns:
+            tuple: (X, Y, number of rows ever offered to the holdout).
+        """
+        if os.path.exists(HOLDOUT_PATH) and self.state.get('rows_trained') == self.since_row:
+            with np.load(HOLDOUT_PATH, allow_pickle=False) as data:
+                return data['X'], data['Y'], int(data['seen']) if 'seen' in data.files else len(data['X'])
+        print(f"No saved holdout for row {self.since_row:,}: rebuilding the test split from the CSV once.")
+        _, X_test, _, Y_test = split_dataset(read_rows(self.file_path, 0, self.since_row))
+        X, Y, seen = reservoir_add(*_empty_holdout(), X_test, Y_test, seed=self.seed)
+        save_holdout(X, Y, seen)
+        return X, Y, seen
+
+    def _update_target(self, target_name, delta_train, X_holdout, y_holdout):
+        """Warm-starts one target's booster on the new rows and checks it against the previous one.
+
+        Returns:
+            tuple: (updated model, check result dict).
+        """
+        previous = joblib.load(MODEL_PATHS[target_name])
+        start = time.perf_counter()
+        model = type(previous)(**previous.get_params())
+        model.set_params(n_estimators=self.extra_rounds)
+        model.fit(delta_train[FEATURE_NAMES], delta_train[target_name], xgb_model=previous.get_booster())
+        fit_seconds = time.perf_counter() - start
+        old_metrics = compute_regression_metrics(y_holdout, previous.predict(X_holdout))
+        new_metrics = compute_regression_metrics(y_holdout, model.predict(X_holdout))
+        accepted = new_metrics['rmse'] <= old_metrics['rmse'] * (1.0 + self.tolerance)
+        print(f"\n{target_name}: trained in {fit_seconds:.2f}s, holdout RMSE "
+              f"{old_metrics['rmse']:.4f} -> {new_metrics['rmse']:.4f}, "
+              f"R² {old_metrics['r2']:.4f} -> {new_metrics['r2']:.4f}")
+        if not accepted:
+            print(f"  RMSE worsened by more than {self.tolerance:.0%}.")
+        return model, {'accepted': bool(accepted), 'fit_seconds': fit_seconds,
+                'previous': {key: float(value) for key, value in old_metrics.items()},
+                'updated': {key: float(value) for key, value in new_metrics.items()}}
+
+    def _load_state(self):
+        return load_state()
+
+
+def load_state():
+    """Returns the saved incremental state, or an empty dict if there is none."""
+    if not os.path.exists(STATE_PATH):
+        return {}
+    with open(STATE_PATH, 'r') as f:
+        return json.load(f)
+
+def training_state_is_current(file_path):
+    """True if the saved state and holdout already cover all of `file_path`, judged by its size alone."""
+    state = load_state()
+    return (os.path.exists(HOLDOUT_PATH) and state.get('source') == os.path.abspath(file_path)
+            and state.get('byte_offset') == os.path.getsize(file_path))
+
+
+def save_state(file_path, rows_trained, byte_offset, results):
+    """Records how many rows of `file_path` the saved models have learned, where they end, and the last check."""
+    os.makedirs(MODEL_FOLDER, exist_ok=True)
+    state = {'source': os.path.abspath(file_path), 'rows_trained': int(rows_trained),
+             'byte_offset': int(byte_offset), 'last_update': results}
+    tmp_path = f"{STATE_PATH}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, STATE_PATH)
+
+def save_holdout(X, Y, seen):
+    """Writes the holdout features, targets and reservoir count, replacing the old file atomically."""
+    os.makedirs(MODEL_FOLDER, exist_ok=True)
+    tmp_path = f"{os.path.splitext(HOLDOUT_PATH)[0]}.tmp-{os.getpid()}.npz" # np.savez appends '.npz' otherwise
+    np.savez(tmp_path, X=np.asarray(X, dtype=np.float64), Y=np.asarray(Y, dtype=np.float64),
+             seen=np.int64(seen))
+    os.replace(tmp_path, HOLDOUT_PATH)
+
+def record_full_training(file_path):
+    """Marks every current row of `file_path` as learned after a full retrain in main.py.
+
+    Also saves the test split main.py evaluated on, so later incremental runs
+    never have to read the rows before the delta again.
+    """
+    rows = count_rows(file_path)
+    _, X_test, _, Y_test = split_dataset(read_rows(file_path))
+    save_holdout(*reservoir_add(*_empty_holdout(), X_test, Y_test))
+    save_state(file_path, rows, find_row_offset(file_path, rows), {})
+
+# ==============================================================================
+#  4. Main Execution Block
+# ==============================================================================
+def main():
+    """Warm-starts the saved XGBoost models on the rows appended to the dataset."""
+    parser = argparse.ArgumentParser(description="Incremental warm-start retraining of the XGBoost models.")
+    parser.add_argument('--data', default='energy-efficiency-dataset.csv')
+    parser.add_argument('--extra-rounds', type=int, default=20)
+    parser.add_argument('--tolerance', type=float, default=0.02,
+                        help="Largest accepted relative RMSE increase on the holdout (default: 0.02).")
+    parser.add_argument('--holdout-share', type=float, default=0.2)
+    parser.add_argument('--since-row', type=int, default=None,
+                        help="Number of rows the saved models were trained on (default: from the saved state).")
+    args = parser.parse_args()
+
+    IncrementalTrainer(args.data, args.extra_rounds, args.tolerance, args.holdout_share, args.since_row).run()
+
+if __name__ == '__main__':
+    main()
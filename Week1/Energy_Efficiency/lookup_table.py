@@ -0,0 +1,145 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import os
+import itertools
+import numpy as np
+from dataset_cache import file_sha256
+
+# Discrete values of the per-design features (see EnergyLoadPredictor.feature_prompts)
+ORIENTATIONS = [2.0, 3.0, 4.0, 5.0]
+GLAZING_AREAS = [0.0, 0.10, 0.25, 0.40]
+GLAZING_DISTRIBUTIONS = [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+# Columns that together describe the building shape (compactness, areas and height)
+SHAPE_COLUMNS = ['Relative Compactness', 'Surface Area', 'Wall Area', 'Roof Area', 'Overall Height']
+# Inputs are matched after rounding, so 0.1 and 0.10000001 hit the same entry
+KEY_DECIMALS = 4
+
+# ==============================================================================
+#  2. Design Grid
+# ==============================================================================
+
+def build_design_grid(df):
+    """Enumerates every valid design: each building shape in the dataset combined
+    with every orientation, glazing area and glazing distribution.
+
+    Args:
+        df (pd.DataFrame): The cleaned dataset (renamed columns).
+
+    Returns:
+        np.ndarray: float64 array of shape (n_designs, 8) in feature order.
+    """
+    shapes = np.unique(df[SHAPE_COLUMNS].to_numpy(dtype=np.float64), axis=0)
+    grid = [list(shape) + [orientation, glazing_area, distribution]
+            for shape in shapes
+            for orientation, glazing_area, distribution
+            in itertools.product(ORIENTATIONS, GLAZING_AREAS, GLAZING_DISTRIBUTIONS)]
+    return np.round(np.array(grid, dtype=np.float64), KEY_DECIMALS)
+
+def _design_key(features):
+    """Returns the hashable lookup key of one design."""
+    return tuple(round(float(value), KEY_DECIMALS) for value in features)
+
+# ==============================================================================
+#  3. Lookup Table
+# ==============================================================================
+
+class PredictionLookupTable:
+    """Precomputed heating and cooling loads for every design on the discrete grid.
+
+    Lookups are O(1) dictionary hits. The table remembers the SHA-256 of the
+    model files it was computed from, so a predictor can tell when the models
+    have been retrained and the table is stale.
+    """
+
+    def __init__(self, features, predictions, model_hashes):
+        """Initializes the table.
+
+        Args:
+            features (np.ndarray): Designs of shape (n, 8).
+            predictions (np.ndarray): Heating and cooling loads of shape (n, 2).
+            model_hashes (list): SHA-256 of each model file the predictions came from.
+        """
+        self.features = np.asarray(features, dtype=np.float64)
+        self.predictions = np.asarray(predictions, dtype=np.float64)
+        self.model_hashes = [str(digest) for digest in model_hashes]
+        self._table = {_design_key(row): (float(heating), float(cooling))
+                       for row, (heating, cooling) in zip(self.features, self.predictions)}
+
+    def __len__(self):
+        return len(self._table)
+
+    def lookup(self, features):
+        """Returns the precomputed (heating, cooling) loads for a design, or None if it is off-grid."""
+        return self._table.get(_design_key(features))
+
+    def matches_models(self, model_paths):
+        """True if the table was built from exactly these model files."""
+        return self.model_hashes == [file_sha256(path) for path in model_paths]
+
+    @classmethod
+    def build(cls, predictor, df, model_paths):
+        """Scores the whole design grid once with `predictor.predict_batch`."""
+        grid = build_design_grid(df)
+        heating, cooling = predictor.predict_batch(grid)
+        return cls(grid, np.column_stack([heating, cooling]), [file_sha256(path) for path in model_paths])
+
+    def save(self, path):
+        """Writes the table to a .npz file (no pickle needed to load it), replacing any old one atomically."""
+        tmp_path = f"{os.path.splitext(path)[0]}.tmp-{os.getpid()}.npz" # np.savez appends '.npz' otherwise
+        np.savez(tmp_path, features=self.features, predictions=self.predictions,
+                 model_hashes=np.array(self.model_hashes, dtype=str))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Loads a table written by `save`."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['features'], data['predictions'], list(data['model_hashes']))
+
+
+def _load_predictor(model_paths, multi_output):
+    """Returns a predictor for the model files, or None if they could not be loaded."""
+    from predict import EnergyLoadPredictor
+    if multi_output:
+        predictor = EnergyLoadPredictor(multi_output_model_path=model_paths[0])
+    else:
+        predictor = EnergyLoadPredictor(*model_paths)
+    return predictor if predictor.models_loaded() else None
+
+def build_lookup_table(df, model_paths, output_path, multi_output=False):
+    """Loads the saved models, precomputes the grid and writes the table next to them.
+
+    Returns:
+        PredictionLookupTable: The new table, or None if the models are missing.
+    """
+    predictor = _load_predictor(model_paths, multi_output)
+    if predictor is None:
+        return None
+    table = PredictionLookupTable.build(predictor, df, model_paths)
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    table.save(output_path)
+    return table
+
+def refresh_lookup_table(model_paths, output_path, multi_output=False):
+    """Rescores the grid of an existing table with new model files, without reading the dataset.
+
+    Used after an incremental update, whose appended rows do not change the
+    set of building shapes; a full run of main.py rebuilds the grid itself.
+
+    Returns:
+        PredictionLookupTable: The refreshed table, or None if there is no table yet or the models are missing.
+    """
+    if not os.path.exists(output_path):
+        return None
+    existing = PredictionLookupTable.load(output_path)
+    if existing.matches_models(model_paths):
+        return existing
+    predictor = _load_predictor(model_paths, multi_output)
+    if predictor is None:
+        return None
+    heating, cooling = predictor.predict_batch(existing.features)
+    table = PredictionLookupTable(existing.features, np.column_stack([heating, cooling]),
+                                  [file_sha256(path) for path in model_paths])
+    table.save(output_path)
+    return table
@@ -3,56 +3,182 @@
 # ==============================================================================
 import warnings
 import os
+import sys
+import time
+import argparse
+import importlib
+from importlib import metadata
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 import joblib # Import joblib for saving models
-
-# Import the models we will test
-from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
-import xgboost as xgb
+from profiling import StageTimer, profile_capture
+from dataset_cache import file_sha256
 
 # Suppress potential warnings for a cleaner output
 warnings.filterwarnings('ignore')
 
+# Feature and target columns after renaming the raw X1..X8 / Y1..Y2 headers
+FEATURE_NAMES = [
+    'Relative Compactness', 'Surface Area', 'Wall Area', 'Roof Area',
+    'Overall Height', 'Orientation', 'Glazing Area', 'Glazing Area Distribution'
+]
+TARGET_NAMES = ['Heating Load', 'Cooling Load']
+
+class LazyEstimator:
+    """Stands in for an estimator class and imports it only when a model is built.
+
+    Importing scikit-learn and XGBoost takes longer than a whole run in which
+    every model comes from the build cache. Calling the stand-in returns an
+    instance of the real class, exactly like calling the class itself.
+    """
+
+    def __init__(self, module, name):
+        self.module = module
+        self.name = name
+        self.class_path = f"{module}.{name}"
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def load(self):
+        """Imports and returns the real estimator class."""
+        return getattr(importlib.import_module(self.module), self.name)
+
+# Candidate models and their parameters: name -> (model class, parameter dict)
+MODELS_TO_TEST = {
+    "Linear Regression": (LazyEstimator('sklearn.linear_model', 'LinearRegression'), {}),
+    "Random Forest Regressor": (LazyEstimator('sklearn.ensemble', 'RandomForestRegressor'),
+                                {'n_estimators': 100, 'random_state': 42}),
+    "XGBoost Regressor": (LazyEstimator('xgboost', 'XGBRegressor'),
+                          {'n_estimators': 100, 'learning_rate': 0.1, 'random_state': 42})
+}
+COLUMN_RENAMES = {
+    'X1': 'Relative Compactness', 'X2': 'Surface Area', 'X3': 'Wall Area',
+    'X4': 'Roof Area', 'X5': 'Overall Height', 'X6': 'Orientation',
+    'X7': 'Glazing Area', 'X8': 'Glazing Area Distribution',
+    'Y1': 'Heating Load', 'Y2': 'Cooling Load'
+}
+MODEL_FOLDER = 'models'
+LOOKUP_TABLE_PATH = os.path.join(MODEL_FOLDER, 'xgb_lookup_table.npz')
+DATASET_CACHE_DIR = '.dataset_cache'
+PROFILE_REPORT_PATH = os.path.join(MODEL_FOLDER, 'pipeline_profile.json')
+
+def library_versions():
+    """Returns the versions of the libraries that influence training results and speed.
+
+    Read from the installed package metadata, so scikit-learn and XGBoost are not imported.
+    """
+    return {'numpy': np.__version__, 'pandas': pd.__version__,
+            'scikit-learn': metadata.version('scikit-learn'), 'xgboost': metadata.version('xgboost')}
+
+def load_energy_dataset(file_path, cache_dir=DATASET_CACHE_DIR):
+    """Loads the CSV, drops incomplete rows and renames the columns.
+
+    With a `cache_dir`, the cleaned float32 data is memory-mapped from the
+    binary dataset cache (rebuilt automatically when the CSV changes) instead
+    of parsing the CSV again. Pass `cache_dir=None` to always parse the CSV.
+
+    Returns:
+        pd.DataFrame: The cleaned dataset, or None if the file does not exist.
+    """
+    if not os.path.exists(file_path):
+        print(f"Error: The file '{file_path}' was not found.")
+        return None
+    if cache_dir:
+        from dataset_cache import DatasetCache
+        return DatasetCache(cache_dir).load_frame(file_path, COLUMN_RENAMES, FEATURE_NAMES, TARGET_NAMES)
+    df = pd.read_csv(file_path)
+    df.dropna(inplace=True)
+    df.rename(columns=COLUMN_RENAMES, inplace=True)
+    return df
+
+def split_dataset(df, test_size=0.2, random_state=42):
+    """Splits the dataset into train/test features and both targets.
+
+    Selects the same rows as scikit-learn's `train_test_split(test_size=...,
+    random_state=...)` (a seeded permutation whose first ceil(test_size * n)
+    rows are the test set), without importing scikit-learn.
+
+    Returns:
+        tuple: (X_train, X_test, Y_train, Y_test), where Y holds both target columns.
+    """
+    n_test = int(np.ceil(test_size * len(df)))
+    permutation = np.random.RandomState(random_state).permutation(len(df))
+    test_rows, train_rows = permutation[:n_test], permutation[n_test:]
+    X, Y = df[FEATURE_NAMES], df[TARGET_NAMES]
+    return X.iloc[train_rows], X.iloc[test_rows], Y.iloc[train_rows], Y.iloc[test_rows]
+
+def model_artifact_path(model_name, target_name=None):
+    """Returns the file a model is saved to, or None if this model is not kept."""
+    if model_name != "XGBoost Regressor":
+        return None
+    if target_name is None:
+        return os.path.join(MODEL_FOLDER, 'xgb_multi_output_model.joblib')
+    if target_name == 'Heating Load':
+        return os.path.join(MODEL_FOLDER, 'xgb_heating_model.joblib')
+    return os.path.join(MODEL_FOLDER, 'xgb_cooling_model.joblib')
+
+def save_model_artifact(model, model_name, target_name=None):
+    """Saves the trained XGBoost models used by predict.py.
+
+    Args:
+        target_name (str, optional): The target the model predicts; None for a multi-output model.
+
+    Returns:
+        str: The file the model was written to, or None if this model is not kept.
+    """
+    filename = model_artifact_path(model_name, target_name)
+    if filename is None:
+        return None
+    os.makedirs(MODEL_FOLDER, exist_ok=True) # Create the 'models' directory if it doesn't exist
+    # Written next to the target and renamed over it, so readers never see a partial file
+    tmp_filename = f"{filename}.tmp-{os.getpid()}"
+    joblib.dump(model, tmp_filename)
+    os.replace(tmp_filename, filename)
+    # Pickle-free copy for fast_predict.py, which never imports xgboost or joblib
+    from tree_export import export_xgboost
+    export_xgboost(model).save(os.path.splitext(filename)[0] + '.npz')
+    return filename
+
 # ==============================================================================
 #  2. Create a Reusable Class for Model Evaluation
 # ==============================================================================
 class ModelEvaluator:
     """A class to streamline training and evaluation of regression models."""
 
-    def __init__(self, model_class, model_name, file_path, **model_params):
-        """Initializes the ModelEvaluator."""
+    def __init__(self, model_class, model_name, file_path, multi_output=False, df=None, timer=None,
+                 build_cache=None, **model_params):
+        """Initializes the ModelEvaluator.
+
+        When `multi_output` is True, a single model is fitted on both targets at
+        once instead of one model per target. An already loaded `df` can be
+        passed in to skip re-reading the CSV. Every stage is timed with `timer`
+        (a `StageTimer`, shared across evaluators to get one report). With a
+        `build_cache` (a `BuildCache`), a model whose inputs are unchanged since
+        the last run is reused instead of retrained.
+        """
         self.model_class = model_class
         self.model_name = model_name
         self.model_params = model_params
         self.file_path = file_path
-        self.df = None
+        self.multi_output = multi_output
+        self.df = df
+        self.metrics = {} # Target name -> metrics dictionary, filled by the evaluation
+        self.timer = timer or StageTimer()
+        self.build_cache = build_cache
         self.X_train, self.X_test, self.y1_train, self.y1_test, self.y2_train, self.y2_test = [None] * 6
         self._load_and_prepare_data()
 
     def _load_and_prepare_data(self):
         """Loads, cleans, renames columns, and prepares the dataset."""
-        if not os.path.exists(self.file_path):
-            print(f"Error: The file '{self.file_path}' was not found.")
-            return
-        self.df = pd.read_csv(self.file_path)
-        self.df.dropna(inplace=True)
-        self.df.rename(columns={
-            'X1': 'Relative Compactness', 'X2': 'Surface Area', 'X3': 'Wall Area',
-            'X4': 'Roof Area', 'X5': 'Overall Height', 'X6': 'Orientation',
-            'X7': 'Glazing Area', 'X8': 'Glazing Area Distribution',
-            'Y1': 'Heating Load', 'Y2': 'Cooling Load'
-        }, inplace=True)
+        if self.df is not None:
+            return # Shared, already prepared dataset
+        with self.timer.stage('load', self.model_name):
+            self.df = load_energy_dataset(self.file_path)
 
     def _calculate_adjusted_r2(self, r2, n_samples, n_features):
         """Calculates the Adjusted R-squared score."""
-        denominator = (n_samples - n_features - 1)
-        if denominator == 0:
-            return r2
-        return 1 - (1 - r2) * (n_samples - 1) / denominator
+        return adjusted_r2(r2, n_samples, n_features)
 
     def run_full_evaluation(self):
         """Executes the full evaluation pipeline."""
@@ -61,15 +187,13 @@ class ModelEvaluator:
         print("\n" + "="*60)
         print(f"--- EVALUATING MODEL: {self.model_name} ---")
         print("="*60)
-        features = [
-            'Relative Compactness', 'Surface Area', 'Wall Area', 'Roof Area',
-            'Overall Height', 'Orientation', 'Glazing Area', 'Glazing Area Distribution'
-        ]
-        X = self.df[features]
-        y1 = self.df['Heating Load']
-        y2 = self.df['Cooling Load']
-        self.X_train, self.X_test, self.y1_train, self.y1_test = train_test_split(X, y1, test_size=0.2, random_state=42)
-        _, _, self.y2_train, self.y2_test = train_test_split(X, y2, test_size=0.2, random_state=42)
+        with self.timer.stage('split', self.model_name):
+            self.X_train, self.X_test, Y_train, Y_test = split_dataset(self.df)
+        self.y1_train, self.y1_test = Y_train['Heating Load'], Y_test['Heating Load']
+        self.y2_train, self.y2_test = Y_train['Cooling Load'], Y_test['Cooling Load']
+        if self.multi_output:
+            self._evaluate_multi_output()
+            return
         self._evaluate_target('Heating Load', self.y1_train, self.y1_test)
         print("\n" + "-"*40 + "\n")
         self._evaluate_target('Cooling Load', self.y2_train, self.y2_test)
@@ -77,61 +201,379 @@ class ModelEvaluator:
     def _evaluate_target(self, target_name, y_train, y_test):
         """Trains, predicts, evaluates, and saves the best model for a target."""
         print(f"--- Training and Evaluating for {target_name} ---")
+        fingerprint = self._fingerprint(target_name)
+        cached = self._load_cached(target_name, fingerprint)
+        if cached is not None:
+            self.metrics.update(cached['metrics'])
+            print_evaluation_report(self.metrics[target_name], y_test, cached['y_pred'], target_name)
+            return
         model = self.model_class(**self.model_params)
-        model.fit(self.X_train, y_train)
-        y_pred = model.predict(self.X_test)
-        self._print_evaluation_results(y_test, y_pred, target_name)
+        with self.timer.stage('fit', self.model_name, target_name):
+            model.fit(self.X_train, y_train)
+        with self.timer.stage('predict', self.model_name, target_name):
+            y_pred = model.predict(self.X_test)
+        with self.timer.stage('metrics', self.model_name, target_name):
+            self.metrics[target_name] = self._compute_metrics(y_test, y_pred)
+        print_evaluation_report(self.metrics[target_name], y_test, y_pred, target_name)
+        if self.build_cache is not None:
+            with self.timer.stage('cache', self.model_name, target_name):
+                self.build_cache.store(self.model_name, target_name, fingerprint, model,
+                                       {target_name: self.metrics[target_name]}, y_pred)
 
         # --- ADDED LOGIC: Save the trained XGBoost models ---
-        if self.model_name == "XGBoost Regressor":
-            model_folder = 'models'
-            os.makedirs(model_folder, exist_ok=True) # Create the 'models' directory if it doesn't exist
-            if target_name == 'Heating Load':
-                filename = os.path.join(model_folder, 'xgb_heating_model.joblib')
-            else:
-                filename = os.path.join(model_folder, 'xgb_cooling_model.joblib')
-            joblib.dump(model, filename)
+        with self.timer.stage('save', self.model_name, target_name):
+            filename = save_model_artifact(model, self.model_name, target_name)
+        if filename:
             print(f"\nModel for {target_name} saved to '{filename}'")
 
+    def _evaluate_multi_output(self):
+        """Trains one model on both targets and evaluates its two-column prediction."""
+        print("--- Training and Evaluating for Heating and Cooling Load (multi-output) ---")
+        Y_train = np.column_stack([self.y1_train, self.y2_train])
+        both = " + ".join(TARGET_NAMES)
+        fingerprint = self._fingerprint(None)
+        cached = self._load_cached(None, fingerprint)
+        if cached is not None:
+            self.metrics.update(cached['metrics'])
+            Y_pred = cached['y_pred']
+            print_evaluation_report(self.metrics['Heating Load'], self.y1_test, Y_pred[:, 0], 'Heating Load')
+            print("\n" + "-"*40 + "\n")
+            print_evaluation_report(self.metrics['Cooling Load'], self.y2_test, Y_pred[:, 1], 'Cooling Load')
+            return
+        model = self.model_class(**self.model_params)
+        with self.timer.stage('fit', self.model_name, both):
+            model.fit(self.X_train, Y_train)
+        with self.timer.stage('predict', self.model_name, both):
+            Y_pred = np.asarray(model.predict(self.X_test))
+        with self.timer.stage('metrics', self.model_name, both):
+            self.metrics['Heating Load'] = self._compute_metrics(self.y1_test, Y_pred[:, 0])
+            self.metrics['Cooling Load'] = self._compute_metrics(self.y2_test, Y_pred[:, 1])
+        print_evaluation_report(self.metrics['Heating Load'], self.y1_test, Y_pred[:, 0], 'Heating Load')
+        print("\n" + "-"*40 + "\n")
+        print_evaluation_report(self.metrics['Cooling Load'], self.y2_test, Y_pred[:, 1], 'Cooling Load')
+        if self.build_cache is not None:
+            with self.timer.stage('cache', self.model_name, both):
+                self.build_cache.store(self.model_name, None, fingerprint, model, self.metrics, Y_pred)
+
+        # A single artifact replaces the separate heating and cooling files
+        with self.timer.stage('save', self.model_name, both):
+            filename = save_model_artifact(model, self.model_name)
+        if filename:
+            print(f"\nMulti-output model for Heating and Cooling Load saved to '{filename}'")
+
+    def _fingerprint(self, target_name):
+        """Fingerprints this model's training inputs, or returns None without a build cache."""
+        if self.build_cache is None:
+            return None
+        data_dtypes = {str(dtype) for dtype in self.df.dtypes}
+        return self.build_cache.fingerprint(self.file_path, self.model_class, self.model_params, target_name,
+                                            data_dtypes)
+
+    def _load_cached(self, target_name, fingerprint):
+        """Returns the build cache entry of an unchanged model, restoring its saved artifact if needed.
+
+        Args:
+            target_name (str): The target, or None for a multi-output model.
+        """
+        if fingerprint is None:
+            return None
+        label = target_name or " + ".join(TARGET_NAMES)
+        with self.timer.stage('cache', self.model_name, label):
+            cached = self.build_cache.load(self.model_name, target_name, fingerprint)
+            if cached is None:
+                return None
+            # Only rewrite the kept artifact when it no longer is the cached model
+            artifact = model_artifact_path(self.model_name, target_name)
+            if artifact and (not os.path.exists(artifact) or file_sha256(artifact) != cached['model_sha256']):
+                save_model_artifact(joblib.load(cached['model_path']), self.model_name, target_name)
+        print(f"Inputs unchanged since the last run, reusing the cached model for {label}")
+        return cached
+
+    def _compute_metrics(self, y_true, y_pred):
+        """Calculates the regression metrics reported for every target."""
+        return compute_regression_metrics(y_true, y_pred, self.X_test.shape[1])
+
     def _print_evaluation_results(self, y_true, y_pred, target_name):
         """Calculates and prints performance metrics and prediction comparisons."""
-        # ... (This function remains unchanged) ...
-        mse = mean_squared_error(y_true, y_pred)
-        rmse = np.sqrt(mse)
-        mae = mean_absolute_error(y_true, y_pred)
-        r2 = r2_score(y_true, y_pred)
-        adj_r2 = self._calculate_adjusted_r2(r2, self.X_test.shape[0], self.X_test.shape[1])
-        print(f"\nPerformance Metrics for {target_name}:")
-        print(f"  Mean Squared Error (MSE):       {mse:.4f}")
-        print(f"  Root Mean Squared Error (RMSE): {rmse:.4f}")
-        print(f"  Mean Absolute Error (MAE):      {mae:.4f}")
-        print(f"  R-squared (R²):                 {r2:.4f}")
-        print(f"  Adjusted R-squared:             {adj_r2:.4f}")
-        results_df = pd.DataFrame({f'Actual {target_name}': y_true, f'Predicted {target_name}': y_pred})
-        print(f"\nComparison of Actual vs. Predicted values (First 15 samples):")
-        print(results_df.head(15).to_string(index=False))
+        print_evaluation_report(self._compute_metrics(y_true, y_pred), y_true, y_pred, target_name)
+
+def adjusted_r2(r2, n_samples, n_features):
+    """Calculates the Adjusted R-squared score."""
+    denominator = (n_samples - n_features - 1)
+    if denominator == 0:
+        return r2
+    return 1 - (1 - r2) * (n_samples - 1) / denominator
+
+def compute_regression_metrics(y_true, y_pred, n_features=len(FEATURE_NAMES)):
+    """Calculates the regression metrics reported for every target (MSE, RMSE, MAE, R², adjusted R²)."""
+    from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+    mse = mean_squared_error(y_true, y_pred)
+    r2 = r2_score(y_true, y_pred)
+    return {
+        'mse': mse,
+        'rmse': np.sqrt(mse),
+        'mae': mean_absolute_error(y_true, y_pred),
+        'r2': r2,
+        'adj_r2': adjusted_r2(r2, len(y_true), n_features),
+    }
+
+def print_evaluation_report(metrics, y_true, y_pred, target_name):
+    """Prints the metrics of a target and its first 15 actual vs. predicted values."""
+    print(f"\nPerformance Metrics for {target_name}:")
+    print(f"  Mean Squared Error (MSE):       {metrics['mse']:.4f}")
+    print(f"  Root Mean Squared Error (RMSE): {metrics['rmse']:.4f}")
+    print(f"  Mean Absolute Error (MAE):      {metrics['mae']:.4f}")
+    print(f"  R-squared (R²):                 {metrics['r2']:.4f}")
+    print(f"  Adjusted R-squared:             {metrics['adj_r2']:.4f}")
+    results_df = pd.DataFrame({f'Actual {target_name}': y_true, f'Predicted {target_name}': y_pred})
+    print(f"\nComparison of Actual vs. Predicted values (First 15 samples):")
+    print(results_df.head(15).to_string(index=False))
+
+def build_prediction_lookup_table(file_path, multi_output=False, cache_dir=DATASET_CACHE_DIR):
+    """Precomputes the saved XGBoost models' predictions over the discrete design grid.
+
+    The table is written next to the .joblib files and lets predict.py answer
+    on-grid inputs with a dictionary lookup instead of running the models.
+    """
+    from lookup_table import build_lookup_table
+    if not os.path.exists(file_path):
+        print(f"Error: The file '{file_path}' was not found.")
+        return None
+    if multi_output:
+        model_paths = [os.path.join(MODEL_FOLDER, 'xgb_multi_output_model.joblib')]
+    else:
+        model_paths = [os.path.join(MODEL_FOLDER, 'xgb_heating_model.joblib'),
+                       os.path.join(MODEL_FOLDER, 'xgb_cooling_model.joblib')]
+    if os.path.exists(LOOKUP_TABLE_PATH) and all(os.path.exists(path) for path in model_paths):
+        from lookup_table import PredictionLookupTable
+        existing = PredictionLookupTable.load(LOOKUP_TABLE_PATH)
+        if existing.matches_models(model_paths):
+            print(f"\nPrediction lookup table '{LOOKUP_TABLE_PATH}' is up to date")
+            return existing
+    df = load_energy_dataset(file_path, cache_dir) # Only needed for the grid when the table is rebuilt
+    table = build_lookup_table(df, model_paths, LOOKUP_TABLE_PATH, multi_output)
+    if table is not None:
+        print(f"\nPrecomputed predictions for {len(table)} grid designs saved to '{LOOKUP_TABLE_PATH}'")
+    return table
+
+def publish_to_registry(file_path, metrics, multi_output=False, data_fingerprint=None):
+    """Publishes the saved XGBoost artifacts as a new version of the model registry.
+
+    Args:
+        metrics (dict): Target name -> metrics dictionary of the XGBoost model(s).
+        data_fingerprint (dict, optional): Recorded instead of hashing the whole data file.
+
+    Nothing is published when the current version already holds identical files.
+
+    Returns:
+        str: The new (or unchanged current) version, or None if the artifacts are missing.
+    """
+    from model_registry import ModelRegistry
+    if multi_output:
+        artifacts = {'multi_output': os.path.join(MODEL_FOLDER, 'xgb_multi_output_model.joblib')}
+    else:
+        artifacts = {'heating': os.path.join(MODEL_FOLDER, 'xgb_heating_model.joblib'),
+                     'cooling': os.path.join(MODEL_FOLDER, 'xgb_cooling_model.joblib')}
+    if not all(os.path.exists(path) for path in artifacts.values()):
+        return None
+    if os.path.exists(LOOKUP_TABLE_PATH):
+        artifacts['lookup_table'] = LOOKUP_TABLE_PATH
+    registry = ModelRegistry()
+    current = registry.current_version()
+    if current is not None:
+        published = {role: entry['sha256'] for role, entry in registry.metadata(current)['files'].items()}
+        if published == {role: file_sha256(path) for role, path in artifacts.items()}:
+            print(f"\nModel version '{current}' already holds these artifacts, nothing to publish")
+            return current
+    version = registry.publish(
+        artifacts, data_path=file_path, data_fingerprint=data_fingerprint,
+        metrics={target_name: {key: float(value) for key, value in target_metrics.items()}
+                 for target_name, target_metrics in metrics.items()},
+        extra={'model_name': "XGBoost Regressor", 'multi_output': multi_output,
+               'library_versions': library_versions()})
+    print(f"\nPublished model version '{version}' to the registry")
+    return version
+
+def record_training_state(file_path, multi_output=False, models_unchanged=False):
+    """Tells incremental_training.py that the per-target models have learned every current row.
+
+    Args:
+        models_unchanged (bool): Every model was reused from the build cache; the saved
+            state is then kept if it already covers the whole file (checked from its size).
+    """
+    if multi_output or not os.path.exists(file_path):
+        return
+    from incremental_training import record_full_training, training_state_is_current
+    if models_unchanged and training_state_is_current(file_path):
+        return
+    record_full_training(file_path)
 
 # ==============================================================================
-#  3. Main Execution Block
+#  3. Two-Model vs. Multi-Output Benchmark
 # ==============================================================================
+def compare_multi_output(file_path, models_to_test, latency_repeats=200, cache_dir=DATASET_CACHE_DIR):
+    """Compares one-model-per-target training against a single multi-output model.
+
+    For every candidate this measures training time, single-row and full test-set
+    inference latency, and the RMSE/R² on both targets, then prints a summary table.
+
+    Returns:
+        pd.DataFrame: One row per (model, mode) combination.
+    """
+    df = load_energy_dataset(file_path, cache_dir)
+    if df is None:
+        return None
+    X_train, X_test, Y_train, Y_test = split_dataset(df)
+    Y_train, Y_test = Y_train.to_numpy(), Y_test.to_numpy()
+    rows = []
+    for model_name, (model_class, params) in models_to_test.items():
+        evaluator = ModelEvaluator(model_class, model_name, file_path, df=df, **params)
+        evaluator.X_test = X_test
+        single_row = X_test.iloc[[0]]
+
+        # Current setup: one model per target, two predict calls per request
+        start = time.perf_counter()
+        models = [model_class(**params).fit(X_train, Y_train[:, i]) for i in range(len(TARGET_NAMES))]
+        train_seconds = time.perf_counter() - start
+        predict_fn = lambda data: np.column_stack([model.predict(data) for model in models])
+        rows.append(_benchmark_row(evaluator, model_name, 'two-model', train_seconds,
+                                   predict_fn, X_test, Y_test, single_row, latency_repeats))
+
+        # Multi-output: one model, one predict call returning both columns
+        start = time.perf_counter()
+        multi_model = model_class(**params).fit(X_train, Y_train)
+        train_seconds = time.perf_counter() - start
+        predict_fn = lambda data: np.asarray(multi_model.predict(data))
+        rows.append(_benchmark_row(evaluator, model_name, 'multi-output', train_seconds,
+                                   predict_fn, X_test, Y_test, single_row, latency_repeats))
+
+    results = pd.DataFrame(rows)
+    print("\n" + "="*60)
+    print("--- TWO-MODEL vs. MULTI-OUTPUT COMPARISON ---")
+    print("="*60)
+    print(results.to_string(index=False, float_format=lambda value: f"{value:.4f}"))
+    return results
+
+def _benchmark_row(evaluator, model_name, mode, train_seconds, predict_fn, X_test, Y_test, single_row, repeats):
+    """Times one setup's inference and collects its accuracy on both targets."""
+    start = time.perf_counter()
+    Y_pred = predict_fn(X_test)
+    batch_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict_fn(single_row)
+    single_row_ms = (time.perf_counter() - start) / repeats * 1000.0
+    heating = evaluator._compute_metrics(Y_test[:, 0], Y_pred[:, 0])
+    cooling = evaluator._compute_metrics(Y_test[:, 1], Y_pred[:, 1])
+    return {
+        'model': model_name, 'mode': mode, 'train_s': train_seconds,
+        'single_row_ms': single_row_ms, 'test_set_ms': batch_seconds * 1000.0,
+        'heating_rmse': heating['rmse'], 'heating_r2': heating['r2'],
+        'cooling_rmse': cooling['rmse'], 'cooling_r2': cooling['r2'],
+    }
+
+# ==============================================================================
+#  4. Main Execution Block
+# ==============================================================================
+def save_stage_timings(timer, extra):
+    """Prints the stage summary and writes the timing report of any training mode."""
+    timer.print_summary()
+    timer.save(PROFILE_REPORT_PATH, extra=dict(extra, library_versions=library_versions()))
+    print(f"\nStage timing report saved to '{PROFILE_REPORT_PATH}'")
+
+def parse_args():
+    """Parses command line options for the training script."""
+    parser = argparse.ArgumentParser(description="Train and evaluate the energy load models.")
+    parser.add_argument('--multi-output', action='store_true',
+                        help="Fit one model per algorithm on both targets instead of one per target.")
+    parser.add_argument('--compare-multi-output', action='store_true',
+                        help="Benchmark the two-model setup against multi-output models and exit.")
+    parser.add_argument('--parallel', action='store_true',
+                        help="Train all models and targets at the same time on a process pool.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes for --parallel (default: one per core).")
+    parser.add_argument('--no-dataset-cache', action='store_true',
+                        help="Parse the CSV directly instead of memory-mapping the binary dataset cache.")
+    parser.add_argument('--out-of-core', action='store_true',
+                        help="Train the XGBoost models from CSV chunks with external memory and exit.")
+    parser.add_argument('--memory-cap-mb', type=int, default=256,
+                        help="Resident memory budget of --out-of-core; exits non-zero if it is exceeded.")
+    parser.add_argument('--profile', action='store_true',
+                        help="Run the pipeline under cProfile and save the stats next to the models.")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Record the peak Python memory of every stage with tracemalloc (slower).")
+    parser.add_argument('--force-retrain', action='store_true',
+                        help="Retrain every model even if its inputs are unchanged since the last run.")
+    return parser.parse_args()
+
 def main():
     """Main function to execute the model evaluation and saving script."""
+    args = parse_args()
     print("Script execution started: Training and evaluating all models.")
     dataset_file_path = 'energy-efficiency-dataset.csv'
-    models_to_test = {
-        "Linear Regression": (LinearRegression, {}),
-        "Random Forest Regressor": (RandomForestRegressor, {'n_estimators': 100, 'random_state': 42}),
-        "XGBoost Regressor": (xgb.XGBRegressor, {'n_estimators': 100, 'learning_rate': 0.1, 'random_state': 42})
-    }
-    for model_name, (model_class, params) in models_to_test.items():
-        evaluator = ModelEvaluator(
-            model_class=model_class,
-            model_name=model_name,
-            file_path=dataset_file_path,
-            **params
-        )
-        evaluator.run_full_evaluation()
+    models_to_test = MODELS_TO_TEST
+    cache_dir = None if args.no_dataset_cache else DATASET_CACHE_DIR
+    timer = StageTimer(trace_memory=args.trace_memory)
+    if args.compare_multi_output:
+        compare_multi_output(dataset_file_path, models_to_test, cache_dir=cache_dir)
+        print("\nScript execution finished.")
+        return
+    if args.out_of_core:
+        from out_of_core import OutOfCoreTrainer
+        trainer = OutOfCoreTrainer(dataset_file_path, args.memory_cap_mb, timer=timer)
+        trainer.run()
+        save_stage_timings(timer, {'mode': 'out-of-core'})
+        print("\nScript execution finished.")
+        if trainer.exceeded_memory_cap():
+            sys.exit(1)
+        return
+    if args.parallel:
+        from parallel_evaluation import run_parallel_evaluation
+        metrics = run_parallel_evaluation(models_to_test, dataset_file_path, args.workers, args.multi_output,
+                                          cache_dir, timer) or {}
+        with timer.stage('lookup'):
+            build_prediction_lookup_table(dataset_file_path, args.multi_output, cache_dir)
+        xgb_metrics = {target_name: target_metrics for (model_name, target_name), target_metrics in metrics.items()
+                       if model_name == "XGBoost Regressor"}
+        publish_to_registry(dataset_file_path, xgb_metrics, args.multi_output)
+        record_training_state(dataset_file_path, args.multi_output)
+        save_stage_timings(timer, {'mode': 'parallel', 'multi_output': args.multi_output})
+        print("\nScript execution finished.")
+        return
+    build_cache = None
+    if not args.force_retrain:
+        from build_cache import BuildCache
+        build_cache = BuildCache(library_versions())
+    with profile_capture(os.path.join(MODEL_FOLDER, 'pipeline_profile.pstats'), enabled=args.profile):
+        with timer.stage('load'):
+            df = load_energy_dataset(dataset_file_path, cache_dir) # Loaded once, shared by every evaluator
+        xgb_metrics = {}
+        for model_name, (model_class, params) in models_to_test.items():
+            evaluator = ModelEvaluator(
+                model_class=model_class,
+                model_name=model_name,
+                file_path=dataset_file_path,
+                multi_output=args.multi_output,
+                df=df,
+                timer=timer,
+                build_cache=build_cache,
+                **params
+            )
+            evaluator.run_full_evaluation()
+            if model_name == "XGBoost Regressor":
+                xgb_metrics = evaluator.metrics
+        # With every model reused, the saved training state still holds; the lookup table and the
+        # registry compare their model hashes, so none of the three reads the dataset on a warm run
+        models_unchanged = build_cache is not None and build_cache.misses == 0
+        with timer.stage('outputs'):
+            build_prediction_lookup_table(dataset_file_path, args.multi_output, cache_dir)
+            publish_to_registry(dataset_file_path, xgb_metrics, args.multi_output)
+            record_training_state(dataset_file_path, args.multi_output, models_unchanged)
+    if build_cache is not None:
+        print(f"\nBuild cache: {build_cache.hits} reused, {build_cache.misses} retrained")
+    save_stage_timings(timer, {'mode': 'sequential', 'multi_output': args.multi_output,
+                               'rows': None if df is None else len(df)})
     print("\nScript execution finished.")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,265 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import os
+import json
+import argparse
+import threading
+from collections import OrderedDict, Counter
+import numpy as np
+import pandas as pd
+from predict import EnergyLoadPredictor
+
+FLEET_ROOT = os.path.join('models', 'fleet')
+USAGE_FILE = 'usage.json'
+# Model files looked up in every key's directory, fastest-loading format first
+MODEL_EXTENSIONS = ('.trees', '.npz', '.joblib')
+LOOKUP_TABLE_FILE = 'xgb_lookup_table.npz'
+
+# ==============================================================================
+#  2. Fleet Layout Helpers
+# ==============================================================================
+
+def _find_model(key_dir, stem):
+    """Returns the path of `stem` in the preferred format, or None if no format exists."""
+    for extension in MODEL_EXTENSIONS:
+        path = os.path.join(key_dir, stem + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+def key_artifacts(key_dir):
+    """Returns the model files of one key directory, named as main.py saves them.
+
+    Returns:
+        dict: Keyword arguments for `EnergyLoadPredictor` ('multi_output_model_path'
+        or the heating/cooling pair, plus 'lookup_table_path' when present).
+    """
+    artifacts = {}
+    multi_output = _find_model(key_dir, 'xgb_multi_output_model')
+    if multi_output:
+        artifacts['multi_output_model_path'] = multi_output
+    else:
+        artifacts['heating_model_path'] = _find_model(key_dir, 'xgb_heating_model')
+        artifacts['cooling_model_path'] = _find_model(key_dir, 'xgb_cooling_model')
+    table_path = os.path.join(key_dir, LOOKUP_TABLE_FILE)
+    if os.path.exists(table_path):
+        artifacts['lookup_table_path'] = table_path
+    return artifacts
+
+# ==============================================================================
+#  3. Multi-Model Predictor
+# ==============================================================================
+
+class MultiModelPredictor:
+    """Serves many heating/cooling model pairs from one process, loading them on demand.
+
+    Every key (e.g. a climate zone and customer) is a directory under `root`
+    holding that key's model files in the layout of `models/`. A key's
+    models are loaded on first use and kept in an LRU cache bounded by
+    `max_bytes`, where an entry's size is the size of its model files. The
+    least recently used keys are evicted to make room. Access counts are
+    kept in `usage.json` so the next start can preload the hottest keys.
+    """
+
+    def __init__(self, root=FLEET_ROOT, max_bytes=512 * 1024 * 1024, preload=0):
+        """Initializes the predictor and preloads the hottest keys.
+
+        Args:
+            root (str): Directory with one sub-directory of models per key.
+            max_bytes (int): Budget for the loaded models' file sizes.
+            preload (int | list): Number of most used keys to load now, or an explicit list of keys.
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.usage = Counter(self._read_usage())
+        self._entries = OrderedDict() # Key -> (EnergyLoadPredictor, size in bytes), least recent first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        keys = preload if isinstance(preload, (list, tuple)) else [key for key, _ in self.usage.most_common(preload)]
+        self.preload(keys)
+
+    def available_keys(self):
+        """Returns every key with a model directory under `root`."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+    def preload(self, keys):
+        """Loads the given keys in order until the byte budget is full.
+
+        Returns:
+            list: The keys that were loaded.
+        """
+        loaded = []
+        for key in keys:
+            if not os.path.isdir(self._key_dir(key)):
+                continue
+            if self._bytes + self._estimate_bytes(key) > self.max_bytes:
+                break # Preloading must never evict what it just loaded
+            self._get(key, count=False)
+            loaded.append(key)
+        return loaded
+
+    def predictor(self, key):
+        """Returns the loaded `EnergyLoadPredictor` of a key, loading it on a miss."""
+        return self._get(key)
+
+    def predict_one(self, key, features):
+        """Predicts the (heating, cooling) loads of one building with a key's models."""
+        return self._get(key).predict_one(features)
+
+    def predict_batch(self, key, features):
+        """Predicts many buildings with a key's models; see `EnergyLoadPredictor.predict_batch`."""
+        return self._get(key).predict_batch(features)
+
+    def predict_frame(self, df, key_column='Model Key'):
+        """Scores a DataFrame whose rows may belong to different keys.
+
+        Rows are grouped by key so every key's models are fetched once and
+        scored in a single batch.
+
+        Returns:
+            tuple: Two 1D numpy arrays (heating loads, cooling loads) in the row order of `df`.
+
+        Raises:
+            ValueError: If any row has no key; no row is left unscored.
+        """
+        missing = df[key_column].isna()
+        if missing.any():
+            raise ValueError(f"{int(missing.sum())} row(s) have no '{key_column}', e.g. at positions "
+                             f"{np.flatnonzero(missing.to_numpy())[:5].tolist()}.")
+        heating = np.full(len(df), np.nan)
+        cooling = np.full(len(df), np.nan)
+        for key, positions in df.groupby(key_column, sort=False).indices.items():
+            rows = df.iloc[positions].drop(columns=[key_column])
+            heating[positions], cooling[positions] = self.predict_batch(str(key), rows)
+        return heating, cooling
+
+    def stats(self):
+        """Returns the cache counters and current memory use."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'loaded_keys': len(self._entries),
+                'loaded_bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def save_usage(self):
+        """Writes the access counts to `usage.json`, replacing the old file atomically."""
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, USAGE_FILE)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with self._lock:
+            usage = dict(self.usage)
+        with open(tmp_path, 'w') as f:
+            json.dump(usage, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _get(self, key, count=True):
+        """Returns a key's predictor from the cache, loading it under a per-key lock on a miss."""
+        with self._lock:
+            if count:
+                self.usage[key] += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += count
+                return entry[0]
+            self.misses += count
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock: # Concurrent misses on one key load it once
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    return entry[0]
+            predictor, size = self._load(key)
+            with self._lock:
+                self._entries[key] = (predictor, size)
+                self._bytes += size
+                self._evict(keep=key)
+        return predictor
+
+    def _load(self, key):
+        """Loads one key's models.
+
+        Raises:
+            KeyError: If the key has no model directory or its models are incomplete.
+        """
+        key_dir = self._key_dir(key)
+        if not os.path.isdir(key_dir):
+            raise KeyError(f"No models for key '{key}' under '{self.root}'.")
+        artifacts = key_artifacts(key_dir)
+        model_paths = [path for name, path in artifacts.items() if name != 'lookup_table_path']
+        if not model_paths or not all(model_paths):
+            raise KeyError(f"Models for key '{key}' are incomplete in '{key_dir}'.")
+        predictor = EnergyLoadPredictor(**artifacts)
+        return predictor, sum(os.path.getsize(path) for path in artifacts.values())
+
+    def _estimate_bytes(self, key):
+        return sum(os.path.getsize(path) for path in key_artifacts(self._key_dir(key)).values() if path)
+
+    def _evict(self, keep):
+        """Drops least recently used entries until the budget holds (never `keep`). Called under the lock."""
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            _, size = self._entries.pop(oldest)
+            self._bytes -= size
+            self.evictions += 1
+
+    def _key_dir(self, key):
+        if not key or os.sep in key or '/' in key or key in ('.', '..'):
+            raise KeyError(f"Invalid model key '{key}'.")
+        return os.path.join(self.root, key)
+
+    def _read_usage(self):
+        try:
+            with open(os.path.join(self.root, USAGE_FILE), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+# ==============================================================================
+#  4. Main Execution Block
+# ==============================================================================
+def main():
+    """Scores a CSV whose rows name the key of the models to use, then prints the cache counters."""
+    parser = argparse.ArgumentParser(description="Predict energy loads with per-key models from a model fleet.")
+    parser.add_argument('--input', required=True,
+                        help="CSV with the 8 feature columns (full names or X1..X8) and a key column.")
+    parser.add_argument('--output', help="Where to write the predictions (default: print them).")
+    parser.add_argument('--root', default=FLEET_ROOT, help="Directory with one sub-directory of models per key.")
+    parser.add_argument('--key-column', default='Model Key')
+    parser.add_argument('--max-mb', type=float, default=512.0, help="Memory budget for loaded models.")
+    parser.add_argument('--preload', type=int, default=0, help="Number of most used keys to load at start-up.")
+    args = parser.parse_args()
+
+    fleet = MultiModelPredictor(args.root, int(args.max_mb * 1024 * 1024), args.preload)
+    df = pd.read_csv(args.input)
+    heating, cooling = fleet.predict_frame(df, args.key_column)
+    df['Predicted Heating Load'] = heating
+    df['Predicted Cooling Load'] = cooling
+    if args.output:
+        df.to_csv(args.output, index=False)
+        print(f"Predictions for {len(df)} rows written to '{args.output}'")
+    else:
+        print(df.to_string(index=False))
+    fleet.save_usage()
+    stats = fleet.stats()
+    print(f"\nModel cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions, "
+          f"{stats['loaded_keys']} keys loaded ({stats['loaded_bytes'] / (1024 * 1024):.1f} MB)")
+
+if __name__ == '__main__':
+    main()
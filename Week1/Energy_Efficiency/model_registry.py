@@ -0,0 +1,134 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import os
+import json
+import shutil
+from datetime import datetime, timezone
+from dataset_cache import file_sha256
+
+REGISTRY_FOLDER = os.path.join('models', 'registry')
+# Artifact roles a version may hold, and the file name each is stored under
+ARTIFACT_FILES = {
+    'heating': 'heating_model.joblib',
+    'cooling': 'cooling_model.joblib',
+    'multi_output': 'multi_output_model.joblib',
+    'lookup_table': 'lookup_table.npz',
+}
+
+# ==============================================================================
+#  2. Model Registry
+# ==============================================================================
+
+class ModelRegistry:
+    """A directory of immutable model versions behind an atomically switched pointer.
+
+    Layout::
+
+        registry/
+            CURRENT                     # name of the version being served
+            versions/<version>/
+                metadata.json           # data hash, metrics, timestamp, file hashes
+                heating_model.joblib    # ... and the other artifacts of the version
+
+    A version is written to a temporary directory and renamed into place
+    once complete, then `CURRENT` is replaced with `os.replace`, so a reader
+    sees either the old or the new version and never a half-written file.
+    """
+
+    def __init__(self, root=REGISTRY_FOLDER, keep_versions=5):
+        """Initializes the registry.
+
+        Args:
+            root (str): The registry directory.
+            keep_versions (int): Number of most recent versions kept on disk when publishing.
+        """
+        self.root = root
+        self.keep_versions = keep_versions
+        self.versions_dir = os.path.join(root, 'versions')
+        self._pointer_path = os.path.join(root, 'CURRENT')
+
+    def publish(self, artifacts, data_path=None, metrics=None, extra=None, data_fingerprint=None):
+        """Stores a new version and makes it current.
+
+        Args:
+            artifacts (dict): Role (a key of `ARTIFACT_FILES`) -> path of the file to store.
+            data_path (str, optional): The training data, hashed into the metadata.
+            metrics (dict, optional): Evaluation metrics to record.
+            extra (dict, optional): Any other JSON-serializable metadata.
+            data_fingerprint (dict, optional): A cheaper description of the training data (e.g.
+                its size and rows learned), recorded instead of hashing a large `data_path`.
+
+        Returns:
+            str: The new version name.
+        """
+        unknown = [role for role in artifacts if role not in ARTIFACT_FILES]
+        if unknown:
+            raise ValueError(f"Unknown artifact roles: {unknown}")
+        os.makedirs(self.versions_dir, exist_ok=True)
+        created = datetime.now(timezone.utc)
+        version = created.strftime('%Y%m%dT%H%M%S%fZ')
+        tmp_dir = os.path.join(self.versions_dir, f".tmp-{version}-{os.getpid()}")
+        os.makedirs(tmp_dir)
+        files = {}
+        for role, source in artifacts.items():
+            destination = os.path.join(tmp_dir, ARTIFACT_FILES[role])
+            shutil.copyfile(source, destination)
+            files[role] = {'file': ARTIFACT_FILES[role], 'sha256': file_sha256(destination)}
+        metadata = {
+            'version': version,
+            'created': created.isoformat(),
+            'data_sha256': file_sha256(data_path) if data_path and data_fingerprint is None else None,
+            'data': data_fingerprint,
+            'metrics': metrics or {},
+            'files': files,
+        }
+        metadata.update(extra or {})
+        with open(os.path.join(tmp_dir, 'metadata.json'), 'w') as f:
+            json.dump(metadata, f, indent=2, default=float)
+        os.rename(tmp_dir, os.path.join(self.versions_dir, version))
+        self.set_current(version)
+        self._prune()
+        return version
+
+    def set_current(self, version):
+        """Atomically points `CURRENT` at an existing version (also used to roll back)."""
+        if not os.path.exists(os.path.join(self.versions_dir, version, 'metadata.json')):
+            raise ValueError(f"Version '{version}' does not exist in '{self.root}'.")
+        tmp_path = f"{self._pointer_path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+        os.replace(tmp_path, self._pointer_path)
+
+    def current_version(self):
+        """Returns the name of the current version, or None if nothing has been published."""
+        try:
+            with open(self._pointer_path, 'r') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def list_versions(self):
+        """Returns all complete versions, oldest first."""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(name for name in os.listdir(self.versions_dir)
+                      if not name.startswith('.') and os.path.exists(os.path.join(self.versions_dir, name, 'metadata.json')))
+
+    def metadata(self, version):
+        """Returns the metadata of a version."""
+        with open(os.path.join(self.versions_dir, version, 'metadata.json'), 'r') as f:
+            return json.load(f)
+
+    def artifact_paths(self, version):
+        """Returns role -> absolute file path for every artifact of a version."""
+        version_dir = os.path.join(self.versions_dir, version)
+        return {role: os.path.join(version_dir, entry['file'])
+                for role, entry in self.metadata(version)['files'].items()}
+
+    def _prune(self):
+        """Deletes the oldest versions beyond `keep_versions`, never the current one."""
+        current = self.current_version()
+        stale = [version for version in self.list_versions() if version != current]
+        for version in stale[:max(0, len(stale) - (self.keep_versions - 1))]:
+            shutil.rmtree(os.path.join(self.versions_dir, version), ignore_errors=True)
@@ -0,0 +1,335 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import os
+import sys
+import time
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from main import (COLUMN_RENAMES, FEATURE_NAMES, TARGET_NAMES, MODELS_TO_TEST, MODEL_FOLDER,
+                  print_evaluation_report)
+from profiling import StageTimer, current_rss_mb, peak_rss_mb
+
+DEFAULT_MEMORY_CAP_MB = 256
+# Share of the memory cap a single parsed chunk (and its copies) may take
+CHUNK_MEMORY_SHARE = 0.25
+# Rough in-memory cost of one parsed float64 value, including pandas' parsing overhead
+BYTES_PER_VALUE = 24
+COMPARISON_SAMPLES = 15
+
+# ==============================================================================
+#  2. Streaming Train/Test Split
+# ==============================================================================
+
+def hash_split_mask(row_ids, test_size=0.2, seed=42):
+    """Returns True for the rows that belong to the test set.
+
+    Each row is assigned from a SplitMix64 hash of its position in the file,
+    so the split is reproducible, needs no shuffle buffer and gives the same
+    answer whichever chunk the row arrives in.
+    """
+    with np.errstate(over='ignore'):
+        z = np.asarray(row_ids, dtype=np.uint64) + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / float(1 << 53) < test_size
+
+def iter_split_chunks(file_path, subset, chunk_size, test_size=0.2, seed=42):
+    """Reads the CSV in chunks and yields the cleaned rows of one side of the split.
+
+    Args:
+        subset (str): 'train' or 'test'.
+
+    Yields:
+        tuple: (features DataFrame, targets DataFrame) with float32 columns.
+    """
+    if subset not in ('train', 'test'):
+        raise ValueError("subset must be 'train' or 'test'.")
+    with pd.read_csv(file_path, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            # The chunk index counts rows from the start of the file, before any cleaning
+            is_test = hash_split_mask(chunk.index.to_numpy(), test_size, seed)
+            chunk = chunk[is_test if subset == 'test' else ~is_test].dropna().rename(columns=COLUMN_RENAMES)
+            if len(chunk):
+                yield chunk[FEATURE_NAMES].astype(np.float32), chunk[TARGET_NAMES].astype(np.float32)
+
+class ChunkedCSVIter(xgb.DataIter):
+    """Feeds XGBoost one CSV chunk at a time for external-memory training."""
+
+    def __init__(self, file_path, target_name, chunk_size, test_size=0.2, seed=42, cache_prefix=None):
+        self.file_path = file_path
+        self.target_name = target_name
+        self.chunk_size = chunk_size
+        self.test_size = test_size
+        self.seed = seed
+        self._chunks = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        """Passes the next training chunk to XGBoost; returns 0 once the file is exhausted."""
+        if self._chunks is None:
+            self._chunks = iter_split_chunks(self.file_path, 'train', self.chunk_size, self.test_size, self.seed)
+        try:
+            X, Y = next(self._chunks)
+        except StopIteration:
+            return 0
+        input_data(data=X, label=Y[self.target_name])
+        return 1
+
+    def reset(self):
+        """Rewinds to the start of the file for the next pass."""
+        if self._chunks is not None:
+            self._chunks.close()
+        self._chunks = None
+
+# ==============================================================================
+#  3. Streaming Metrics
+# ==============================================================================
+
+class StreamingRegressionMetrics:
+    """Accumulates the regression metrics of `ModelEvaluator` over chunks.
+
+    Only running sums are kept, plus the first few samples for the
+    actual vs. predicted comparison.
+    """
+
+    def __init__(self, n_features=len(FEATURE_NAMES)):
+        self.n_features = n_features
+        self.n = 0
+        self.sum_squared_error = 0.0
+        self.sum_absolute_error = 0.0
+        self.sum_y = 0.0
+        self.sum_y_squared = 0.0
+        self.y_true_samples, self.y_pred_samples = [], []
+
+    def update(self, y_true, y_pred):
+        y_true = np.asarray(y_true, dtype=np.float64)
+        error = y_true - np.asarray(y_pred, dtype=np.float64)
+        self.n += len(y_true)
+        self.sum_squared_error += float(np.dot(error, error))
+        self.sum_absolute_error += float(np.abs(error).sum())
+        self.sum_y += float(y_true.sum())
+        self.sum_y_squared += float(np.dot(y_true, y_true))
+        missing = COMPARISON_SAMPLES - len(self.y_true_samples)
+        if missing > 0:
+            self.y_true_samples.extend(y_true[:missing])
+            self.y_pred_samples.extend(np.asarray(y_pred)[:missing])
+
+    def result(self):
+        """Returns the same metric dictionary as `ModelEvaluator._compute_metrics`."""
+        if self.n == 0:
+            raise ValueError("No test rows were seen.")
+        mse = self.sum_squared_error / self.n
+        total_sum_squares = self.sum_y_squared - self.sum_y ** 2 / self.n
+        r2 = 1.0 - self.sum_squared_error / total_sum_squares if total_sum_squares > 0 else 0.0
+        denominator = self.n - self.n_features - 1
+        adj_r2 = r2 if denominator == 0 else 1 - (1 - r2) * (self.n - 1) / denominator
+        return {'mse': mse, 'rmse': np.sqrt(mse), 'mae': self.sum_absolute_error / self.n,
+                'r2': r2, 'adj_r2': adj_r2}
+
+# ==============================================================================
+#  4. Out-of-Core Trainer
+# ==============================================================================
+
+def chunk_rows_for_memory_cap(memory_cap_mb, baseline_mb=0.0, n_columns=len(COLUMN_RENAMES)):
+    """Returns how many CSV rows to parse at once to stay well under `memory_cap_mb`.
+
+    `baseline_mb` is what the process already holds before reading any data
+    (the interpreter, NumPy, pandas and XGBoost), so only the rest of the cap
+    is shared out to the chunks.
+    """
+    available_mb = memory_cap_mb - baseline_mb
+    if available_mb <= 0:
+        raise ValueError(f"The {memory_cap_mb} MB cap is below the {baseline_mb:,.0f} MB "
+                         "the process uses before loading any data.")
+    budget = available_mb * 1024 * 1024 * CHUNK_MEMORY_SHARE
+    return max(1_000, int(budget // (n_columns * BYTES_PER_VALUE)))
+
+def booster_params(model_params):
+    """Translates XGBRegressor parameters (as in `MODELS_TO_TEST`) to native `xgb.train` ones.
+
+    Returns:
+        tuple: (parameter dict, number of boosting rounds).
+    """
+    params = dict(model_params)
+    num_boost_round = params.pop('n_estimators', 100)
+    if 'random_state' in params:
+        params['seed'] = params.pop('random_state')
+    params.setdefault('objective', 'reg:squarederror')
+    params['tree_method'] = 'hist' # The only method that supports external memory
+    return params, num_boost_round
+
+class OutOfCoreTrainer:
+    """Trains the XGBoost models from a CSV that does not have to fit in memory.
+
+    The CSV is read in chunks sized from what is left of `memory_cap_mb` after
+    the process's resident memory at start-up. XGBoost builds its
+    quantized training pages from those chunks and keeps them on disk, and
+    the holdout set is chosen by hashing row positions instead of shuffling
+    in memory. Evaluation streams the holdout rows through the trained
+    boosters and produces the same metrics as `ModelEvaluator`.
+    """
+
+    def __init__(self, file_path, memory_cap_mb=DEFAULT_MEMORY_CAP_MB, chunk_size=None, test_size=0.2,
+                 seed=42, model_params=None, timer=None):
+        """Initializes the trainer.
+
+        Args:
+            file_path (str): The energy efficiency CSV, with raw X1..X8 / Y1..Y2 headers.
+            memory_cap_mb (int): Budget for the whole process's resident memory; it sizes the chunks.
+            chunk_size (int, optional): Rows per chunk; derived from `memory_cap_mb` when omitted.
+            test_size (float): Expected share of rows hashed into the test set.
+            seed (int): Seed of the hash split.
+            model_params (dict, optional): XGBRegressor parameters; defaults to those in `MODELS_TO_TEST`.
+            timer (StageTimer, optional): Records the fit, metrics and save stages.
+        """
+        self.file_path = file_path
+        self.memory_cap_mb = memory_cap_mb
+        self.baseline_mb = current_rss_mb() or peak_rss_mb() or 0.0
+        self.chunk_size = chunk_size or chunk_rows_for_memory_cap(memory_cap_mb, self.baseline_mb)
+        self.peak_mb = None
+        self.timer = timer or StageTimer()
+        self.test_size = test_size
+        self.seed = seed
+        self.params, self.num_boost_round = booster_params(
+            model_params if model_params is not None else MODELS_TO_TEST["XGBoost Regressor"][1])
+
+    def run(self, save=True):
+        """Trains one booster per target, evaluates both on the streamed test set and saves them.
+
+        Afterwards `peak_mb` holds the process's peak resident memory (see
+        `exceeded_memory_cap`).
+
+        Returns:
+            dict: Target name -> metrics dictionary, or None if the file does not exist.
+        """
+        if not os.path.exists(self.file_path):
+            print(f"Error: The file '{self.file_path}' was not found.")
+            return None
+        print("\n" + "="*60)
+        print(f"--- OUT-OF-CORE TRAINING: XGBoost Regressor ({self.chunk_size:,} rows per chunk, "
+              f"{self.memory_cap_mb} MB cap, {self.baseline_mb:,.0f} MB in use before loading) ---")
+        print("="*60)
+        boosters = {}
+        with tempfile.TemporaryDirectory(prefix='xgb-extmem-') as cache_dir:
+            for target_name in TARGET_NAMES:
+                start = time.perf_counter()
+                with self.timer.stage('fit', "XGBoost Regressor", target_name):
+                    boosters[target_name] = self._train(target_name,
+                                                        os.path.join(cache_dir, target_name.replace(' ', '_')))
+                print(f"Trained {target_name} model in {time.perf_counter() - start:.1f}s")
+        with self.timer.stage('metrics', "XGBoost Regressor"):
+            metrics = self._evaluate(boosters)
+        if save:
+            with self.timer.stage('save', "XGBoost Regressor"):
+                self._save(boosters)
+        self.peak_mb = peak_rss_mb()
+        if self.peak_mb is not None:
+            print(f"Peak resident memory: {self.peak_mb:,.0f} MB of the {self.memory_cap_mb} MB cap"
+                  + (" -- above the cap!" if self.exceeded_memory_cap() else ""))
+        return metrics
+
+    def exceeded_memory_cap(self):
+        """Returns True if the process's peak resident memory went over the cap during `run`."""
+        return self.peak_mb is not None and self.peak_mb > self.memory_cap_mb
+
+    def _train(self, target_name, cache_prefix):
+        """Builds the external-memory training matrix for a target and boosts on it."""
+        data_iter = ChunkedCSVIter(self.file_path, target_name, self.chunk_size, self.test_size, self.seed,
+                                   cache_prefix=cache_prefix)
+        if hasattr(xgb, 'ExtMemQuantileDMatrix'): # XGBoost 3.0+
+            dtrain = xgb.ExtMemQuantileDMatrix(data_iter, max_bin=self.params.get('max_bin', 256))
+        else:
+            dtrain = xgb.DMatrix(data_iter) # Pages are cached under `cache_prefix`
+        return xgb.train(self.params, dtrain, num_boost_round=self.num_boost_round)
+
+    def _evaluate(self, boosters):
+        """Streams the test rows once, scoring both targets, and prints the usual report."""
+        trackers = {target_name: StreamingRegressionMetrics() for target_name in TARGET_NAMES}
+        for X, Y in iter_split_chunks(self.file_path, 'test', self.chunk_size, self.test_size, self.seed):
+            for target_name, booster in boosters.items():
+                trackers[target_name].update(Y[target_name].to_numpy(), booster.inplace_predict(X))
+        metrics = {}
+        for index, target_name in enumerate(TARGET_NAMES):
+            tracker = trackers[target_name]
+            metrics[target_name] = tracker.result()
+            if index > 0:
+                print("\n" + "-"*40 + "\n")
+            print(f"--- Results for {target_name} ({tracker.n:,} streamed test rows) ---")
+            print_evaluation_report(metrics[target_name], tracker.y_true_samples, tracker.y_pred_samples,
+                                    target_name)
+        return metrics
+
+    def _save(self, boosters):
+        """Saves each booster in XGBoost's JSON format and as a pure-NumPy .npz ensemble."""
+        from tree_export import export_xgboost
+        os.makedirs(MODEL_FOLDER, exist_ok=True)
+        for target_name, booster in boosters.items():
+            stem = os.path.join(MODEL_FOLDER, f"xgb_{target_name.split()[0].lower()}_model_ooc")
+            booster.save_model(f"{stem}.json")
+            export_xgboost(booster).save(f"{stem}.npz")
+            print(f"\nModel for {target_name} saved to '{stem}.json' and '{stem}.npz'")
+
+# ==============================================================================
+#  5. Demo on a File Larger Than the Memory Cap
+# ==============================================================================
+
+def generate_demo_file(source_path, output_path, memory_cap_mb, size_multiple=4, seed=42):
+    """Writes a synthetic dataset at least `size_multiple` times larger than the memory cap.
+
+    Returns:
+        str: `output_path`.
+    """
+    from benchmark import generate_synthetic_dataset
+    target_bytes = size_multiple * memory_cap_mb * 1024 * 1024
+    if os.path.exists(output_path) and os.path.getsize(output_path) >= target_bytes:
+        return output_path
+    sample_rows = 10_000 # Measures the bytes per row of the generated format
+    generate_synthetic_dataset(source_path, sample_rows, output_path, seed=seed)
+    n_rows = int(np.ceil(target_bytes / (os.path.getsize(output_path) / sample_rows)))
+    print(f"Generating {n_rows:,} synthetic rows (~{target_bytes / 1024 ** 2:,.0f} MB) into '{output_path}'...")
+    return generate_synthetic_dataset(source_path, n_rows, output_path, seed=seed)
+
+# ==============================================================================
+#  6. Main Execution Block
+# ==============================================================================
+def main():
+    """Trains the XGBoost models out of core, optionally on a generated oversized file."""
+    parser = argparse.ArgumentParser(description="Out-of-core XGBoost training from chunked CSV files.")
+    parser.add_argument('--data', default='energy-efficiency-dataset.csv')
+    parser.add_argument('--memory-cap-mb', type=int, default=DEFAULT_MEMORY_CAP_MB)
+    parser.add_argument('--chunk-size', type=int, default=None, help="Rows per chunk (default: from the memory cap).")
+    parser.add_argument('--test-size', type=float, default=0.2)
+    parser.add_argument('--demo', action='store_true',
+                        help="Generate a file several times larger than the memory cap from --data and train on it.")
+    parser.add_argument('--demo-multiple', type=int, default=4)
+    parser.add_argument('--demo-file', default=os.path.join('benchmarks', 'energy-out-of-core-demo.csv'))
+    args = parser.parse_args()
+
+    file_path = args.data
+    if args.demo:
+        if not os.path.exists(args.data):
+            print(f"Error: The file '{args.data}' was not found.")
+            return
+        # Generated in a child process, so its memory does not count towards this process's peak
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            file_path = pool.submit(generate_demo_file, args.data, args.demo_file, args.memory_cap_mb,
+                                    args.demo_multiple).result()
+    start = time.perf_counter()
+    trainer = OutOfCoreTrainer(file_path, args.memory_cap_mb, args.chunk_size, args.test_size)
+    if trainer.run() is None:
+        return
+    trainer.timer.print_summary()
+    file_mb = os.path.getsize(file_path) / 1024 ** 2
+    print(f"\nProcessed a {file_mb:,.0f} MB file in {time.perf_counter() - start:.1f}s "
+          f"with a {args.memory_cap_mb} MB cap (x{file_mb / args.memory_cap_mb:.1f}).")
+    if trainer.exceeded_memory_cap():
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
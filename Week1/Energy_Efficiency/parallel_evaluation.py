@@ -0,0 +1,172 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from threadpoolctl import threadpool_limits # Installed with scikit-learn
+from main import (ModelEvaluator, load_energy_dataset, split_dataset, save_model_artifact,
+                  TARGET_NAMES, DATASET_CACHE_DIR)
+from profiling import StageTimer
+
+# ==============================================================================
+#  2. Worker-Side Training
+# ==============================================================================
+
+# Read-only train/test split shared by every task of a worker process
+_SHARED_DATA = {}
+
+def _init_worker(X_train, X_test, Y_train, threads_per_worker):
+    """Stores the shared split once per worker and caps its native thread pools."""
+    _SHARED_DATA.update(X_train=X_train, X_test=X_test, Y_train=Y_train)
+    # BLAS/OpenMP pools would otherwise each spawn one thread per core
+    threadpool_limits(limits=threads_per_worker)
+
+def _thread_params(model_class, params, threads):
+    """Returns `params` with the model's own parallelism set to the worker's CPU budget.
+
+    RandomForestRegressor and XGBRegressor both expose `n_jobs` (XGBoost's
+    `nthread`); models without it are left untouched.
+    """
+    params = dict(params)
+    if 'n_jobs' in model_class().get_params():
+        params['n_jobs'] = threads
+    return params
+
+def _train_task(model_name, model_class, params, target_name, threads):
+    """Fits one model on one target (or both, when `target_name` is None) and predicts the test set.
+
+    The stages are timed in the worker, and their records are returned for the parent's report.
+    """
+    X_train, X_test, Y_train = _SHARED_DATA['X_train'], _SHARED_DATA['X_test'], _SHARED_DATA['Y_train']
+    y_train = Y_train.to_numpy() if target_name is None else Y_train[target_name]
+    label = target_name or " + ".join(TARGET_NAMES)
+    timer = StageTimer()
+    start = time.perf_counter()
+    model = model_class(**_thread_params(model_class, params, threads))
+    with timer.stage('fit', model_name, label):
+        model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    with timer.stage('predict', model_name, label):
+        y_pred = np.asarray(model.predict(X_test))
+    with timer.stage('save', model_name, label):
+        filename = save_model_artifact(model, model_name, target_name)
+    return {
+        'model_name': model_name,
+        'target_name': target_name,
+        'y_pred': y_pred,
+        'seconds': time.perf_counter() - start,
+        'fit_seconds': fit_seconds,
+        'saved_to': filename,
+        'stage_records': timer.records,
+    }
+
+# ==============================================================================
+#  3. Parallel Evaluation Runner
+# ==============================================================================
+
+class ParallelEvaluationRunner:
+    """Trains every (model, target) pair at the same time on a process pool.
+
+    The dataset is loaded, cleaned and split once in the parent process and
+    handed to each worker once through the pool initializer. Each worker gets an
+    equal share of the cores for the model's own threads, so RandomForest's
+    `n_jobs` and XGBoost's `nthread` never oversubscribe the machine.
+    """
+
+    def __init__(self, models_to_test, file_path, max_workers=None, multi_output=False,
+                 cache_dir=DATASET_CACHE_DIR, timer=None):
+        """Initializes the runner.
+
+        Args:
+            models_to_test (dict): Model name -> (model class, parameter dict), as in main.py.
+            file_path (str): The path of the energy efficiency CSV.
+            max_workers (int, optional): Number of worker processes; defaults to one per task, up to the core count.
+            multi_output (bool): Fit one model on both targets instead of one per target.
+            cache_dir (str, optional): Binary dataset cache directory; None parses the CSV.
+            timer (StageTimer, optional): Collects the parent's stages and those timed in the workers.
+        """
+        self.models_to_test = models_to_test
+        self.file_path = file_path
+        self.cache_dir = cache_dir
+        self.multi_output = multi_output
+        self.timer = timer or StageTimer()
+        self.n_cpus = os.cpu_count() or 1
+        targets = [None] if multi_output else TARGET_NAMES
+        self.tasks = [(name, target) for name in models_to_test for target in targets]
+        self.max_workers = max(1, min(max_workers or self.n_cpus, len(self.tasks), self.n_cpus))
+        self.threads_per_worker = max(1, self.n_cpus // self.max_workers)
+
+    def run(self):
+        """Runs all tasks and prints the usual evaluation report for each of them.
+
+        Returns:
+            dict: (model name, target name) -> metrics dictionary, or None if the dataset is missing.
+        """
+        with self.timer.stage('load'):
+            df = load_energy_dataset(self.file_path, self.cache_dir)
+        if df is None:
+            return None
+        with self.timer.stage('split'):
+            X_train, X_test, Y_train, Y_test = split_dataset(df)
+
+        print(f"\nRunning {len(self.tasks)} training tasks on {self.max_workers} worker processes "
+              f"({self.threads_per_worker} thread(s) each, {self.n_cpus} cores)...")
+        start = time.perf_counter()
+        results = {}
+        # Wall time of the whole pool; the per-task stages below come from the workers
+        with self.timer.stage('pool'), \
+                ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                    initargs=(X_train, X_test, Y_train, self.threads_per_worker)) as pool:
+            futures = []
+            for model_name, target_name in self.tasks:
+                model_class, params = self.models_to_test[model_name]
+                futures.append(pool.submit(_train_task, model_name, model_class, params,
+                                           target_name, self.threads_per_worker))
+            for future in as_completed(futures):
+                result = future.result()
+                results[(result['model_name'], result['target_name'])] = result
+                self.timer.add_records(result['stage_records'])
+        wall_seconds = time.perf_counter() - start
+
+        with self.timer.stage('metrics'):
+            metrics = self._report(df, X_test, Y_test, results)
+        task_seconds = sum(result['seconds'] for result in results.values())
+        print("\n" + "="*60)
+        print(f"Parallel wall-clock time: {wall_seconds:.2f}s "
+              f"(sum of task times {task_seconds:.2f}s, speed-up x{task_seconds / max(wall_seconds, 1e-9):.2f})")
+        print("="*60)
+        return metrics
+
+    def _report(self, df, X_test, Y_test, results):
+        """Prints results in the same order and format as the sequential evaluation."""
+        metrics = {}
+        for model_name, (model_class, params) in self.models_to_test.items():
+            evaluator = ModelEvaluator(model_class, model_name, self.file_path, df=df, **params)
+            evaluator.X_test = X_test
+            print("\n" + "="*60)
+            print(f"--- EVALUATING MODEL: {model_name} ---")
+            print("="*60)
+            for index, target_name in enumerate(TARGET_NAMES):
+                if self.multi_output:
+                    result = results[(model_name, None)]
+                    y_pred = result['y_pred'][:, index]
+                else:
+                    result = results[(model_name, target_name)]
+                    y_pred = result['y_pred']
+                if index > 0:
+                    print("\n" + "-"*40 + "\n")
+                print(f"--- Results for {target_name} (trained in {result['fit_seconds']:.2f}s) ---")
+                evaluator._print_evaluation_results(Y_test[target_name], y_pred, target_name)
+                metrics[(model_name, target_name)] = evaluator._compute_metrics(Y_test[target_name], y_pred)
+                if result['saved_to'] and (index == 0 or not self.multi_output):
+                    print(f"\nModel saved to '{result['saved_to']}'")
+        return metrics
+
+
+def run_parallel_evaluation(models_to_test, file_path, max_workers=None, multi_output=False,
+                            cache_dir=DATASET_CACHE_DIR, timer=None):
+    """Convenience wrapper used by main.py."""
+    runner = ParallelEvaluationRunner(models_to_test, file_path, max_workers, multi_output, cache_dir, timer)
+    return runner.run()
@@ -1,6 +1,11 @@
 #  1. Import Necessary Libraries
 # ==============================================================================
 import os
+import time
+import argparse
+import threading
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 import joblib
 # ==============================================================================
@@ -14,15 +19,27 @@ class EnergyLoadPredictor:
     energy loads based on user-provided building characteristics.
     """
 
-    def __init__(self, heating_model_path, cooling_model_path):
+    def __init__(self, heating_model_path=None, cooling_model_path=None, multi_output_model_path=None,
+                 lookup_table_path=None):
         """Initializes the predictor by loading the trained models.
 
+        Either the heating/cooling pair or a single multi-output model is used.
+
         Args:
             heating_model_path (str): The file path for the trained heating load model.
             cooling_model_path (str): The file path for the trained cooling load model.
+            multi_output_model_path (str, optional): The file path for a model trained on
+                both targets at once. When given, the two separate models are not loaded.
+            lookup_table_path (str, optional): Precomputed predictions over the discrete design
+                grid (built by main.py). On-grid inputs are answered from it without the models.
         """
-        self.heating_model = self._load_model(heating_model_path)
-        self.cooling_model = self._load_model(cooling_model_path)
+        self.registry = None
+        self._reload_thread = None
+        self._stop_reload = threading.Event()
+        self._models = _ModelSet()
+        if heating_model_path or cooling_model_path or multi_output_model_path:
+            self._models = self._load_model_set(heating_model_path, cooling_model_path,
+                                                multi_output_model_path, lookup_table_path)
         self.feature_names = [
             'Relative Compactness', 'Surface Area', 'Wall Area', 'Roof Area',
             'Overall Height', 'Orientation', 'Glazing Area', 'Glazing Area Distribution'
@@ -37,9 +54,109 @@ class EnergyLoadPredictor:
             ("Glazing Area (X7)", "0.0, 0.10, 0.25, or 0.40"),
             ("Glazing Area Distribution (X8)", "0 to 5"),
         ]
+        # Raw dataset headers accepted by the bulk mode in place of the full names
+        self.column_aliases = {
+            'X1': 'Relative Compactness', 'X2': 'Surface Area', 'X3': 'Wall Area',
+            'X4': 'Roof Area', 'X5': 'Overall Height', 'X6': 'Orientation',
+            'X7': 'Glazing Area', 'X8': 'Glazing Area Distribution'
+        }
+
+    @classmethod
+    def from_registry(cls, registry, hot_reload=True, poll_interval=2.0):
+        """Creates a predictor serving the current version of a `ModelRegistry`.
+
+        With `hot_reload`, a background thread watches the registry's current
+        pointer and swaps newer versions in without interrupting predictions.
+        """
+        predictor = cls()
+        predictor.registry = registry
+        version = registry.current_version()
+        if version is None:
+            print(f"Error: No model version has been published to '{registry.root}'.")
+            print("Please run 'python main.py' first to train and publish the models.")
+        else:
+            predictor._models = predictor._load_registry_version(version)
+        if hot_reload:
+            predictor.start_hot_reload(poll_interval)
+        return predictor
+
+    # The models are read through one `_ModelSet` reference, so a hot reload
+    # replaces all of them at once and a running prediction keeps its snapshot.
+    @property
+    def heating_model(self):
+        return self._models.heating_model
+
+    @property
+    def cooling_model(self):
+        return self._models.cooling_model
+
+    @property
+    def multi_output_model(self):
+        return self._models.multi_output_model
+
+    @property
+    def lookup_table(self):
+        return self._models.lookup_table
+
+    @property
+    def model_version(self):
+        """The registry version being served, or None for models loaded from fixed paths."""
+        return self._models.version
+
+    def _load_model_set(self, heating_model_path=None, cooling_model_path=None, multi_output_model_path=None,
+                        lookup_table_path=None, version=None):
+        """Loads either the heating/cooling pair or the multi-output model, plus the lookup table."""
+        if multi_output_model_path:
+            models = _ModelSet(multi_output_model=self._load_model(multi_output_model_path), version=version)
+            model_paths = [multi_output_model_path]
+        else:
+            models = _ModelSet(self._load_model(heating_model_path), self._load_model(cooling_model_path),
+                               version=version)
+            model_paths = [heating_model_path, cooling_model_path]
+        models.lookup_table = self._load_lookup_table(lookup_table_path, model_paths, models)
+        return models
+
+    def _load_registry_version(self, version):
+        """Loads every artifact of one registry version into a new `_ModelSet`."""
+        paths = self.registry.artifact_paths(version)
+        return self._load_model_set(paths.get('heating'), paths.get('cooling'), paths.get('multi_output'),
+                                    paths.get('lookup_table'), version=version)
+
+    def start_hot_reload(self, poll_interval=2.0):
+        """Starts the background thread that swaps in newly published registry versions."""
+        if self.registry is None:
+            raise RuntimeError("Hot reload needs a predictor created with `from_registry`.")
+        if self._reload_thread is not None:
+            return
+        self._stop_reload.clear()
+        self._reload_thread = threading.Thread(target=self._watch_registry, args=(poll_interval,),
+                                               name="model-hot-reload", daemon=True)
+        self._reload_thread.start()
+
+    def stop_hot_reload(self):
+        """Stops the hot-reload thread."""
+        if self._reload_thread is not None:
+            self._stop_reload.set()
+            self._reload_thread.join()
+            self._reload_thread = None
+
+    def _watch_registry(self, poll_interval):
+        """Polls the current pointer and loads a changed version off the request path."""
+        while not self._stop_reload.wait(poll_interval):
+            version = self.registry.current_version()
+            if version is None or version == self._models.version:
+                continue
+            try:
+                models = self._load_registry_version(version)
+            except Exception as e: # A broken version must not take the predictor down
+                print(f"Warning: Could not load model version '{version}': {e}")
+                continue
+            if models.loaded():
+                self._models = models # Single reference swap; in-flight calls keep the old set
+                print(f"Switched to model version '{version}'.")
 
     def _load_model(self, model_path):
-        """Loads a model from a .joblib file.
+        """Loads a model from a .joblib file, or a flattened tree ensemble from a .npz or .trees file.
 
         Args:
             model_path (str): The path to the model file.
@@ -52,8 +169,26 @@ class EnergyLoadPredictor:
             print(f"Error: Model file not found at '{model_path}'.")
             print("Please run 'python main.py' first to train and save the models.")
             return None
+        if model_path.endswith(('.npz', '.trees')):
+            from tree_export import load_ensemble # Pure-NumPy evaluator, see tree_export.py
+            return load_ensemble(model_path) # .trees files are memory-mapped and shared between processes
         return joblib.load(model_path)
 
+    def _load_lookup_table(self, table_path, model_paths, models):
+        """Loads the design-grid lookup table if it exists and matches the loaded models.
+
+        Returns:
+            PredictionLookupTable: The table, or None if it is missing or stale.
+        """
+        if not table_path or not os.path.exists(table_path) or not models.loaded():
+            return None
+        from lookup_table import PredictionLookupTable
+        table = PredictionLookupTable.load(table_path)
+        if not table.matches_models(model_paths):
+            print(f"Warning: '{table_path}' was built from different models and will be ignored.")
+            return None
+        return table
+
     def _get_user_input(self):
         """Prompts the user to enter the 8 building features with validation.
 
@@ -72,9 +207,17 @@ class EnergyLoadPredictor:
                     print("Invalid input. Please enter a number.")
         return user_inputs
 
-    def make_prediction(self):
-        """Orchestrates the user input and prediction process."""
-        if self.heating_model is None or self.cooling_model is None:
+    def models_loaded(self):
+        """Returns True when either the model pair or the multi-output model is available."""
+        return self._models.loaded()
+
+    def make_prediction(self, explain=False):
+        """Orchestrates the user input and prediction process.
+
+        Args:
+            explain (bool): Also show how much each feature contributed to both loads.
+        """
+        if not self.models_loaded():
             return # Stop if models weren't loaded
 
         # 1. Get input from the user
@@ -84,19 +227,218 @@ class EnergyLoadPredictor:
         input_df = pd.DataFrame([input_data], columns=self.feature_names)
 
         # 3. Make predictions
-        predicted_heating_load = self.heating_model.predict(input_df)[0]
-        predicted_cooling_load = self.cooling_model.predict(input_df)[0]
+        predicted_heating_load, predicted_cooling_load = self.predict_one(input_data)
 
         # 4. Display the results
-        self._display_predictions(predicted_heating_load, predicted_cooling_load, input_df)
+        explanation = self.explain_batch([input_data]) if explain else None
+        self._display_predictions(predicted_heating_load, predicted_cooling_load, input_df, explanation)
+
+    def predict_one(self, features):
+        """Predicts the loads of a single building, using the lookup table when it is on-grid.
+
+        Args:
+            features (list): The 8 feature values in `feature_names` order.
+
+        Returns:
+            tuple: The predicted (heating load, cooling load).
+        """
+        models = self._models
+        if models.lookup_table is not None:
+            cached = models.lookup_table.lookup(features)
+            if cached is not None:
+                return cached
+        heating, cooling = self._predict_with(models, [features])
+        return float(heating[0]), float(cooling[0])
+
+    def predict_batch(self, features):
+        """Predicts heating and cooling loads for many buildings in one call.
+
+        Args:
+            features (pd.DataFrame | np.ndarray): Either a DataFrame containing the
+                8 feature columns (full names or X1..X8) or a 2D array whose columns
+                follow `feature_names`.
+
+        Returns:
+            tuple: Two 1D numpy arrays (heating loads, cooling loads).
+        """
+        return self._predict_with(self._models, features)
+
+    def _predict_with(self, models, features):
+        """Scores `features` with one model set, so a concurrent swap cannot mix versions."""
+        if not models.loaded():
+            raise RuntimeError("Models are not loaded. Run 'python main.py' first.")
+        input_df = self._to_feature_frame(features)
+        if models.multi_output_model is not None:
+            # One call returns both columns: [heating, cooling]
+            predictions = np.asarray(models.multi_output_model.predict(input_df), dtype=np.float64)
+            return predictions[:, 0], predictions[:, 1]
+        heating = np.asarray(models.heating_model.predict(input_df), dtype=np.float64)
+        cooling = np.asarray(models.cooling_model.predict(input_df), dtype=np.float64)
+        return heating, cooling
+
+    def explain_batch(self, features, approximate=False):
+        """Returns per-feature contributions to the heating and cooling loads of many buildings.
+
+        Contributions come from XGBoost's native `pred_contribs` output
+        (TreeSHAP, or the faster Saabas approximation with `approximate`).
+        Each row's contributions plus its 'Bias' column add up to the
+        prediction. Duplicate rows in the batch are explained once, and rows
+        explained before are served from an LRU cache tied to the loaded
+        model version.
+
+        Args:
+            features (pd.DataFrame | np.ndarray): Same inputs as `predict_batch`.
+            approximate (bool): Use `approx_contribs` instead of exact SHAP values.
+
+        Returns:
+            tuple: Two DataFrames (heating, cooling) with one column per feature plus 'Bias'.
+
+        Raises:
+            RuntimeError: If no models are loaded.
+            TypeError: If the loaded models are not XGBoost models (e.g. exported `.npz` ensembles).
+        """
+        models = self._models
+        if not models.loaded():
+            raise RuntimeError("Models are not loaded. Run 'python main.py' first.")
+        values = self._to_feature_frame(features).to_numpy(dtype=np.float64)
+        unique_rows, inverse = np.unique(values, axis=0, return_inverse=True)
+        flag = b'a' if approximate else b'e'
+        keys = [flag + row.tobytes() for row in unique_rows]
+        contributions = models.explanations.get_many(keys)
+        missing = [index for index, cached in enumerate(contributions) if cached is None]
+        if missing:
+            fresh = self._native_contributions(models, unique_rows[missing], approximate)
+            models.explanations.put_many([keys[index] for index in missing], fresh)
+            for index, row in zip(missing, fresh):
+                contributions[index] = row
+        # Shape (rows, 2 targets, features + bias), expanded back to the original row order
+        contributions = np.stack(contributions)[np.asarray(inverse).reshape(-1)]
+        columns = self.feature_names + ['Bias']
+        return (pd.DataFrame(contributions[:, 0], columns=columns),
+                pd.DataFrame(contributions[:, 1], columns=columns))
+
+    def _native_contributions(self, models, rows, approximate):
+        """Runs XGBoost's contribution prediction on distinct rows.
+
+        Returns:
+            np.ndarray: Shape (rows, 2, features + 1) with heating and cooling contributions.
+        """
+        import xgboost as xgb # Only needed for explanations
+        boosters = []
+        for model in ([models.multi_output_model] if models.multi_output_model is not None
+                      else [models.heating_model, models.cooling_model]):
+            if hasattr(model, 'get_booster'):
+                boosters.append(model.get_booster())
+            elif isinstance(model, xgb.Booster):
+                boosters.append(model)
+            else:
+                raise TypeError(f"Explanations need XGBoost models; got '{type(model).__name__}'. "
+                                "Load the .joblib models instead of exported ensembles.")
+        dmatrix = xgb.DMatrix(pd.DataFrame(rows, columns=self.feature_names))
+        outputs = [np.asarray(booster.predict(dmatrix, pred_contribs=True, approx_contribs=approximate))
+                   for booster in boosters]
+        if len(outputs) == 1:
+            return outputs[0] # A multi-output booster already returns (rows, targets, features + 1)
+        return np.stack(outputs, axis=1)
+
+    def predict_file(self, input_path, output_path, chunk_size=100_000, cache_dir=None, explain=False):
+        """Scores a CSV or Parquet file chunk by chunk and streams the results out.
+
+        Only one chunk is held in memory at a time. The output keeps every input
+        column and appends the two predicted loads.
+
+        Args:
+            input_path (str): The CSV or Parquet file with building designs.
+            output_path (str): Destination file; '.parquet' writes Parquet, anything else CSV.
+            chunk_size (int): Number of rows scored per vectorized call.
+            cache_dir (str, optional): When set, CSV input is read from the memory-mapped
+                binary dataset cache (built on first use) instead of being re-parsed. The
+                cache only keeps feature and target columns and drops incomplete rows, so
+                inputs with other columns or missing values are refused.
+            explain (bool): Also append each feature's contribution to both loads.
 
-    def _display_predictions(self, heating_load, cooling_load, inputs):
+        Returns:
+            dict: Total rows, elapsed seconds and throughput in rows/s.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer.")
+        writer = _ChunkWriter(output_path)
+        total_rows = 0
+        start_time = time.perf_counter()
+        try:
+            for chunk in self._iter_input_chunks(input_path, chunk_size, cache_dir):
+                heating, cooling = self.predict_batch(chunk)
+                chunk = chunk.copy()
+                chunk['Predicted Heating Load'] = heating
+                chunk['Predicted Cooling Load'] = cooling
+                if explain:
+                    for label, contributions in zip(('Heating', 'Cooling'), self.explain_batch(chunk)):
+                        for name in contributions.columns:
+                            chunk[f"{label} Contribution: {name}"] = contributions[name].to_numpy()
+                writer.write(chunk)
+                total_rows += len(chunk)
+                elapsed = time.perf_counter() - start_time
+                print(f"  Scored {total_rows:,} rows ({total_rows / max(elapsed, 1e-9):,.0f} rows/s)")
+        finally:
+            writer.close()
+        elapsed = time.perf_counter() - start_time
+        return {
+            'rows': total_rows,
+            'seconds': elapsed,
+            'rows_per_second': total_rows / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def _iter_input_chunks(self, input_path, chunk_size, cache_dir=None):
+        """Yields DataFrame chunks of at most `chunk_size` rows from a CSV or Parquet file."""
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found at '{input_path}'.")
+        if cache_dir and input_path.lower().endswith('.csv'):
+            from dataset_cache import DatasetCache
+            # Same renames and targets as training, so both share one cache entry
+            renames = dict(self.column_aliases, Y1='Heating Load', Y2='Cooling Load')
+            targets = ['Heating Load', 'Cooling Load']
+            header = pd.read_csv(input_path, nrows=0).rename(columns=renames).columns
+            extra = [name for name in header if name not in self.feature_names and name not in targets]
+            if extra:
+                raise ValueError(f"The dataset cache would drop the columns {extra} of '{input_path}'; "
+                                 "score it without --dataset-cache instead.")
+            # Output rows must line up with input rows, so no row may be dropped either
+            data, columns = DatasetCache(cache_dir).load(
+                input_path, renames, self.feature_names, targets, require_complete=True)
+            for start in range(0, data.shape[0], chunk_size):
+                yield pd.DataFrame(data[start:start + chunk_size], columns=columns)
+        elif input_path.lower().endswith(('.parquet', '.pq')):
+            import pyarrow.parquet as pq # Optional dependency, only needed for Parquet
+            parquet_file = pq.ParquetFile(input_path)
+            for batch in parquet_file.iter_batches(batch_size=chunk_size):
+                yield batch.to_pandas()
+        else:
+            for chunk in pd.read_csv(input_path, chunksize=chunk_size):
+                yield chunk
+
+    def _to_feature_frame(self, features):
+        """Returns a float DataFrame with exactly the model's feature columns, in order."""
+        if isinstance(features, pd.DataFrame):
+            frame = features.rename(columns=self.column_aliases)
+            missing = [name for name in self.feature_names if name not in frame.columns]
+            if missing:
+                raise ValueError(f"Input is missing feature columns: {missing}")
+            return frame[self.feature_names].astype(np.float64)
+        values = np.asarray(features, dtype=np.float64)
+        if values.ndim == 1:
+            values = values.reshape(1, -1)
+        if values.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected {len(self.feature_names)} features per row, got {values.shape[1]}.")
+        return pd.DataFrame(values, columns=self.feature_names)
+
+    def _display_predictions(self, heating_load, cooling_load, inputs, explanation=None):
         """Prints the final predictions in a user-friendly format.
 
         Args:
             heating_load (float): The predicted heating load value.
             cooling_load (float): The predicted cooling load value.
             inputs (pd.DataFrame): The user's input values for reference.
+            explanation (tuple, optional): The (heating, cooling) contributions from `explain_batch`.
         """
         print("\n" + "="*50)
         print("--- Prediction Results ---")
@@ -106,23 +448,141 @@ class EnergyLoadPredictor:
         print("\n" + "-"*50)
         print(f"Predicted Heating Load (Y1): {heating_load:.2f}")
         print(f"Predicted Cooling Load (Y2): {cooling_load:.2f}")
+        if explanation is not None:
+            heating, cooling = explanation
+            table = pd.DataFrame({'Heating': heating.iloc[0], 'Cooling': cooling.iloc[0]})
+            print("\n" + "-"*50)
+            print("Contribution of each input (the rows add up to the predictions):")
+            print(table.to_string(float_format=lambda value: f"{value:+.2f}"))
         print("="*50)
 
+class _ContributionCache:
+    """A thread-safe LRU cache of per-row contribution arrays, keyed on the row's bytes."""
+
+    def __init__(self, max_rows=100_000):
+        self.max_rows = max_rows
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        """Returns the cached array for each key, or None where it is missing."""
+        with self._lock:
+            found = []
+            for key in keys:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+                found.append(value)
+            return found
+
+    def put_many(self, keys, values):
+        with self._lock:
+            for key, value in zip(keys, values):
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_rows:
+                self._entries.popitem(last=False)
+
+class _ModelSet:
+    """The models and lookup table of one version, replaced together on reload."""
+
+    def __init__(self, heating_model=None, cooling_model=None, multi_output_model=None, lookup_table=None,
+                 version=None):
+        self.heating_model = heating_model
+        self.cooling_model = cooling_model
+        self.multi_output_model = multi_output_model
+        self.lookup_table = lookup_table
+        self.version = version
+        self.explanations = _ContributionCache() # Dropped with the set, so a reload never serves stale ones
+
+    def loaded(self):
+        if self.multi_output_model is not None:
+            return True
+        return self.heating_model is not None and self.cooling_model is not None
+
+class _ChunkWriter:
+    """Appends DataFrame chunks to a CSV or Parquet file without keeping them in memory."""
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.is_parquet = output_path.lower().endswith(('.parquet', '.pq'))
+        self._parquet_writer = None
+        self._header_written = False
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+    def write(self, chunk):
+        """Writes one chunk to the output file."""
+        if self.is_parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.output_path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(self.output_path, mode='a' if self._header_written else 'w',
+                         header=not self._header_written, index=False)
+            self._header_written = True
+
+    def close(self):
+        """Flushes and closes the underlying Parquet writer, if any."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
 # ==============================================================================
 #  3. Main Execution Block for Prediction
 # ==============================================================================
+def parse_args():
+    """Parses command line options for interactive or bulk prediction."""
+    parser = argparse.ArgumentParser(description="Predict heating and cooling loads of buildings.")
+    parser.add_argument('--input', help="CSV or Parquet file to score in bulk (omit for interactive mode).")
+    parser.add_argument('--output', help="Where to write bulk predictions (.csv or .parquet).")
+    parser.add_argument('--chunk-size', type=int, default=100_000, help="Rows scored per vectorized call.")
+    parser.add_argument('--dataset-cache', nargs='?', const='.dataset_cache', default=None,
+                        help="Memory-map CSV input from the binary dataset cache (optionally give its directory). "
+                             "Only for inputs with just feature/target columns and no missing values.")
+    parser.add_argument('--heating-model', default=os.path.join('models', 'xgb_heating_model.joblib'))
+    parser.add_argument('--cooling-model', default=os.path.join('models', 'xgb_cooling_model.joblib'))
+    parser.add_argument('--multi-output-model',
+                        help="Use a single model trained on both targets (see 'python main.py --multi-output').")
+    parser.add_argument('--lookup-table', default=os.path.join('models', 'xgb_lookup_table.npz'),
+                        help="Precomputed design-grid predictions used for on-grid inputs (if the file exists).")
+    parser.add_argument('--registry', nargs='?', const=os.path.join('models', 'registry'), default=None,
+                        help="Serve the current version of the model registry instead of the fixed model paths.")
+    parser.add_argument('--explain', action='store_true',
+                        help="Show (or, with --input, append) each feature's contribution to both loads.")
+    args = parser.parse_args()
+    if args.input and not args.output:
+        parser.error("--output is required when --input is given.")
+    return args
+
 def main():
     """Main function to run the energy load predictor."""
+    args = parse_args()
     print("--- Energy Load Prediction Tool ---")
     print("This tool uses a pre-trained XGBoost model to predict energy loads.")
 
-    # Define the paths to the saved models
-    heating_model_file = os.path.join('models', 'xgb_heating_model.joblib')
-    cooling_model_file = os.path.join('models', 'xgb_cooling_model.joblib')
+    # Create a predictor instance from the saved models
+    if args.registry:
+        from model_registry import ModelRegistry
+        predictor = EnergyLoadPredictor.from_registry(ModelRegistry(args.registry), hot_reload=False)
+    else:
+        predictor = EnergyLoadPredictor(args.heating_model, args.cooling_model, args.multi_output_model,
+                                        args.lookup_table)
 
-    # Create a predictor instance and run it
-    predictor = EnergyLoadPredictor(heating_model_file, cooling_model_file)
-    predictor.make_prediction()
+    if args.input:
+        if not predictor.models_loaded():
+            return
+        print(f"\nScoring '{args.input}' in chunks of {args.chunk_size:,} rows...")
+        summary = predictor.predict_file(args.input, args.output, chunk_size=args.chunk_size,
+                                         cache_dir=args.dataset_cache, explain=args.explain)
+        print(f"\nWrote {summary['rows']:,} predictions to '{args.output}' "
+              f"in {summary['seconds']:.2f}s ({summary['rows_per_second']:,.0f} rows/s)")
+    else:
+        predictor.make_prediction(explain=args.explain)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
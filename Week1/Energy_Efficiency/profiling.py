@@ -0,0 +1,167 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# ==============================================================================
+#  2. Memory Helpers
+# ==============================================================================
+
+def peak_rss_mb():
+    """Returns the peak resident set size of this process in MB, or None where unsupported.
+
+    This is the high-water mark since the process started, so it never goes
+    down and cannot be attributed to the stage that was running when it is read.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None # Not available on Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+def current_rss_mb():
+    """Returns the current resident set size of this process in MB, or None where unsupported."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None # Only Linux exposes it without extra dependencies
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024.0 * 1024.0)
+
+# ==============================================================================
+#  3. Stage Timer
+# ==============================================================================
+
+class StageTimer:
+    """Records wall time, CPU time and peak memory of each pipeline stage.
+
+    Every record is tagged with the stage name and, where it applies, the
+    model and target it belongs to. CPU time covers all threads of the
+    process, so it exceeds wall time when a model trains on several cores.
+    Peak Python allocations are measured per stage only while `tracemalloc`
+    is enabled, because tracing slows every allocation down. Without it, the
+    change in resident memory over the stage is recorded where the platform
+    exposes it, next to the process's cumulative peak RSS so far.
+    """
+
+    def __init__(self, trace_memory=False):
+        """Initializes the timer.
+
+        Args:
+            trace_memory (bool): Start `tracemalloc` and record the peak traced memory of every stage.
+        """
+        self.trace_memory = trace_memory
+        self.records = []
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, model_name=None, target_name=None):
+        """Times the enclosed block as one stage."""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        rss_start = current_rss_mb()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                'stage': name,
+                'model': model_name,
+                'target': target_name,
+                'wall_s': time.perf_counter() - wall_start,
+                'cpu_s': time.process_time() - cpu_start,
+                'process_peak_rss_mb': peak_rss_mb(),
+            }
+            rss_end = current_rss_mb()
+            if rss_start is not None and rss_end is not None:
+                record['rss_delta_mb'] = rss_end - rss_start
+            if self.trace_memory:
+                record['peak_traced_mb'] = tracemalloc.get_traced_memory()[1] / (1024.0 * 1024.0)
+            self.records.append(record)
+
+    def add_records(self, records):
+        """Adds records measured by another `StageTimer`, e.g. one in a worker process."""
+        self.records.extend(records)
+
+    def totals(self):
+        """Returns stage name -> summed wall and CPU seconds over all models and targets."""
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record['stage'], {'wall_s': 0.0, 'cpu_s': 0.0, 'count': 0})
+            total['wall_s'] += record['wall_s']
+            total['cpu_s'] += record['cpu_s']
+            total['count'] += 1
+        return totals
+
+    def print_summary(self):
+        """Prints one line per recorded stage and the per-stage totals."""
+        if not self.records:
+            return
+        print("\n" + "="*60)
+        print("--- PIPELINE STAGE TIMINGS ---")
+        print("="*60)
+        for record in self.records:
+            label = " / ".join(part for part in (record['model'], record['target']) if part) or "-"
+            if 'peak_traced_mb' in record:
+                memory = f", peak traced {record['peak_traced_mb']:.1f} MB"
+            elif 'rss_delta_mb' in record:
+                memory = f", rss {record['rss_delta_mb']:+.1f} MB"
+            else:
+                memory = ""
+            print(f"  {record['stage']:<8} {label:<40} wall {record['wall_s']:8.3f}s  "
+                  f"cpu {record['cpu_s']:8.3f}s{memory}")
+        print("\nTotals per stage:")
+        for name, total in self.totals().items():
+            print(f"  {name:<8} wall {total['wall_s']:8.3f}s  cpu {total['cpu_s']:8.3f}s  ({total['count']} runs)")
+        peak = peak_rss_mb()
+        if peak is not None:
+            print(f"\nPeak RSS of the whole process so far (cumulative, not per stage): {peak:,.0f} MB")
+
+    def save(self, path, extra=None):
+        """Writes the records and totals to a JSON report."""
+        report = {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'trace_memory': self.trace_memory,
+            'process_peak_rss_mb': peak_rss_mb(),
+            'stages': self.records,
+            'totals': self.totals(),
+        }
+        report.update(extra or {})
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return path
+
+# ==============================================================================
+#  4. cProfile Capture
+# ==============================================================================
+
+@contextmanager
+def profile_capture(output_path, enabled=True, top=25):
+    """Runs the enclosed block under cProfile, saves the stats and prints the hottest functions.
+
+    The saved `.pstats` file can be explored with `python -m pstats` or snakeviz.
+    """
+    if not enabled:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        profiler.dump_stats(output_path)
+        print(f"\ncProfile stats saved to '{output_path}'. Top {top} functions by cumulative time:")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(top)
@@ -0,0 +1,283 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import os
+import json
+import time
+import queue
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from predict import EnergyLoadPredictor
+
+# ==============================================================================
+#  2. Micro-Batching Engine
+# ==============================================================================
+
+class _PendingRequest:
+    """A single-row request waiting for its batch to be scored."""
+
+    def __init__(self, features):
+        self.features = features
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """Groups concurrent single-row requests into micro-batches for one predict call.
+
+    A background thread takes the first waiting request, then keeps collecting
+    requests until either `max_batch_size` rows are queued or `max_wait_ms` has
+    passed, and scores the whole batch with a single `predict_batch` call.
+    """
+
+    def __init__(self, predictor, max_batch_size=64, max_wait_ms=5.0, stats_window=10_000):
+        """Initializes the batcher and starts its worker thread.
+
+        Args:
+            predictor (EnergyLoadPredictor): A predictor with both models loaded.
+            max_batch_size (int): The largest number of rows scored in one call.
+            max_wait_ms (float): How long the first request of a batch may wait for company.
+            stats_window (int): Number of recent requests and batches kept for statistics.
+        """
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be a positive integer.")
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=stats_window)
+        self._batch_sizes = deque(maxlen=stats_window)
+        self._stats_lock = threading.Lock()
+        self._total_requests = 0
+        self._total_batches = 0
+        self._stopped = False
+        self._stop_lock = threading.Lock() # Orders submissions against the stop signal
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, features, timeout=None):
+        """Queues one building and blocks until its prediction is ready.
+
+        Args:
+            features (list): The 8 feature values in `feature_names` order.
+            timeout (float, optional): Seconds to wait before giving up.
+
+        Returns:
+            tuple: The predicted (heating load, cooling load).
+
+        Raises:
+            RuntimeError: If `stop` has been called; nothing would serve the request.
+        """
+        request = _PendingRequest(features)
+        with self._stop_lock:
+            # Checked and queued atomically, so no request lands behind the stop signal
+            if self._stopped:
+                raise RuntimeError("The micro-batcher has been stopped.")
+            self._queue.put(request)
+        if not request.done.wait(timeout):
+            raise TimeoutError("Prediction timed out.")
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def stop(self):
+        """Stops the worker thread once the queued requests have been served."""
+        with self._stop_lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._queue.put(None)
+        self._worker.join()
+
+    def _collect_batch(self, first):
+        """Gathers requests after `first` until the batch is full or the wait expires."""
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None) # Let the main loop see the stop signal
+                break
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        """Worker loop: collect a batch, score it once, and wake up every caller."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect_batch(first)
+            try:
+                features = np.array([request.features for request in batch], dtype=np.float64)
+                heating, cooling = self.predictor.predict_batch(features)
+                for request, heating_load, cooling_load in zip(batch, heating, cooling):
+                    request.result = (float(heating_load), float(cooling_load))
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+            finished_at = time.perf_counter()
+            with self._stats_lock:
+                self._batch_sizes.append(len(batch))
+                self._total_batches += 1
+                self._total_requests += len(batch)
+                for request in batch:
+                    self._latencies.append(finished_at - request.enqueued_at)
+            for request in batch:
+                request.done.set()
+
+    def stats(self):
+        """Returns latency percentiles and batch-size statistics over the recent window.
+
+        Returns:
+            dict: Request and batch counts, p50/p99 latency in ms and batch-size summary.
+        """
+        with self._stats_lock:
+            latencies = np.array(self._latencies, dtype=np.float64) * 1000.0
+            batch_sizes = np.array(self._batch_sizes, dtype=np.float64)
+            total_requests, total_batches = self._total_requests, self._total_batches
+        if latencies.size == 0:
+            return {'requests': 0, 'batches': 0}
+        return {
+            'requests': total_requests,
+            'batches': total_batches,
+            'latency_p50_ms': float(np.percentile(latencies, 50)),
+            'latency_p99_ms': float(np.percentile(latencies, 99)),
+            'latency_max_ms': float(latencies.max()),
+            'batch_size_mean': float(batch_sizes.mean()),
+            'batch_size_p50': float(np.percentile(batch_sizes, 50)),
+            'batch_size_max': int(batch_sizes.max()),
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+        }
+
+# ==============================================================================
+#  3. HTTP Interface
+# ==============================================================================
+
+class PredictionRequestHandler(BaseHTTPRequestHandler):
+    """Serves POST /predict, GET /stats and GET /health as JSON."""
+
+    batcher = None # Set by `create_server`
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok', 'model_version': self.batcher.predictor.model_version})
+        elif self.path == '/stats':
+            self._send_json(200, self.batcher.stats())
+        else:
+            self._send_json(404, {'error': f"Unknown path '{self.path}'."})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send_json(404, {'error': f"Unknown path '{self.path}'."})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            features = self._parse_features(payload)
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        try:
+            # On-grid designs are answered straight from the lookup table
+            lookup_table = self.batcher.predictor.lookup_table
+            cached = lookup_table and lookup_table.lookup(features)
+            heating_load, cooling_load = cached or self.batcher.submit(features)
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+        self._send_json(200, {'heating_load': heating_load, 'cooling_load': cooling_load})
+
+    def _parse_features(self, payload):
+        """Accepts either a list of 8 numbers or a mapping of feature name (or X1..X8) to value."""
+        predictor = self.batcher.predictor
+        features = payload.get('features') if isinstance(payload, dict) else None
+        if isinstance(features, dict):
+            named = {predictor.column_aliases.get(key, key): value for key, value in features.items()}
+            missing = [name for name in predictor.feature_names if name not in named]
+            if missing:
+                raise ValueError(f"Missing features: {missing}")
+            features = [named[name] for name in predictor.feature_names]
+        if not isinstance(features, list) or len(features) != len(predictor.feature_names):
+            raise ValueError(f"'features' must hold {len(predictor.feature_names)} values.")
+        return [float(value) for value in features]
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass # Per-request logging would dominate the latency we are measuring
+
+
+def create_server(predictor, host='127.0.0.1', port=8000, max_batch_size=64, max_wait_ms=5.0):
+    """Builds a threaded HTTP server whose requests share one micro-batcher.
+
+    Returns:
+        tuple: The (ThreadingHTTPServer, MicroBatcher) pair.
+    """
+    batcher = MicroBatcher(predictor, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    handler = type('BoundPredictionRequestHandler', (PredictionRequestHandler,), {'batcher': batcher})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, batcher
+
+# ==============================================================================
+#  4. Main Execution Block for the Server
+# ==============================================================================
+def main():
+    """Loads both models once and serves predictions until interrupted."""
+    parser = argparse.ArgumentParser(description="Resident HTTP inference server for the energy models.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--heating-model', default=os.path.join('models', 'xgb_heating_model.joblib'))
+    parser.add_argument('--cooling-model', default=os.path.join('models', 'xgb_cooling_model.joblib'))
+    parser.add_argument('--multi-output-model', help="Serve a single model trained on both targets.")
+    parser.add_argument('--lookup-table', default=os.path.join('models', 'xgb_lookup_table.npz'))
+    parser.add_argument('--registry', nargs='?', const=os.path.join('models', 'registry'), default=None,
+                        help="Serve the registry's current version and hot-reload newly published ones.")
+    parser.add_argument('--reload-interval', type=float, default=2.0,
+                        help="Seconds between checks for a new registry version.")
+    args = parser.parse_args()
+
+    if args.registry:
+        from model_registry import ModelRegistry
+        predictor = EnergyLoadPredictor.from_registry(ModelRegistry(args.registry), poll_interval=args.reload_interval)
+    else:
+        predictor = EnergyLoadPredictor(args.heating_model, args.cooling_model, args.multi_output_model,
+                                        args.lookup_table)
+    if not predictor.models_loaded():
+        predictor.stop_hot_reload()
+        return
+    server, batcher = create_server(predictor, args.host, args.port, args.max_batch_size, args.max_wait_ms)
+    print(f"--- Energy Load Inference Server listening on http://{args.host}:{args.port} ---")
+    print(f"Micro-batching: up to {args.max_batch_size} rows or {args.max_wait_ms} ms per batch.")
+    print("POST /predict {\"features\": [...]}, GET /stats, GET /health. Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.stop()
+        predictor.stop_hot_reload()
+        print(f"\nFinal stats: {json.dumps(batcher.stats(), indent=2)}")
+
+if __name__ == '__main__':
+    main()
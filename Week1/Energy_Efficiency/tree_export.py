@@ -0,0 +1,415 @@
+# ==============================================================================
+#  1. Import Necessary Libraries
+# ==============================================================================
+import os
+import json
+import time
+import argparse
+import numpy as np
+
+# Rows scored together; bounds the (rows x trees x outputs) working arrays
+DEFAULT_BLOCK_ROWS = 4096
+# Packed single-file format: magic, little-endian uint64 header length, JSON header, aligned buffers
+PACKED_MAGIC = b'TREEPACK'
+PACKED_FORMAT_VERSION = 1
+PACKED_ALIGNMENT = 64
+# Arrays stored as raw buffers in a packed file, with their on-disk dtype
+PACKED_ARRAYS = {
+    'feature': np.int32, 'threshold': np.float32, 'left': np.int32, 'right': np.int32,
+    'default_left': np.bool_, 'value': np.float32, 'roots': np.int32,
+}
+
+# ==============================================================================
+#  2. Flattened Tree Ensemble
+# ==============================================================================
+
+class TreeEnsemble:
+    """A tree ensemble flattened into contiguous arrays and scored with pure NumPy.
+
+    All trees share one set of node arrays (feature index, threshold,
+    left/right child, missing-value direction and leaf value). Leaves point
+    to themselves, so every row can be walked down every tree at the same
+    time for `max_depth` steps without per-tree Python loops. The result is
+    `base_score + scale * sum(leaf values)`: XGBoost sums its trees
+    (`scale=1`), while a RandomForest averages them (`scale=1/n_trees`).
+    """
+
+    def __init__(self, feature, threshold, left, right, default_left, value, roots,
+                 base_score, scale, comparison, max_depth, feature_names=None):
+        """Initializes the ensemble from its flattened arrays.
+
+        Args:
+            feature (np.ndarray): int32 split feature per node (0 for leaves).
+            threshold (np.ndarray): float32 split threshold per node.
+            left, right (np.ndarray): int32 global index of each node's children (self for leaves).
+            default_left (np.ndarray): bool, where missing (NaN) values go at each node.
+            value (np.ndarray): float32 or float64 leaf values of shape (n_nodes, n_outputs); 0 for internal nodes.
+            roots (np.ndarray): int32 global index of each tree's root.
+            base_score (np.ndarray): float64 offset per output.
+            scale (float): Factor applied to the summed leaf values.
+            comparison (str): 'lt' if `x < threshold` goes left (XGBoost), 'le' for `x <= threshold` (scikit-learn).
+            max_depth (int): Depth of the deepest tree.
+            feature_names (list, optional): Feature order the trees were trained with.
+        """
+        if comparison not in ('lt', 'le'):
+            raise ValueError("comparison must be 'lt' or 'le'.")
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float32)
+        self.left = np.ascontiguousarray(left, dtype=np.int32)
+        self.right = np.ascontiguousarray(right, dtype=np.int32)
+        self.default_left = np.ascontiguousarray(default_left, dtype=bool)
+        # float32 leaves (packed files) are used as they are, so memory-mapped buffers are never copied
+        value_dtype = np.float32 if np.asarray(value).dtype == np.float32 else np.float64
+        self.value = np.ascontiguousarray(value, dtype=value_dtype)
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.base_score = np.ascontiguousarray(base_score, dtype=np.float64)
+        self.scale = float(scale)
+        self.comparison = comparison
+        self.max_depth = int(max_depth)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+
+    @property
+    def n_outputs(self):
+        return self.value.shape[1]
+
+    @property
+    def n_trees(self):
+        return self.roots.shape[0]
+
+    def predict(self, X, block_rows=DEFAULT_BLOCK_ROWS):
+        """Scores any number of rows, vectorized across rows and trees.
+
+        Args:
+            X (np.ndarray | pd.DataFrame | list): Rows of features in `feature_names` order.
+            block_rows (int): Rows scored per block, to bound memory on large inputs.
+
+        Returns:
+            np.ndarray: Shape (n_rows,) for single-output ensembles, else (n_rows, n_outputs).
+        """
+        if hasattr(X, 'to_numpy'):
+            X = X.to_numpy()
+        # Both XGBoost and scikit-learn compare features in float32
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_rows = X.shape[0]
+        out = np.empty((n_rows, self.n_outputs), dtype=np.float64)
+        for start in range(0, n_rows, block_rows):
+            stop = min(start + block_rows, n_rows)
+            out[start:stop] = self._predict_block(X[start:stop])
+        return out[:, 0] if self.n_outputs == 1 else out
+
+    def _predict_block(self, X):
+        """Walks every row of `X` down every tree at once."""
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.repeat(self.roots[None, :], X.shape[0], axis=0)
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            if self.comparison == 'lt':
+                go_left = x < self.threshold[nodes]
+            else:
+                go_left = x <= self.threshold[nodes]
+            missing = np.isnan(x)
+            if missing.any():
+                go_left = np.where(missing, self.default_left[nodes], go_left)
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.base_score + self.scale * self.value[nodes].sum(axis=1, dtype=np.float64)
+
+    def to_arrays(self):
+        """Returns the ensemble as a dict of plain NumPy arrays (no Python objects)."""
+        return {
+            'feature': self.feature, 'threshold': self.threshold, 'left': self.left,
+            'right': self.right, 'default_left': self.default_left, 'value': self.value,
+            'roots': self.roots, 'base_score': self.base_score,
+            'scale': np.array(self.scale), 'max_depth': np.array(self.max_depth),
+            'comparison': np.array(self.comparison),
+            'feature_names': np.array(self.feature_names or [], dtype=str),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Rebuilds an ensemble from the dict produced by `to_arrays`."""
+        feature_names = [str(name) for name in arrays['feature_names']] or None
+        return cls(arrays['feature'], arrays['threshold'], arrays['left'], arrays['right'],
+                   arrays['default_left'], arrays['value'], arrays['roots'], arrays['base_score'],
+                   float(arrays['scale']), str(arrays['comparison']), int(arrays['max_depth']),
+                   feature_names)
+
+    def save(self, path):
+        """Writes the ensemble to an uncompressed .npz file that loads without pickle, replacing it atomically."""
+        tmp_path = f"{os.path.splitext(path)[0]}.tmp-{os.getpid()}.npz" # np.savez appends '.npz' otherwise
+        np.savez(tmp_path, **self.to_arrays())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Loads an ensemble saved with `save`."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls.from_arrays({key: data[key] for key in data.files})
+
+    def save_packed(self, path):
+        """Writes the ensemble to a single `.trees` file that `load_packed` memory-maps.
+
+        The node arrays are stored as raw little-endian int32/float32/bool
+        buffers, each aligned to 64 bytes, after a small JSON header. Leaf
+        values are stored as float32 (XGBoost's own precision).
+        """
+        arrays = {name: np.ascontiguousarray(getattr(self, name), dtype=np.dtype(dtype).newbyteorder('<'))
+                  for name, dtype in PACKED_ARRAYS.items()}
+        header = {
+            'format_version': PACKED_FORMAT_VERSION,
+            'base_score': self.base_score.tolist(),
+            'scale': self.scale,
+            'comparison': self.comparison,
+            'max_depth': self.max_depth,
+            'feature_names': self.feature_names,
+            'arrays': {},
+        }
+        # Offsets depend on the header size, which depends on the offsets: reserve room and pad
+        header_size = len(json.dumps(header)) + 128 * len(arrays)
+        offset = _align(len(PACKED_MAGIC) + 8 + header_size)
+        for name, array in arrays.items():
+            header['arrays'][name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+            offset = _align(offset + array.nbytes)
+        header_bytes = json.dumps(header).encode('utf-8')
+        if len(header_bytes) > header_size:
+            raise ValueError("Packed header does not fit in its reserved space.")
+        header_bytes = header_bytes.ljust(header_size)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            f.write(PACKED_MAGIC + len(header_bytes).to_bytes(8, 'little') + header_bytes)
+            for name, array in arrays.items():
+                f.write(b'\0' * (header['arrays'][name]['offset'] - f.tell()))
+                f.write(array.tobytes())
+        # Workers that mapped the old file keep reading it until they reload
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_packed(cls, path):
+        """Memory-maps a `.trees` file read-only; the node arrays are views into the mapping.
+
+        Loading reads only the header, and every process that maps the same
+        file shares one copy of it in the OS page cache.
+        """
+        buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        if bytes(buffer[:len(PACKED_MAGIC)]) != PACKED_MAGIC:
+            raise ValueError(f"'{path}' is not a packed tree ensemble.")
+        start = len(PACKED_MAGIC) + 8
+        header_length = int.from_bytes(bytes(buffer[len(PACKED_MAGIC):start]), 'little')
+        header = json.loads(bytes(buffer[start:start + header_length]).decode('utf-8'))
+        if header['format_version'] != PACKED_FORMAT_VERSION:
+            raise ValueError(f"Unsupported packed format version {header['format_version']}.")
+        arrays = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape'], dtype=np.int64))
+            arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=spec['offset']).reshape(spec['shape'])
+        return cls(arrays['feature'], arrays['threshold'], arrays['left'], arrays['right'],
+                   arrays['default_left'], arrays['value'], arrays['roots'], header['base_score'],
+                   header['scale'], header['comparison'], header['max_depth'], header['feature_names'])
+
+
+def _align(offset):
+    """Rounds `offset` up to the packed format's buffer alignment."""
+    return -(-offset // PACKED_ALIGNMENT) * PACKED_ALIGNMENT
+
+def load_ensemble(path):
+    """Loads a `.trees` file memory-mapped, or a `.npz` file into memory."""
+    if path.endswith('.trees'):
+        return TreeEnsemble.load_packed(path)
+    return TreeEnsemble.load(path)
+
+# ==============================================================================
+#  3. Exporters
+# ==============================================================================
+
+def _float32_at_most(threshold):
+    """Largest float32 <= each float64 threshold, so `x <= t` is unchanged for float32 x."""
+    rounded = threshold.astype(np.float32)
+    too_big = rounded.astype(np.float64) > threshold
+    rounded[too_big] = np.nextafter(rounded[too_big], np.float32(-np.inf))
+    return rounded
+
+def _tree_depth(left, right, root):
+    """Returns the depth of the tree rooted at `root` (a lone leaf has depth 0)."""
+    depth, frontier = 0, [root]
+    while True:
+        children = [child for node in frontier for child in (left[node], right[node]) if child != node]
+        if not children:
+            return depth
+        depth, frontier = depth + 1, children
+
+def _parse_base_score(value):
+    """Parses XGBoost's base_score, stored as '5E-1' or, for several targets, '[5E-1,2E1]'."""
+    return [float(part) for part in str(value).strip('[]').split(',') if part.strip()]
+
+def export_xgboost(model):
+    """Flattens a trained XGBRegressor (or Booster) into a `TreeEnsemble`.
+
+    Supports gbtree boosters with the squared-error objective, including
+    multi-output models built with one output per tree. When the model used
+    early stopping, every stored tree is exported, as `Booster.predict` does.
+    """
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    learner = json.loads(bytes(booster.save_raw(raw_format='json')))['learner']
+    if learner['gradient_booster']['name'] != 'gbtree':
+        raise NotImplementedError("Only gbtree boosters can be exported.")
+    objective = learner['objective']['name']
+    if objective not in ('reg:squarederror', 'reg:linear'):
+        raise NotImplementedError(f"Objective '{objective}' is not supported (needs an identity link).")
+    params = learner['learner_model_param']
+    n_outputs = max(int(params.get('num_target', 1)), int(params.get('num_class', 0)) or 1)
+    base_score = _parse_base_score(params['base_score'])
+    if len(base_score) == 1:
+        base_score = base_score * n_outputs
+    gbtree = learner['gradient_booster']['model']
+    trees, tree_info = gbtree['trees'], gbtree['tree_info']
+
+    features, thresholds, lefts, rights, defaults, values, roots = [], [], [], [], [], [], []
+    offset, max_depth = 0, 0
+    for tree, output in zip(trees, tree_info):
+        if int(tree['tree_param'].get('size_leaf_vector', 1)) > 1:
+            raise NotImplementedError("Multi-target trees (multi_strategy='multi_output_tree') are not supported.")
+        left = np.asarray(tree['left_children'], dtype=np.int64)
+        right = np.asarray(tree['right_children'], dtype=np.int64)
+        is_leaf = left == -1
+        local = np.arange(len(left))
+        left = np.where(is_leaf, local, left)
+        right = np.where(is_leaf, local, right)
+        split_conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        value = np.zeros((len(left), n_outputs), dtype=np.float64)
+        value[is_leaf, output] = split_conditions[is_leaf] # Leaves keep their weight in split_conditions
+        features.append(np.where(is_leaf, 0, np.asarray(tree['split_indices'], dtype=np.int64)))
+        thresholds.append(np.where(is_leaf, np.float32(0), split_conditions))
+        lefts.append(left + offset)
+        rights.append(right + offset)
+        defaults.append(np.asarray(tree['default_left'], dtype=bool))
+        values.append(value)
+        roots.append(offset)
+        max_depth = max(max_depth, _tree_depth(left, right, 0))
+        offset += len(left)
+
+    return TreeEnsemble(
+        np.concatenate(features), np.concatenate(thresholds), np.concatenate(lefts),
+        np.concatenate(rights), np.concatenate(defaults), np.concatenate(values), np.array(roots),
+        base_score, 1.0, 'lt', max_depth, booster.feature_names)
+
+def export_sklearn_forest(model):
+    """Flattens a trained RandomForestRegressor (or single DecisionTreeRegressor) into a `TreeEnsemble`."""
+    estimators = getattr(model, 'estimators_', [model])
+    features, thresholds, lefts, rights, defaults, values, roots = [], [], [], [], [], [], []
+    offset, max_depth = 0, 0
+    for estimator in estimators:
+        tree = estimator.tree_
+        left = tree.children_left.astype(np.int64)
+        right = tree.children_right.astype(np.int64)
+        is_leaf = left == -1
+        local = np.arange(tree.node_count)
+        left = np.where(is_leaf, local, left)
+        right = np.where(is_leaf, local, right)
+        value = np.where(is_leaf[:, None], tree.value[:, :, 0], 0.0)
+        missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=bool))
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, np.float32(0), _float32_at_most(tree.threshold)))
+        lefts.append(left + offset)
+        rights.append(right + offset)
+        defaults.append(np.asarray(missing_left, dtype=bool))
+        values.append(value)
+        roots.append(offset)
+        max_depth = max(max_depth, int(tree.max_depth))
+        offset += tree.node_count
+
+    n_outputs = values[0].shape[1]
+    return TreeEnsemble(
+        np.concatenate(features), np.concatenate(thresholds), np.concatenate(lefts),
+        np.concatenate(rights), np.concatenate(defaults), np.concatenate(values), np.array(roots),
+        np.zeros(n_outputs), 1.0 / len(estimators), 'le', max_depth,
+        getattr(model, 'feature_names_in_', None))
+
+def export_model(model):
+    """Flattens an XGBoost or scikit-learn tree model into a `TreeEnsemble`."""
+    if hasattr(model, 'get_booster') or type(model).__name__ == 'Booster':
+        return export_xgboost(model)
+    if hasattr(model, 'estimators_') or hasattr(model, 'tree_'):
+        return export_sklearn_forest(model)
+    raise TypeError(f"Cannot export model of type '{type(model).__name__}'; only tree ensembles are supported.")
+
+# ==============================================================================
+#  4. Validation and Benchmark
+# ==============================================================================
+
+def validate_ensemble(model, ensemble, X, rtol=1e-5, atol=1e-4):
+    """Checks that the ensemble reproduces the original model's predictions.
+
+    Returns:
+        float: The largest absolute difference between the two predictions.
+
+    Raises:
+        AssertionError: If any prediction differs by more than the tolerances.
+    """
+    expected = np.asarray(model.predict(X), dtype=np.float64)
+    actual = ensemble.predict(X)
+    max_diff = float(np.max(np.abs(expected - actual))) if expected.size else 0.0
+    if not np.allclose(expected, actual, rtol=rtol, atol=atol):
+        raise AssertionError(f"Exported ensemble differs from the original model (max |diff| = {max_diff:.3g}).")
+    return max_diff
+
+def benchmark_latency(model, ensemble, X, repeats=200):
+    """Times single-row and full-batch prediction for the original model and the ensemble.
+
+    Returns:
+        dict: Latencies in milliseconds for both implementations.
+    """
+    single_row = X.iloc[[0]] if hasattr(X, 'iloc') else X[:1]
+    results = {}
+    for name, predictor in (('original', model), ('numpy', ensemble)):
+        predictor.predict(single_row) # Warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            predictor.predict(single_row)
+        single_ms = (time.perf_counter() - start) / repeats * 1000.0
+        start = time.perf_counter()
+        predictor.predict(X)
+        batch_ms = (time.perf_counter() - start) * 1000.0
+        results[name] = {'single_row_ms': single_ms, 'batch_ms': batch_ms, 'batch_rows': len(X)}
+    return results
+
+# ==============================================================================
+#  5. Main Execution Block
+# ==============================================================================
+def main():
+    """Exports a .joblib tree model, validates it against the original and benchmarks both."""
+    import joblib
+    from main import load_energy_dataset, FEATURE_NAMES
+
+    parser = argparse.ArgumentParser(description="Flatten a trained tree ensemble for pure-NumPy scoring.")
+    parser.add_argument('--model', default=os.path.join('models', 'xgb_heating_model.joblib'))
+    parser.add_argument('--output', help="Destination .npz or .trees file (default: next to the model).")
+    parser.add_argument('--format', choices=['npz', 'trees'], default='npz',
+                        help="'trees' writes the packed file that serving workers memory-map and share.")
+    parser.add_argument('--data', default='energy-efficiency-dataset.csv', help="Rows used for validation.")
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    ensemble = export_model(model)
+    output = args.output or os.path.splitext(args.model)[0] + f'.{args.format}'
+    if output.endswith('.trees'):
+        ensemble.save_packed(output)
+        ensemble = TreeEnsemble.load_packed(output) # Validate what the workers will actually map
+    else:
+        ensemble.save(output)
+    print(f"Exported {ensemble.n_trees} trees (max depth {ensemble.max_depth}) to '{output}'")
+
+    df = load_energy_dataset(args.data, cache_dir=None)
+    if df is None:
+        return
+    X = df[FEATURE_NAMES]
+    max_diff = validate_ensemble(model, ensemble, X)
+    print(f"Validated on {len(X)} rows: max |difference| = {max_diff:.3g}")
+    for name, timing in benchmark_latency(model, ensemble, X, args.repeats).items():
+        print(f"  {name:>8}: single row {timing['single_row_ms']:.3f} ms, "
+              f"{timing['batch_rows']} rows {timing['batch_ms']:.2f} ms")
+
+if __name__ == '__main__':
+    main()
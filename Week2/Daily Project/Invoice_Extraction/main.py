@@ -16,6 +16,10 @@ print("-" * 70)
 # Install Python packages
 #pip install -q pytesseract pillow opencv-python pydantic pyyaml python-dotenv loguru python-dateutil
 
+# Optional: warm in-process Tesseract engines (ocr.default_provider: "tesseract_pool")
+#apt-get install -y libtesseract-dev libleptonica-dev > /dev/null 2>&1
+#pip install -q tesserocr
+
 # Install PDF support
 #apt-get install -y poppler-utils > /dev/null 2>&1
 #pip install -q pdf2image
@@ -58,7 +62,13 @@ print("-" * 70)
 
 config_yaml = """
 ocr:
-  default_provider: "tesseract"
+  default_provider: "tesseract"  # or "tesseract_pool" (warm in-process engines, needs tesserocr)
+  single_pass: true
+  pool_size: null
+  cache:
+    enabled: true
+    directory: "data/cache/ocr"
+    max_size_mb: 512
   preprocessing:
     enabled: true
     grayscale: true
@@ -70,6 +80,13 @@ extraction:
   method: "rule_based"
   confidence_threshold: 0.7
 
+pdf:
+  dpi: 300
+  max_workers: null
+  multi_page: false
+  text_layer: true
+  min_text_chars: 20
+
 validation:
   enabled: true
 """
@@ -147,6 +164,7 @@ class InvoiceData(BaseModel):
     raw_text: Optional[str] = None
     errors: List[str] = []
     warnings: List[str] = []
+    page_metrics: List[dict] = []
 
     def to_dict(self, include_raw: bool = False):
         data = self.model_dump()
@@ -275,10 +293,58 @@ import pytesseract
 from PIL import Image
 from src.ocr.base_ocr import BaseOCRProvider, OCRResult
 
+def layout_to_text(data):
+    # Rebuilds image_to_string-style text from image_to_data output: words joined
+    # by spaces, lines by a newline and paragraphs/blocks by a blank line
+    parts = []
+    previous = None
+    for i, word in enumerate(data['text']):
+        if not word or not word.strip():
+            continue
+        position = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        if previous is not None:
+            if position[:2] != previous[:2]:
+                parts.append("\\n\\n")
+            elif position != previous:
+                parts.append("\\n")
+            else:
+                parts.append(" ")
+        parts.append(word)
+        previous = position
+    return "".join(parts)
+
+def layout_words(data):
+    words = []
+    for i, word in enumerate(data['text']):
+        if not word or not word.strip():
+            continue
+        words.append({
+            "text": word,
+            "confidence": float(data['conf'][i]),
+            "left": int(data['left'][i]),
+            "top": int(data['top'][i]),
+            "width": int(data['width'][i]),
+            "height": int(data['height'][i]),
+            "block": int(data['block_num'][i]),
+            "paragraph": int(data['par_num'][i]),
+            "line": int(data['line_num'][i]),
+        })
+    return words
+
+def result_from_data(data, provider="Tesseract"):
+    words = layout_words(data)
+    confidences = [word["confidence"] for word in words if word["confidence"] > 0]
+    avg_confidence = sum(confidences) / len(confidences) / 100.0 if confidences else 0.0
+    metadata = {"word_count": len(confidences), "words": words, "single_pass": True}
+    return OCRResult(layout_to_text(data), avg_confidence, metadata, 0, provider)
+
 class TesseractOCR(BaseOCRProvider):
     def __init__(self, config=None):
         super().__init__(config)
         self.language = 'eng'
+        # One image_to_data call yields text, confidences and word boxes; the
+        # two-call mode runs recognition twice and is kept for comparison
+        self.single_pass = self.config.get('single_pass', True)
     
     def is_available(self):
         try:
@@ -292,6 +358,10 @@ class TesseractOCR(BaseOCRProvider):
             return OCRResult("", 0.0, {"error": "Invalid image"}, 0, "Tesseract")
         
         try:
+            if self.single_pass:
+                data = pytesseract.image_to_data(image, lang=self.language, output_type=pytesseract.Output.DICT)
+                return result_from_data(data)
+            
             text = pytesseract.image_to_string(image, lang=self.language)
             data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
             confidences = [float(c) for c in data['conf'] if int(c) > 0]
@@ -314,13 +384,15 @@ from dateutil import parser as date_parser
 from src.models.invoice_model import InvoiceData, VendorInfo, CustomerInfo, ProductItem, CurrencyType
 
 class ImprovedExtractor:
-    def extract(self, text):
+    def extract(self, text, products=None):
+        # Line items already collected elsewhere (e.g. per PDF page) are passed in and not searched again
         invoice_number = self._extract_invoice_number(text)
         invoice_date = self._extract_invoice_date(text)
         amounts = self._extract_amounts(text)
         vendor = self._extract_vendor(text)
         customer = self._extract_customer(text)
-        products = self._extract_products(text)
+        if products is None:
+            products = self._extract_products(text)
         
         invoice = InvoiceData(
             invoice_number=invoice_number,
@@ -506,6 +578,9 @@ class ImprovedExtractor:
         
         return customer if customer.customer_name else None
     
+    def extract_products(self, text):
+        return self._extract_products(text)
+    
     def _extract_products(self, text):
         products = []
         lines = text.split('\\n')
@@ -554,7 +629,8 @@ from pathlib import Path
 from PIL import Image
 import io
 from src.models.invoice_model import InvoiceData, ExtractionResult, ExtractionStatus
-from src.ocr.tesseract_ocr import TesseractOCR
+from src.ocr.provider_factory import create_ocr_provider
+from src.ocr.ocr_cache import get_ocr_cache
 from src.extractors.rule_based_extractor import ImprovedExtractor
 from src.utils.image_preprocessor import ImagePreprocessor
 
@@ -562,7 +638,8 @@ class InvoiceProcessor:
     def __init__(self, config=None):
         self.config = config or {}
         self.preprocessor = ImagePreprocessor(self.config.get('ocr', {}).get('preprocessing', {}))
-        self.ocr = TesseractOCR()
+        self.ocr = create_ocr_provider(self.config.get('ocr', {}))
+        self.ocr_cache = get_ocr_cache(self.config.get('ocr', {}))
         self.extractor = ImprovedExtractor()
         self.preprocessing_enabled = self.config.get('ocr', {}).get('preprocessing', {}).get('enabled', True)
     
@@ -579,16 +656,42 @@ class InvoiceProcessor:
             else:
                 image = image_input
             
-            if self.preprocessing_enabled:
-                image = self.preprocessor.preprocess(image)
+            ocr_result = self.ocr_image(image)
+            return self.process_text(ocr_result.text, file_name, ocr_result.provider, start_time)
             
-            ocr_result = self.ocr.process_image(image)
-            
-            if not ocr_result.text or len(ocr_result.text.strip()) < 10:
+        except Exception as e:
+            return ExtractionResult(
+                success=False,
+                error_message=str(e),
+                file_name=file_name,
+                processing_duration=time.time() - start_time
+            )
+    
+    def ocr_image(self, image):
+        # The cache key covers the decoded image and the OCR settings, so a hit skips preprocessing too
+        cache_key = None
+        if self.ocr_cache is not None and isinstance(image, Image.Image):
+            cache_key = self.ocr_cache.key(image)
+            cached = self.ocr_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        if self.preprocessing_enabled:
+            image = self.preprocessor.preprocess(image)
+        ocr_result = self.ocr.process_image(image)
+        # Blank pages are cached too: an empty result is still the full OCR answer for that image
+        if cache_key and 'error' not in ocr_result.metadata:
+            self.ocr_cache.put(cache_key, ocr_result)
+        return ocr_result
+    
+    def process_text(self, text, file_name="text_input", ocr_provider=None, start_time=None, products=None):
+        # Runs extraction on already recognised text (e.g. the merged pages of a PDF)
+        start_time = start_time or time.time()
+        try:
+            if not text or len(text.strip()) < 10:
                 raise ValueError("OCR extraction failed or insufficient text")
             
-            invoice_data = self.extractor.extract(ocr_result.text)
-            invoice_data.ocr_provider = ocr_result.provider
+            invoice_data = self.extractor.extract(text, products)
+            invoice_data.ocr_provider = ocr_provider
             invoice_data.processing_time = time.time() - start_time
             
             if invoice_data.invoice_number and invoice_data.total_amount:
@@ -617,6 +720,770 @@ class InvoiceProcessor:
 with open('invoice_extractor/src/core/invoice_processor.py', 'w') as f:
     f.write(processor_py)
 
+# File 8: Multi-page PDF Processor
+pdf_processor_py = """
+import os
+import re
+import time
+import tempfile
+import subprocess
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+from pdf2image import convert_from_path, pdfinfo_from_path
+from src.models.invoice_model import ExtractionResult
+from src.core.invoice_processor import InvoiceProcessor
+
+# One processor per worker process, created by _init_worker
+_worker_processor = None
+
+def _init_worker(config):
+    global _worker_processor
+    _worker_processor = InvoiceProcessor(config)
+
+def extract_text_layer(filepath, page_number):
+    # Reads a page's embedded text with poppler's pdftotext; None if it is missing or fails
+    try:
+        completed = subprocess.run(
+            ['pdftotext', '-f', str(page_number), '-l', str(page_number), '-layout', '-enc', 'UTF-8',
+             str(filepath), '-'],
+            capture_output=True, timeout=60, check=True
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    # Shaped like OCR output (no indentation, single spaces between columns) for the extractors
+    lines = (re.sub(r' {2,}', ' ', line.strip()) for line in completed.stdout.decode('utf-8', 'replace').splitlines())
+    return "\\n".join(line for line in lines if line)
+
+def is_usable_text(text, min_chars=20):
+    # Scanned pages have no text layer; broken font encodings give mostly symbols or U+FFFD
+    if not text:
+        return False
+    letters = sum(character.isalnum() for character in text)
+    visible = sum(not character.isspace() for character in text)
+    return letters >= min_chars and letters >= 0.5 * visible and text.count('\\ufffd') <= 0.05 * visible
+
+def _process_page(filepath, page_number, dpi, text_layer=True, min_chars=20, processor=None):
+    # Uses the page's embedded text when it is usable. Otherwise renders the page
+    # to a temp file, OCRs it and deletes it, so a worker never holds more than
+    # one page image in memory. A text-layer page has no OCR confidence (None)
+    start_time = time.time()
+    processor = processor or _worker_processor
+    text = extract_text_layer(filepath, page_number) if text_layer else None
+    if text is not None and is_usable_text(text, min_chars):
+        source, confidence, provider = "text_layer", None, "pdftotext"
+    else:
+        source = "ocr"
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = convert_from_path(filepath, dpi=dpi, first_page=page_number, last_page=page_number,
+                                      output_folder=temp_dir, paths_only=True)
+            if not paths:
+                return {"page": page_number, "text": "", "confidence": 0.0, "products": [], "provider": None,
+                        "source": source, "seconds": time.time() - start_time}
+            with Image.open(paths[0]) as image:
+                ocr_result = processor.ocr_image(image)
+        text, confidence, provider = ocr_result.text, ocr_result.confidence, ocr_result.provider
+    # Only the line items are needed per page; header fields come from the merged text
+    products = processor.extractor.extract_products(text) if text.strip() else []
+    return {
+        "page": page_number,
+        "text": text,
+        "confidence": confidence,
+        "products": products,
+        "provider": provider,
+        "source": source,
+        "seconds": time.time() - start_time,
+    }
+
+def get_page_count(filepath):
+    return int(pdfinfo_from_path(filepath)["Pages"])
+
+class PDFProcessor:
+    def __init__(self, config=None, max_workers=None):
+        self.config = config or {}
+        pdf_config = self.config.get('pdf', {})
+        self.dpi = pdf_config.get('dpi', 300)
+        self.text_layer = pdf_config.get('text_layer', True)
+        self.min_text_chars = pdf_config.get('min_text_chars', 20)
+        self.max_workers = max_workers or pdf_config.get('max_workers') or os.cpu_count() or 1
+        self._processor = None
+    
+    def _get_processor(self):
+        # Created on first use and kept, so the OCR engine and cache are set up once, not per PDF
+        if self._processor is None:
+            self._processor = InvoiceProcessor(self.config)
+        return self._processor
+    
+    def process_pdf(self, filepath, first_page=1, last_page=None):
+        start_time = time.time()
+        file_name = Path(filepath).name
+        try:
+            page_count = get_page_count(filepath)
+            last_page = min(last_page or page_count, page_count)
+            pages = list(range(first_page, last_page + 1))
+            page_results = list(self._ocr_pages(filepath, pages))
+        except Exception as e:
+            return ExtractionResult(success=False, error_message=str(e), file_name=file_name,
+                                    processing_duration=time.time() - start_time)
+        return self._merge_pages(page_results, file_name, start_time)
+    
+    def _ocr_pages(self, filepath, pages):
+        workers = min(self.max_workers, len(pages))
+        if workers <= 1:
+            processor = self._get_processor()
+            for page_number in pages:
+                yield _process_page(filepath, page_number, self.dpi, self.text_layer, self.min_text_chars,
+                                    processor)
+            return
+        # map() keeps page order; only the small per-page results come back to this process
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.config,)) as executor:
+            count = len(pages)
+            yield from executor.map(_process_page, [filepath] * count, pages, [self.dpi] * count,
+                                    [self.text_layer] * count, [self.min_text_chars] * count)
+    
+    def _merge_pages(self, page_results, file_name, start_time):
+        # Header fields and totals come from the full text; line items are collected page by page
+        full_text = "\\n".join(page["text"] for page in page_results)
+        providers = []
+        for page in page_results:
+            if page["provider"] and page["provider"] not in providers:
+                providers.append(page["provider"])
+        provider = "+".join(providers) or None
+        products = [product for page in page_results for product in page["products"]]
+        result = self._get_processor().process_text(full_text, file_name, provider, start_time, products)
+        if result.success and result.invoice_data:
+            invoice_data = result.invoice_data
+            for page in page_results:
+                if not page["text"].strip():
+                    invoice_data.warnings.append(f"Page {page['page']}: no text recognised")
+            invoice_data.page_metrics = [
+                {"page": page["page"], "source": page["source"], "seconds": round(page["seconds"], 3),
+                 "characters": len(page["text"]), "ocr_confidence": page["confidence"]}
+                for page in page_results
+            ]
+            # Only OCR'd pages have a measured confidence; with none, the extractor's score is kept
+            confidences = [page["confidence"] for page in page_results
+                           if page["confidence"] is not None and page["text"].strip()]
+            if confidences:
+                invoice_data.confidence_score = sum(confidences) / len(confidences)
+            invoice_data.processing_time = time.time() - start_time
+            result.processing_duration = invoice_data.processing_time
+        return result
+"""
+
+with open('invoice_extractor/src/core/pdf_processor.py', 'w') as f:
+    f.write(pdf_processor_py)
+
+# File 9: Batch Processing CLI
+batch_process_py = """
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+# Tesseract's own threads would compete with the worker processes for the cores
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BASE_DIR))
+
+import yaml
+
+SUPPORTED_EXTENSIONS = {'.pdf', '.png', '.jpg', '.jpeg', '.tif', '.tiff'}
+MANIFEST_NAME = 'manifest.jsonl'
+
+# One processor per worker process, created by _init_worker
+_worker = {}
+
+def _init_worker(config, all_pages):
+    from src.core.invoice_processor import InvoiceProcessor
+    from src.core.pdf_processor import PDFProcessor
+    _worker['processor'] = InvoiceProcessor(config)
+    # Files are already spread over the cores, so each PDF is processed by one process
+    _worker['pdf_processor'] = PDFProcessor(config, max_workers=1)
+    _worker['all_pages'] = all_pages
+    _worker['ocr_cache'] = _worker['processor'].ocr_cache
+
+def _process_file(filepath, output_dir):
+    start_time = time.time()
+    path = Path(filepath)
+    cache = _worker['ocr_cache']
+    before = cache.stats() if cache else None
+    outcome = _run_file(path, output_dir, start_time)
+    if cache:
+        after = cache.stats()
+        outcome['ocr_cache_hits'] = after['hits'] - before['hits']
+        outcome['ocr_cache_misses'] = after['misses'] - before['misses']
+    return outcome
+
+def _run_file(path, output_dir, start_time):
+    filepath = str(path)
+    try:
+        if path.suffix.lower() == '.pdf':
+            if _worker['all_pages']:
+                result = _worker['pdf_processor'].process_pdf(filepath)
+            else:
+                result = _worker['pdf_processor'].process_pdf(filepath, first_page=1, last_page=1)
+        else:
+            result = _worker['processor'].process_invoice(filepath)
+        if not result.success:
+            return {'status': 'failed', 'error': result.error_message, 'seconds': time.time() - start_time}
+        # The full name keeps invoice.pdf and invoice.png from overwriting each other
+        output_file = Path(output_dir) / f"{path.name}_result.json"
+        temp_file = output_file.with_name(f"{output_file.name}.tmp-{os.getpid()}")
+        with open(temp_file, 'w') as f:
+            json.dump(result.invoice_data.to_dict(include_raw=True), f, indent=2, default=str)
+        os.replace(temp_file, output_file)
+        return {'status': 'done', 'output': str(output_file),
+                'extraction_status': result.invoice_data.extraction_status.value,
+                'seconds': time.time() - start_time}
+    except Exception as e:
+        return {'status': 'failed', 'error': str(e), 'seconds': time.time() - start_time}
+
+def _file_key(path):
+    stat = path.stat()
+    return f"{path.name}:{stat.st_size}:{int(stat.st_mtime)}"
+
+def load_manifest(manifest_path):
+    # The last line written for a file wins, so retries and resumed runs override earlier failures
+    entries = {}
+    if manifest_path.exists():
+        with open(manifest_path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue # A run killed mid-write leaves a partial last line
+                entries[entry['key']] = entry
+    return entries
+
+def find_invoices(input_dir):
+    return sorted(path for path in Path(input_dir).iterdir()
+                  if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS)
+
+def run_batch(input_dir, output_dir, config, workers=None, retries=2, all_pages=False):
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    done = {key for key, entry in load_manifest(manifest_path).items() if entry['status'] == 'done'}
+    invoices = find_invoices(input_dir)
+    pending = {str(path): _file_key(path) for path in invoices if _file_key(path) not in done}
+    print(f"📂 {len(invoices)} invoices found, {len(invoices) - len(pending)} already done, {len(pending)} to process")
+    if not pending:
+        return {'processed': 0, 'failed': 0, 'seconds': 0.0}
+
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    attempts = {filepath: 0 for filepath in pending}
+    counts = {'done': 0, 'failed': 0}
+    cache_counts = {'hits': 0, 'misses': 0}
+    busy_seconds = 0.0
+    start_time = time.time()
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config, all_pages))
+    futures = {}
+
+    def submit(filepath):
+        nonlocal executor
+        try:
+            future = executor.submit(_process_file, filepath, str(output_dir))
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory) and took the pool down: start a fresh one.
+            # Every file still outstanding on the old pool comes back broken and is resubmitted here.
+            print("   ⚠️ Worker pool crashed, restarting it")
+            executor.shutdown(wait=False)
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(config, all_pages))
+            future = executor.submit(_process_file, filepath, str(output_dir))
+        futures[future] = filepath
+
+    try:
+        with open(manifest_path, 'a') as manifest:
+            for filepath in pending:
+                submit(filepath)
+            while futures:
+                for future in as_completed(list(futures)):
+                    filepath = futures.pop(future)
+                    attempts[filepath] += 1
+                    try:
+                        outcome = future.result()
+                    except Exception as e: # The worker process itself died
+                        outcome = {'status': 'failed', 'error': str(e) or type(e).__name__, 'seconds': 0.0}
+                    busy_seconds += outcome['seconds']
+                    cache_counts['hits'] += outcome.get('ocr_cache_hits', 0)
+                    cache_counts['misses'] += outcome.get('ocr_cache_misses', 0)
+                    if outcome['status'] == 'failed' and attempts[filepath] <= retries:
+                        print(f"   ↻ {Path(filepath).name}: {outcome['error']} (retry {attempts[filepath]}/{retries})")
+                        submit(filepath)
+                        continue
+                    counts[outcome['status']] += 1
+                    entry = dict(outcome, key=pending[filepath], file=filepath, attempts=attempts[filepath])
+                    manifest.write(json.dumps(entry) + '\\n')
+                    manifest.flush()
+                    os.fsync(manifest.fileno())
+                    finished = counts['done'] + counts['failed']
+                    mark = '✅' if outcome['status'] == 'done' else '❌'
+                    print(f"{mark} [{finished}/{len(pending)}] {Path(filepath).name} in {outcome['seconds']:.2f}s")
+    finally:
+        executor.shutdown()
+
+    elapsed = time.time() - start_time
+    finished = counts['done'] + counts['failed']
+    print("\\n" + "=" * 70)
+    print(f"📊 Processed {counts['done']} invoices, {counts['failed']} failed, in {elapsed:.1f}s with {workers} workers")
+    print(f"⚡ Throughput: {finished / elapsed:.2f} files/s ({finished / elapsed * 3600:.0f} files/hour), "
+          f"{busy_seconds / finished:.2f}s per file")
+    lookups = cache_counts['hits'] + cache_counts['misses']
+    if lookups:
+        print(f"🗄️ OCR cache: {cache_counts['hits']} hits, {cache_counts['misses']} misses "
+              f"({cache_counts['hits'] / lookups:.0%} hit rate)")
+    print(f"📝 Manifest: {manifest_path}")
+    print("=" * 70)
+    return {'processed': counts['done'], 'failed': counts['failed'], 'seconds': elapsed}
+
+def main():
+    parser = argparse.ArgumentParser(description="Process a folder of invoices in parallel (resumable).")
+    parser.add_argument('--input-dir', default=str(BASE_DIR / 'data' / 'raw'))
+    parser.add_argument('--output-dir', default=str(BASE_DIR / 'data' / 'output'))
+    parser.add_argument('--config', default=str(BASE_DIR / 'config' / 'config.yaml'))
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: one per core)")
+    parser.add_argument('--retries', type=int, default=2, help="Extra attempts for a failed file")
+    parser.add_argument('--all-pages', action='store_true', help="Process every PDF page, not only the first")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+    all_pages = args.all_pages or config.get('pdf', {}).get('multi_page', False)
+    run_batch(args.input_dir, args.output_dir, config, args.workers, args.retries, all_pages)
+
+if __name__ == '__main__':
+    main()
+"""
+
+with open('invoice_extractor/batch_process.py', 'w') as f:
+    f.write(batch_process_py)
+
+# File 10: Tesseract Engine Pool OCR
+tesseract_pool_py = """
+import os
+import queue
+import atexit
+import threading
+from src.ocr.base_ocr import BaseOCRProvider, OCRResult
+from src.ocr.tesseract_ocr import result_from_data
+
+class EnginePool:
+    # Long-lived tesserocr engines shared by the threads of one process. Engines
+    # are created on demand up to `size`, so single-threaded use loads only one.
+    def __init__(self, language='eng', size=None):
+        self.language = language
+        self.size = size or os.cpu_count() or 1
+        self._idle = queue.Queue()
+        self._created = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                from tesserocr import PyTessBaseAPI
+                self._created += 1
+                try:
+                    return PyTessBaseAPI(lang=self.language)
+                except Exception:
+                    self._created -= 1 # e.g. missing language data: the slot stays free
+                    raise
+        return self._idle.get() # Every engine is busy: wait for one to be released
+
+    def release(self, api):
+        if self._closed:
+            self._end(api) # Checked out while the pool was closed
+            return
+        self._idle.put(api)
+
+    def close(self):
+        # Ends the idle engines now and the ones still in use when they are released
+        self._closed = True
+        while True:
+            try:
+                api = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._end(api)
+
+    def _end(self, api):
+        api.End()
+        with self._lock:
+            self._created -= 1
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_engine_pool(language='eng', size=None):
+    with _pools_lock:
+        key = (language, size)
+        if key not in _pools:
+            _pools[key] = EnginePool(language, size)
+        return _pools[key]
+
+@atexit.register
+def close_engine_pools():
+    # Ends the engines at interpreter exit. Worker processes of a ProcessPoolExecutor skip
+    # atexit handlers, but the OS reclaims their engines' memory when they exit
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+def _recognize(api, image):
+    from tesserocr import RIL, iterate_level
+    api.SetImage(image) # The PIL image is passed in memory; no temp file, no subprocess
+    api.Recognize()
+    data = {key: [] for key in ('text', 'conf', 'left', 'top', 'width', 'height', 'block_num', 'par_num', 'line_num')}
+    iterator = api.GetIterator()
+    if iterator is None:
+        return data
+    block = paragraph = line = 0
+    for word in iterate_level(iterator, RIL.WORD):
+        if word.IsAtBeginningOf(RIL.BLOCK):
+            block, paragraph = block + 1, 0
+        if word.IsAtBeginningOf(RIL.PARA):
+            paragraph, line = paragraph + 1, 0
+        if word.IsAtBeginningOf(RIL.TEXTLINE):
+            line += 1
+        text = word.GetUTF8Text(RIL.WORD)
+        box = word.BoundingBox(RIL.WORD)
+        if not text or box is None:
+            continue
+        left, top, right, bottom = box
+        data['text'].append(text)
+        data['conf'].append(word.Confidence(RIL.WORD))
+        data['left'].append(left)
+        data['top'].append(top)
+        data['width'].append(right - left)
+        data['height'].append(bottom - top)
+        data['block_num'].append(block)
+        data['par_num'].append(paragraph)
+        data['line_num'].append(line)
+    return data
+
+class TesseractPoolOCR(BaseOCRProvider):
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.language = 'eng'
+        self.pool = get_engine_pool(self.language, self.config.get('pool_size'))
+
+    def is_available(self):
+        try:
+            import tesserocr
+            return True
+        except ImportError:
+            return False
+
+    def extract_text(self, image):
+        if not self.validate_image(image):
+            return OCRResult("", 0.0, {"error": "Invalid image"}, 0, "TesseractPool")
+
+        api = self.pool.acquire()
+        try:
+            data = _recognize(api, image)
+        except Exception as e:
+            return OCRResult("", 0.0, {"error": str(e)}, 0, "TesseractPool")
+        finally:
+            api.Clear()
+            self.pool.release(api)
+        return result_from_data(data, provider="TesseractPool")
+"""
+
+with open('invoice_extractor/src/ocr/tesseract_pool_ocr.py', 'w') as f:
+    f.write(tesseract_pool_py)
+
+# File 11: OCR Provider Factory
+provider_factory_py = """
+from loguru import logger
+from src.ocr.tesseract_ocr import TesseractOCR
+from src.ocr.tesseract_pool_ocr import TesseractPoolOCR
+
+OCR_PROVIDERS = {
+    "tesseract": TesseractOCR,
+    "tesseract_pool": TesseractPoolOCR,
+}
+
+def create_ocr_provider(ocr_config=None):
+    ocr_config = ocr_config or {}
+    name = ocr_config.get('default_provider', 'tesseract')
+    if name not in OCR_PROVIDERS:
+        raise ValueError(f"Unknown OCR provider '{name}', expected one of {sorted(OCR_PROVIDERS)}")
+    provider = OCR_PROVIDERS[name](ocr_config)
+    if name != 'tesseract' and not provider.is_available():
+        logger.warning(f"OCR provider '{name}' is not available, falling back to 'tesseract'")
+        provider = TesseractOCR(ocr_config)
+    return provider
+"""
+
+with open('invoice_extractor/src/ocr/provider_factory.py', 'w') as f:
+    f.write(provider_factory_py)
+
+# File 12: OCR Provider Benchmark
+benchmark_ocr_py = """
+import os
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BASE_DIR))
+
+from PIL import Image
+from src.ocr.provider_factory import OCR_PROVIDERS
+from src.utils.image_preprocessor import ImagePreprocessor
+
+def benchmark_provider(name, images, repeats, workers):
+    provider = OCR_PROVIDERS[name]({})
+    if not provider.is_available():
+        print(f"⚠️ {name}: not available, skipped")
+        return None
+    provider.process_image(images[0]) # Warm-up: engine start-up is not part of the steady state
+
+    latencies = []
+    for _ in range(repeats):
+        for image in images:
+            start = time.perf_counter()
+            provider.process_image(image)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+
+    jobs = [image for _ in range(repeats) for image in images]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(provider.process_image, jobs))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'provider': name,
+        'median_ms': statistics.median(latencies),
+        'p95_ms': latencies[int(0.95 * (len(latencies) - 1))],
+        'images_per_s': len(jobs) / elapsed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare OCR providers for latency and throughput.")
+    parser.add_argument('images', nargs='*', default=[str(BASE_DIR / 'data' / 'raw' / 'sample_invoice.png')])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Concurrent requests for the throughput run")
+    parser.add_argument('--providers', nargs='+', default=sorted(OCR_PROVIDERS))
+    args = parser.parse_args()
+
+    preprocessor = ImagePreprocessor({})
+    images = [preprocessor.preprocess(Image.open(path)) for path in args.images]
+    print(f"🧪 {len(images)} images x {args.repeats} repeats, throughput with {args.workers} concurrent requests")
+    print("-" * 70)
+    print(f"{'provider':<18}{'median ms':>12}{'p95 ms':>12}{'images/s':>12}")
+    for name in args.providers:
+        row = benchmark_provider(name, images, args.repeats, args.workers)
+        if row:
+            print(f"{row['provider']:<18}{row['median_ms']:>12.1f}{row['p95_ms']:>12.1f}{row['images_per_s']:>12.2f}")
+
+if __name__ == '__main__':
+    main()
+"""
+
+with open('invoice_extractor/benchmark_ocr.py', 'w') as f:
+    f.write(benchmark_ocr_py)
+
+# File 13: OCR Result Cache
+ocr_cache_py = """
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from src.ocr.base_ocr import OCRResult
+
+try:
+    import fcntl # Serializes eviction between processes; not available on Windows
+except ImportError:
+    fcntl = None
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+# Bump whenever what a cached entry means changes (e.g. the text rebuilding)
+CACHE_VERSION = 1
+
+class OCRCache:
+    # Disk cache of OCR results keyed on a hash of the decoded image and of every
+    # setting that changes the OCR output. Entries are written atomically, so
+    # concurrent writers of the same key are harmless. A hit refreshes the entry's
+    # mtime, and the least recently used entries are deleted once the cache grows
+    # past max_bytes.
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, settings=None):
+        self.directory = Path(directory)
+        if not self.directory.is_absolute():
+            self.directory = PROJECT_ROOT / self.directory
+        self.max_bytes = max_bytes
+        self.settings = json.dumps(dict(settings or {}, cache_version=CACHE_VERSION), sort_keys=True, default=str)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._size = None # Estimated bytes on disk, counted on first store
+        self._lock = threading.Lock()
+
+    def key(self, image):
+        digest = hashlib.blake2b(digest_size=32)
+        digest.update(f"{image.mode}:{image.size}".encode())
+        digest.update(image.tobytes())
+        digest.update(self.settings.encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            os.utime(path) # Marks the entry as recently used
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        metadata = dict(entry['metadata'], cache_hit=True)
+        return OCRResult(entry['text'], entry['confidence'], metadata, 0.0, entry['provider'])
+
+    def put(self, key, result):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {'text': result.text, 'confidence': result.confidence,
+                 'metadata': result.metadata, 'provider': result.provider}
+        temp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+        with open(temp_path, 'w') as f:
+            json.dump(entry, f, default=str)
+        size = temp_path.stat().st_size
+        os.replace(temp_path, path)
+        with self._lock:
+            self.stores += 1
+            if self._size is None:
+                self._size = self._disk_usage()
+            else:
+                self._size += size
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def evict(self):
+        # Deletes the least recently used entries down to 90% of the budget
+        with open(self.directory / '.lock', 'w') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            entries = []
+            for path in self.directory.glob('*/*.json'):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue # Removed by another process meanwhile
+                entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * 0.9)
+            evicted = 0
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                    evicted += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+        with self._lock:
+            self._size = total
+            self.evictions += evicted
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'stores': self.stores,
+                'evictions': self.evictions,
+            }
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _disk_usage(self):
+        total = 0
+        for path in self.directory.glob('*/*.json'):
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+_engine_versions = None
+
+def ocr_engine_versions():
+    # An engine upgrade changes the recognised text, so its version is part of every key.
+    # Asked once per process, since pytesseract runs `tesseract --version` to find out.
+    global _engine_versions
+    if _engine_versions is not None:
+        return _engine_versions
+    versions = {}
+    try:
+        import pytesseract
+        versions['tesseract'] = str(pytesseract.get_tesseract_version())
+    except Exception:
+        versions['tesseract'] = None # Binary missing: the OCR itself will report the error
+    try:
+        import tesserocr
+        versions['tesserocr'] = tesserocr.tesseract_version()
+    except ImportError:
+        pass
+    _engine_versions = versions
+    return versions
+
+def get_ocr_cache(ocr_config):
+    # One cache object per process and setting, so its counters cover every processor
+    ocr_config = ocr_config or {}
+    cache_config = ocr_config.get('cache', {})
+    if not cache_config.get('enabled', False):
+        return None
+    settings = {
+        'provider': ocr_config.get('default_provider', 'tesseract'),
+        'single_pass': ocr_config.get('single_pass', True),
+        'preprocessing': ocr_config.get('preprocessing', {}),
+        'engine_versions': ocr_engine_versions(),
+    }
+    directory = cache_config.get('directory', 'data/cache/ocr')
+    max_bytes = int(cache_config.get('max_size_mb', 512) * 1024 * 1024)
+    key = (str(directory), max_bytes, json.dumps(settings, sort_keys=True, default=str))
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = OCRCache(directory, max_bytes, settings)
+        return _caches[key]
+"""
+
+with open('invoice_extractor/src/ocr/ocr_cache.py', 'w') as f:
+    f.write(ocr_cache_py)
+
 # Create __init__ files
 init_files = [
     'invoice_extractor/src/__init__.py',
@@ -646,12 +1513,14 @@ sys.path.insert(0, '/content/invoice_extractor')
 import yaml
 from src.utils.logger import initialize_logger
 from src.core.invoice_processor import InvoiceProcessor
+from src.core.pdf_processor import PDFProcessor
 
 with open('/content/invoice_extractor/config/config.yaml', 'r') as f:
     config = yaml.safe_load(f)
 
 initialize_logger({"log_level": "INFO"})
 processor = InvoiceProcessor(config)
+pdf_processor = PDFProcessor(config)
 
 print("✅ Invoice Processor initialized!")
 
@@ -662,20 +1531,24 @@ print("✅ Invoice Processor initialized!")
 print("\n🛠️ Step 6: Creating Helper Functions...")
 print("-" * 70)
 
-from pdf2image import convert_from_path
 from PIL import Image
 import json
 from IPython.display import display
 
-def quick_process_pdf(filepath):
-    """Process PDF invoice"""
+def quick_process_pdf(filepath, multi_page=None):
+    """Process PDF invoice (all pages, OCR'd in parallel, when multi_page is True)"""
     print(f"🔄 Processing: {filepath}")
     
-    images = convert_from_path(filepath, dpi=300, first_page=1, last_page=1)
+    if multi_page is None:
+        multi_page = config.get('pdf', {}).get('multi_page', False)
     
-    if images:
-        result = processor.process_invoice(images[0])
-        
+    # Pages with a usable embedded text layer are read directly; only scanned pages are OCR'd
+    if multi_page:
+        result = pdf_processor.process_pdf(filepath)
+    else:
+        result = pdf_processor.process_pdf(filepath, first_page=1, last_page=1)
+    
+    if result:
         if result.success and result.invoice_data:
             inv = result.invoice_data
             
@@ -709,6 +1582,12 @@ def quick_process_pdf(filepath):
                     if product.quantity and product.total_price:
                         print(f"      Qty: {product.quantity}, Total: {inv.currency.value if inv.currency else 'INR'} {product.total_price}")
             
+            if inv.page_metrics:
+                text_pages = sum(1 for page in inv.page_metrics if page['source'] == 'text_layer')
+                print(f"\n📑 Pages: {text_pages} from text layer, {len(inv.page_metrics) - text_pages} OCR'd")
+                for page in inv.page_metrics:
+                    print(f"   Page {page['page']}: {page['source']} ({page['seconds']:.2f}s)")
+            
             print(f"\n⏱️  Processing Time: {result.processing_duration:.2f}s")
             print(f"🎯 Confidence: {inv.confidence_score:.0%}")
             print(f"📊 Status: {inv.extraction_status.value.upper()}")
@@ -723,9 +1602,9 @@ def quick_process_pdf(filepath):
         return None
 
 
-def process_and_save(filepath, output_name=None):
+def process_and_save(filepath, output_name=None, multi_page=None):
     """Process and save results"""
-    invoice_data = quick_process_pdf(filepath)
+    invoice_data = quick_process_pdf(filepath, multi_page)
     
     if invoice_data:
         if output_name is None:
@@ -866,11 +1745,15 @@ print("""
   1. upload_and_process()          - Upload and process invoice
   2. process_and_save(filepath)    - Process existing file
   3. quick_process_pdf(filepath)   - Quick PDF processing
+     (pass multi_page=True to OCR every page in parallel)
 
 💡 Quick Start:
   invoice_data = upload_and_process()
 
 📁 Results saved to: /content/invoice_extractor/data/output/
+
+📚 Whole folders (resumable, one process per core):
+  !cd invoice_extractor && python batch_process.py --input-dir data/raw --output-dir data/output
 """)
 
 print("="*70)
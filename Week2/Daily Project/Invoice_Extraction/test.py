@@ -9,20 +9,26 @@ from dateutil import parser as date_parser
 from src.models.invoice_model import InvoiceData, VendorInfo, CustomerInfo, ProductItem, CurrencyType
 from pdf2image import convert_from_path
 import pytesseract
+from src.core.pdf_processor import extract_text_layer, is_usable_text
 
 class SimpleExtractor:
     """Simple extractor - use clean OCR, correct patterns"""
     
     def extract_from_pdf(self, filepath):
-        """Get clean OCR text"""
-        images = convert_from_path(filepath, dpi=300, first_page=1, last_page=1)
-        if not images:
-            return None
-        
-        # Simple OCR - no preprocessing
-        text = pytesseract.image_to_string(images[0])
-        
-        print("📄 Clean OCR Text:")
+        """Get the embedded text of digital PDFs, clean OCR text otherwise"""
+        text = extract_text_layer(filepath, 1)
+        if is_usable_text(text):
+            print("⚡ Page 1: embedded text layer (no OCR)")
+        else:
+            images = convert_from_path(filepath, dpi=300, first_page=1, last_page=1)
+            if not images:
+                return None
+            
+            # Simple OCR - no preprocessing
+            text = pytesseract.image_to_string(images[0])
+            print("🔍 Page 1: scanned, OCR'd")
+        
+        print("📄 Extracted Text:")
         print("="*70)
         print(text)
         print("="*70)